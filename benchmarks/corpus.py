@@ -0,0 +1,84 @@
+"""Seeded synthetic GeoJSON for the benchmarks.
+
+The same arguments always give the same bytes, so timings from different
+runs and machines are taken on identical input.
+"""
+import json
+import math
+import random
+from typing import Dict, List
+
+# Ways of breaking a document, as reported by UnifiedValidator.validate_json_structure
+MALFORMED_KINDS = ("trailing_comma", "missing_comma", "unclosed", "duplicate_key", "single_quotes", "truncated")
+
+
+def _ring(rng: random.Random, cx: float, cy: float, radius: float, vertices: int, precision: int,
+          dims: int, clockwise: bool) -> List[List[float]]:
+    """A closed, star-shaped (hence simple) ring around (cx, cy)."""
+    angles = sorted(rng.uniform(0, 2 * math.pi) for _ in range(max(vertices, 3)))
+    if clockwise:
+        angles.reverse()
+    ring = []
+    for angle in angles:
+        r = radius * rng.uniform(0.6, 1.0)
+        position = [round(cx + r * math.cos(angle), precision), round(cy + r * math.sin(angle), precision)]
+        if dims > 2:
+            position.append(round(rng.uniform(0, 500), 2))
+        ring.append(position)
+    ring.append(list(ring[0]))
+    return ring
+
+
+def make_feature_collection(features: int = 1000, vertices: int = 50, holes: int = 0, precision: int = 9,
+                            dims: int = 2, seed: int = 0) -> Dict:
+    """FeatureCollection of polygons with ``vertices`` positions per ring.
+
+    Each polygon gets ``holes`` interior rings. Coordinates are rounded to
+    a precision between 4 and ``precision`` decimals, so the fixer has both
+    short and long values to handle; ``dims=3`` adds an elevation.
+    """
+    rng = random.Random(seed)
+    items = []
+    for i in range(features):
+        cx, cy = rng.uniform(-170, 170), rng.uniform(-80, 80)
+        digits = rng.randint(min(4, precision), precision)
+        rings = [_ring(rng, cx, cy, 0.5, vertices, digits, dims, clockwise=False)]
+        for k in range(holes):
+            # Small holes spread around the centre, well inside the shell
+            angle = 2 * math.pi * k / holes
+            hx, hy = cx + 0.15 * math.cos(angle), cy + 0.15 * math.sin(angle)
+            rings.append(_ring(rng, hx, hy, 0.1 / max(holes, 1) ** 0.5, vertices, digits, dims, clockwise=True))
+        items.append({
+            "type": "Feature",
+            "properties": {"id": i, "name": f"feature {i}", "value": round(rng.uniform(0, 1000), 3)},
+            "geometry": {"type": "Polygon", "coordinates": rings}
+        })
+    return {"type": "FeatureCollection", "features": items}
+
+
+def make_malformed(kind: str, features: int = 1000, vertices: int = 50, seed: int = 0) -> str:
+    """A FeatureCollection text with one structural error of the given kind."""
+    text = json.dumps(make_feature_collection(features, vertices, seed=seed), indent=2)
+    middle = len(text) // 2
+    if kind == "trailing_comma":
+        index = text.rindex("]", 0, middle)
+        return text[:index] + "," + text[index:]
+    if kind == "missing_comma":
+        index = text.index(",", middle)
+        return text[:index] + text[index + 1:]
+    if kind == "unclosed":
+        return text[:text.rindex("}")]
+    if kind == "duplicate_key":
+        index = text.index('"properties": {', middle) + len('"properties": {')
+        return text[:index] + '"id": 0, ' + text[index:]
+    if kind == "single_quotes":
+        index = text.index('"name"', middle)
+        return text[:index] + "'name'" + text[index + len('"name"'):]
+    if kind == "truncated":
+        return text[:middle]
+    raise ValueError(f"Unknown malformed kind: {kind}")
+
+
+def dumps(collection: Dict) -> bytes:
+    """Upload body for a collection, as a client would send it."""
+    return json.dumps(collection).encode()
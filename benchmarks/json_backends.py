@@ -0,0 +1,64 @@
+"""Compare the JSON backends on synthetic FeatureCollections.
+
+Times parsing, indented and compact serialization, and process_document
+end to end for every available backend, and checks that all backends
+produce the same document.
+
+    python benchmarks/json_backends.py --features 5000 --vertices 50
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main
+from corpus import dumps, make_feature_collection
+
+
+def best_of(repeat: int, func, *args) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--features", type=int, default=5000)
+    parser.add_argument("--vertices", type=int, default=50)
+    parser.add_argument("--min-decimals", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    content = dumps(make_feature_collection(args.features, args.vertices, seed=args.seed))
+    print(f"{args.features} features x {args.vertices} vertices, {len(content) / 1e6:.1f} MB")
+    backends = [name for name in main.JSON_BACKENDS if name != "orjson" or main.orjson is not None]
+
+    outputs = {}
+    print(f"{'backend':<8} {'loads':>8} {'dumps':>8} {'compact':>8} {'process':>8}  (seconds, best of {args.repeat})")
+    for backend in backends:
+        codec = main.get_json_codec(backend)
+        main.json_codec = codec
+        data = codec.loads(content)
+        row = [
+            best_of(args.repeat, codec.loads, content),
+            best_of(args.repeat, codec.dumps, data, 2),
+            best_of(args.repeat, codec.dumps, data, None),
+            best_of(args.repeat, main.process_document, content, args.min_decimals, "vectorized"),
+        ]
+        outputs[backend] = main.process_document(content, args.min_decimals, "vectorized")[0]
+        print(f"{backend:<8} " + " ".join(f"{value:8.3f}" for value in row))
+
+    if len(set(outputs.values())) > 1:
+        print("Backends produced different output")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -0,0 +1,218 @@
+"""Benchmark suite for the fixer, area calculation and validator.
+
+Micro-benchmarks call the functions in main.py directly; the e2e ones go
+through FastAPI's TestClient with the result cache bypassed. Each
+benchmark reports the median and best time over ``--repeat`` runs and the
+peak memory allocated in this process during one extra run (tracemalloc;
+work done in /process worker processes is not included).
+
+    python benchmarks/run.py --scale small
+    python benchmarks/run.py -k validate --output results.json
+    python benchmarks/run.py --baseline results.json --max-regression 10
+"""
+import argparse
+import copy
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+import shapely
+from fastapi.testclient import TestClient
+
+import main
+from corpus import MALFORMED_KINDS, dumps, make_feature_collection, make_malformed
+
+SCALES = {
+    "small": {"features": 200, "vertices": 20},
+    "medium": {"features": 2000, "vertices": 50},
+    "large": {"features": 20000, "vertices": 100},
+}
+MIN_DECIMALS = 6
+
+
+class Benchmark:
+    """``func(*setup())`` is timed; setup runs before every repeat and is not."""
+
+    def __init__(self, name: str, func: Callable, setup: Callable[[], tuple] = tuple):
+        self.name = name
+        self.func = func
+        self.setup = setup
+
+
+def _fresh(collection: Dict) -> Callable[[], tuple]:
+    """Setup returning a private copy, for functions that modify their input."""
+    return lambda: (copy.deepcopy(collection),)
+
+
+def chain_rings(coordinates: List[Any]):
+    """Rings of a list of Polygon coordinates."""
+    for polygon in coordinates:
+        yield from polygon
+
+
+def build_benchmarks(features: int, vertices: int, seed: int, client: TestClient) -> List[Benchmark]:
+    corpora = {
+        "plain": make_feature_collection(features, vertices, seed=seed),
+        "holes": make_feature_collection(features, vertices, holes=2, seed=seed),
+        "precise": make_feature_collection(features, vertices, precision=15, seed=seed),
+        "3d": make_feature_collection(features, vertices, dims=3, seed=seed),
+    }
+    plain = corpora["plain"]
+    coordinates = [feature["geometry"]["coordinates"] for feature in plain["features"]]
+    values = np.array([c for ring in chain_rings(coordinates) for position in ring for c in position])
+
+    items = [
+        Benchmark("fix_coordinates[plain]",
+                  lambda coords: [main.fix_coordinates(c, MIN_DECIMALS) for c in coords],
+                  lambda: (copy.deepcopy(coordinates),)),
+        Benchmark("fix_coordinate_array[plain]",
+                  lambda array: main.fix_coordinate_array(array, MIN_DECIMALS),
+                  lambda: (values.copy(),)),
+    ]
+    for engine in main.COORDINATE_ENGINES:
+        for corpus in ("plain", "holes", "precise", "3d"):
+            items.append(Benchmark(f"process_geojson[{engine},{corpus}]",
+                                   lambda data, engine=engine: main.process_geojson(data, MIN_DECIMALS, engine),
+                                   _fresh(corpora[corpus])))
+    for method in main.AREA_METHODS:
+        for corpus in ("plain", "holes"):
+            items.append(Benchmark(f"calculate_area[{method},{corpus}]",
+                                   lambda data, method=method: main.calculate_area(data, method),
+                                   lambda corpus=corpus: (corpora[corpus],)))
+
+    valid_text = json.dumps(plain, indent=2)
+    items.append(Benchmark("validate_json_structure[valid]",
+                           lambda: main.validator.validate_json_structure(valid_text)))
+    for kind in MALFORMED_KINDS:
+        text = make_malformed(kind, features, vertices, seed)
+        items.append(Benchmark(f"validate_json_structure[{kind}]",
+                               lambda text=text: main.validator.validate_json_structure(text)))
+    for engine in main.VALIDATION_ENGINES:
+        for corpus in ("plain", "holes", "3d"):
+            items.append(Benchmark(f"validate_geometry[{engine},{corpus}]",
+                                   lambda data, engine=engine: main.validator.validate_geometry(data, engine),
+                                   lambda corpus=corpus: (corpora[corpus],)))
+
+    upload = dumps(plain)
+
+    def post_process(compact: bool):
+        response = client.post("/process", files={"files": ("plain.geojson", upload)},
+                               data={"min_decimals": str(MIN_DECIMALS), "prefix": "fixed_",
+                                     "no_cache": "true", "compact": str(compact).lower()})
+        response.raise_for_status()
+
+    def post_validate():
+        response = client.post("/validate", files={"file": ("plain.geojson", upload)}, data={"no_cache": "true"})
+        response.raise_for_status()
+
+    items.append(Benchmark("e2e /process", lambda: post_process(False)))
+    items.append(Benchmark("e2e /process[compact]", lambda: post_process(True)))
+    items.append(Benchmark("e2e /validate", post_validate))
+    return items
+
+
+def measure(benchmark: Benchmark, repeat: int, memory: bool) -> Dict[str, Any]:
+    timings = []
+    for _ in range(repeat):
+        args = benchmark.setup()
+        start = time.perf_counter()
+        benchmark.func(*args)
+        timings.append(time.perf_counter() - start)
+    result = {
+        "name": benchmark.name,
+        "repeat": repeat,
+        "median": statistics.median(timings),
+        "min": min(timings),
+        "peak_memory_bytes": None,
+    }
+    if memory:
+        args = benchmark.setup()
+        tracemalloc.start()
+        try:
+            benchmark.func(*args)
+            result["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def compare(results: List[Dict], baseline: Dict, max_regression: Optional[float]) -> bool:
+    """Print the change against a baseline run; False if a benchmark regressed too much."""
+    previous = {item["name"]: item for item in baseline["results"]}
+    ok = True
+    print(f"\n{'benchmark':<44} {'baseline':>9} {'now':>9} {'change':>8}")
+    for item in results:
+        old = previous.get(item["name"])
+        if old is None:
+            continue
+        change = 100 * (item["median"] / old["median"] - 1)
+        flag = ""
+        if max_regression is not None and change > max_regression:
+            flag = "  REGRESSION"
+            ok = False
+        print(f"{item['name']:<44} {old['median']:9.4f} {item['median']:9.4f} {change:+7.1f}%{flag}")
+    return ok
+
+
+def run(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark suite for main.py")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="medium")
+    parser.add_argument("--features", type=int, help="Override the feature count of the scale")
+    parser.add_argument("--vertices", type=int, help="Override the vertices per ring of the scale")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("-k", dest="keyword", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the peak memory measurement")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare with results previously written by --output")
+    parser.add_argument("--max-regression", type=float,
+                        help="With --baseline, exit with status 1 if a median got slower by more than this percentage")
+    args = parser.parse_args(argv)
+
+    features = args.features or SCALES[args.scale]["features"]
+    vertices = args.vertices or SCALES[args.scale]["vertices"]
+    results = []
+    with TestClient(main.app) as client:
+        for benchmark in build_benchmarks(features, vertices, args.seed, client):
+            if args.keyword and args.keyword not in benchmark.name:
+                continue
+            result = measure(benchmark, args.repeat, not args.no_memory)
+            results.append(result)
+            memory = result["peak_memory_bytes"]
+            memory_text = f"{memory / 2 ** 20:9.1f} MiB" if memory is not None else ""
+            print(f"{result['name']:<44} {result['median']:9.4f} s {result['min']:9.4f} s {memory_text}", flush=True)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "shapely": shapely.__version__,
+            "json_backend": main.json_codec.name,
+            "process_workers": main.PROCESS_WORKERS,
+            "features": features,
+            "vertices": vertices,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        if not compare(results, baseline, args.max_regression):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -0,0 +1,122 @@
+"""Measure server start-up: the time from launching uvicorn to its first responses.
+
+Starts ``uvicorn main:app`` on a free port ``--repeat`` times, with and
+without warm-up (GEOJSON_WARM_UP), and reports medians of the time from
+launch until GET / first answers, and of the latency of the first
+/validate and /process requests, which need shapely and pyproj, sent
+``--delay`` seconds after it. The time to import main is reported too.
+
+    python benchmarks/startup.py --repeat 5
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+import uuid
+from pathlib import Path
+from typing import Dict, Optional
+
+from corpus import dumps, make_feature_collection
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def multipart(files: Dict[str, tuple], fields: Dict[str, str]) -> tuple:
+    """Body and content type of a multipart/form-data upload."""
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    for name, (filename, content) in files.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                     f'Content-Type: application/geo+json\r\n\r\n'.encode() + content + b"\r\n")
+    parts.append(f"--{boundary}--\r\n".encode())
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+def request(url: str, body: Optional[bytes] = None, content_type: Optional[str] = None) -> float:
+    """Seconds until the response to one request arrived."""
+    headers = {"Content-Type": content_type} if content_type else {}
+    start = time.perf_counter()
+    with urllib.request.urlopen(urllib.request.Request(url, data=body, headers=headers), timeout=60) as response:
+        response.read()
+    return time.perf_counter() - start
+
+
+def import_time() -> float:
+    """Seconds to import main in a new interpreter."""
+    code = "import time; start = time.perf_counter(); import main; print(time.perf_counter() - start)"
+    return float(subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True,
+                                check=True).stdout)
+
+
+def start_up(warm_up: bool, upload: bytes, process_workers: int, delay: float) -> Dict[str, float]:
+    """Launch a server and time its first responses."""
+    port = free_port()
+    url = f"http://127.0.0.1:{port}"
+    env = dict(os.environ, GEOJSON_WARM_UP="1" if warm_up else "0", GEOJSON_PROCESS_WORKERS=str(process_workers),
+               GEOJSON_FEATURE_STORE="")
+    launched = time.perf_counter()
+    server = subprocess.Popen([sys.executable, "-m", "uvicorn", "main:app", "--port", str(port)], cwd=ROOT, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while True:
+            if server.poll() is not None:
+                raise RuntimeError("The server exited during start-up")
+            try:
+                request(url + "/")
+                break
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.005)
+        result = {"first_response": time.perf_counter() - launched}
+        time.sleep(delay)
+        body, content_type = multipart({"file": ("startup.geojson", upload)}, {"no_cache": "true"})
+        result["first_validate"] = request(url + "/validate", body, content_type)
+        body, content_type = multipart({"files": ("startup.geojson", upload)},
+                                       {"min_decimals": "6", "prefix": "fixed_", "no_cache": "true"})
+        result["first_process"] = request(url + "/process", body, content_type)
+        return result
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def run(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--features", type=int, default=10)
+    parser.add_argument("--delay", type=float, default=1.0,
+                        help="Seconds between the first response and the first /validate request")
+    parser.add_argument("--process-workers", type=int, default=0,
+                        help="GEOJSON_PROCESS_WORKERS of the server (default 0: /process runs inline)")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    upload = dumps(make_feature_collection(args.features, 20))
+    report = {"import_main": statistics.median(import_time() for _ in range(args.repeat))}
+    print(f"{'import main':<28} {report['import_main']:8.3f} s")
+    for warm_up in (False, True):
+        runs = [start_up(warm_up, upload, args.process_workers, args.delay) for _ in range(args.repeat)]
+        label = "warm-up" if warm_up else "no warm-up"
+        for name in runs[0]:
+            report[f"{name}[{label}]"] = value = statistics.median(item[name] for item in runs)
+            print(f"{f'{name} ({label})':<28} {value:8.3f} s", flush=True)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -0,0 +1,300 @@
+"""Fix and validate GeoJSON files from the command line.
+
+Runs the same code as /process and /validate on every file found under
+the given paths, in a pool of worker processes. A manifest remembers the
+size, mtime and SHA-256 of every input, so files unchanged since the last
+run with the same options are skipped.
+
+    python cli.py fix data/ --min-decimals 6 --output-dir fixed/
+    python cli.py fix "data/**/*.geojson" --prefix clean_ --validate
+    python cli.py validate data/ --rules invalid_geometry,unclosed --report report.json
+"""
+import argparse
+import glob
+import hashlib
+import json
+import mmap
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import main
+
+INPUT_EXTENSIONS = (".json", ".geojson", ".geojsons", ".geojsonseq", ".geojsonl", ".ndjson", ".jsonl")
+DEFAULT_MANIFEST = ".geojson-manifest.json"
+
+
+def find_inputs(paths: List[str], prefix: Optional[str]) -> List[Tuple[Path, Path]]:
+    """(file, root) for every input; outputs are placed relative to root.
+
+    Directories are walked recursively for files with INPUT_EXTENSIONS,
+    other arguments are files or glob patterns. Files named with
+    ``prefix`` are outputs of an earlier run and are left out.
+    """
+    found: Dict[Path, Path] = {}
+    for spec in paths:
+        path = Path(spec)
+        if path.is_dir():
+            files = [(file, path) for file in sorted(path.rglob("*")) if file.suffix.lower() in INPUT_EXTENSIONS]
+        elif path.is_file():
+            files = [(path, path.parent)]
+        else:
+            files = [(Path(match), Path(match).parent) for match in sorted(glob.glob(spec, recursive=True))]
+        for file, root in files:
+            if not file.is_file() or (prefix and file.name.startswith(prefix)):
+                continue
+            found.setdefault(file.resolve(), root.resolve())
+    return list(found.items())
+
+
+def output_path(file: Path, root: Path, prefix: str, output_dir: Optional[Path]) -> Path:
+    """Prefixed output next to the input, or at the same place under output_dir."""
+    directory = file.parent if output_dir is None else output_dir / file.parent.relative_to(root)
+    return directory / f"{prefix}{file.name}"
+
+
+def load_manifest(path: Path) -> Dict[str, Dict]:
+    try:
+        return json.loads(path.read_text())["files"]
+    except FileNotFoundError:
+        return {}
+
+
+def save_manifest(path: Path, files: Dict[str, Dict]):
+    """Write the manifest through a temporary file, so an interrupted run keeps the old one."""
+    temporary = path.with_name(path.name + ".tmp")
+    temporary.write_text(json.dumps({"version": 1, "files": files}, indent=1))
+    temporary.replace(path)
+
+
+def summarize_validation(result: Dict[str, Any]) -> Dict[str, Any]:
+    """The verdict and issue counts of a /validate response."""
+    summary = {
+        "valid": result.get("structure_valid", False) and result.get("geometry_valid", True),
+        "structure_valid": result.get("structure_valid", False),
+        "is_geojson": result.get("is_geojson", False),
+        "feature_count": result.get("feature_count", 0),
+        "invalid": {issue: len(items) for issue, items in result.get("invalid", {}).items()},
+        "problematic": {issue: len(items) for issue, items in result.get("problematic", {}).items()},
+    }
+    if "line_errors" in result:
+        summary["line_errors"] = len(result["line_errors"])
+    if "validation_mode" in result:
+        summary["validation_mode"] = result["validation_mode"]
+    return summary
+
+
+def run_task(task: Dict[str, Any]) -> Dict[str, Any]:
+    """Fix and/or validate one file; runs in a worker process."""
+    start = time.perf_counter()
+    path = Path(task["path"])
+    outcome: Dict[str, Any] = {"path": task["path"], "status": "failed"}
+    content = None
+    try:
+        with open(path, "rb") as source:
+            stat = os.fstat(source.fileno())
+            # Large files are mapped, so validating them does not need a decoded copy
+            content = main.map_file(source) if stat.st_size >= main.MMAP_THRESHOLD_BYTES else source.read()
+        outcome.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns, sha256=hashlib.sha256(content).hexdigest())
+        if outcome["sha256"] == task["previous_sha256"]:
+            outcome["status"] = "unchanged"
+            return outcome
+
+        options = task["options"]
+        input_format = main.detect_input_format(options["input_format"], path.name, content[:64])
+        if task["command"] == "fix":
+            # JSON outputs are validated as they are fixed, without parsing the written text again
+            output_format = options["output_format"] or input_format
+            combined = options["validate"] and output_format == input_format == "json"
+            validation = {"engine": options["validation_engine"], "rules": options["rules"],
+                          "skip_rules": options["skip_rules"], **options["validation_mode"]}
+            result = main.process_content(bytes(content), options["min_decimals"], options["engine"],
+                                          options["area_method"], options["compact"], input_format,
+                                          options["output_format"], precision_mode=options["precision_mode"],
+                                          validation=validation if combined else None)
+            output = Path(task["output"])
+            output.parent.mkdir(parents=True, exist_ok=True)
+            output.write_text(result["data"])
+            outcome["output"] = task["output"]
+            outcome["features"] = len(result["area_comparison"])
+            if result.get("line_errors"):
+                outcome["line_errors"] = result["line_errors"]
+            if result.get("topology"):
+                outcome["topology"] = result["topology"]
+            if combined:
+                outcome["validation"] = summarize_validation(result["validation"])
+            elif options["validate"]:
+                outcome["validation"] = summarize_validation(main.validate_content(
+                    result["data"].encode(), options["validation_engine"], options["rules"], options["skip_rules"],
+                    input_format=output_format, **options["validation_mode"]
+                ))
+        else:
+            result = main.validate_content(content, options["validation_engine"], options["rules"],
+                                           options["skip_rules"], input_format=input_format,
+                                           **options["validation_mode"])
+            outcome["validation"] = summarize_validation(result)
+            if task["details"]:
+                outcome["result"] = result
+        outcome["status"] = "done"
+    except Exception as e:
+        outcome["message"] = str(e)
+    finally:
+        if isinstance(content, mmap.mmap):
+            content.close()
+        outcome["seconds"] = round(time.perf_counter() - start, 4)
+    return outcome
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_common(command: argparse.ArgumentParser):
+        command.add_argument("paths", nargs="+", help="Files, directories (searched recursively) or glob patterns")
+        command.add_argument("--input-format", choices=main.INPUT_FORMATS, default="auto")
+        command.add_argument("--validation-engine", choices=main.VALIDATION_ENGINES, default="vectorized")
+        command.add_argument("--rules", help="Comma-separated geometry rules to run (default: all but the cross-feature rules)")
+        command.add_argument("--skip-rules", help="Comma-separated geometry rules not to run")
+        command.add_argument("--mode", choices=main.VALIDATION_MODES, default="full",
+                             help="Validation mode, as for /validate")
+        command.add_argument("--sample-size", type=int, default=1000, help="Features checked in sample mode")
+        command.add_argument("--seed", type=int, default=0, help="Seed of the sample")
+        command.add_argument("--limit", type=int, default=100, help="Features reported per issue in limit mode")
+        command.add_argument("--overlap-min-area", type=float, default=1.0,
+                             help="Smallest overlap between features reported, in square metres")
+        command.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                             help="Worker processes (default: one per CPU, 0 runs inline)")
+        command.add_argument("--manifest", default=DEFAULT_MANIFEST,
+                             help=f"Manifest of processed files (default: {DEFAULT_MANIFEST})")
+        command.add_argument("--force", action="store_true", help="Process files even if they are unchanged")
+        command.add_argument("--report", help="Write the per-file results as JSON to this file")
+        command.add_argument("-v", "--verbose", action="store_true", help="Print every file as it is done")
+
+    fix = commands.add_parser("fix", help="Fix coordinate decimals like /process")
+    add_common(fix)
+    fix.add_argument("--min-decimals", type=int, default=6)
+    fix.add_argument("--prefix", default="fixed_")
+    fix.add_argument("--output-dir", help="Write outputs here, mirroring the input tree (default: next to the inputs)")
+    fix.add_argument("--engine", choices=main.COORDINATE_ENGINES, default="vectorized")
+    fix.add_argument("--area-method", choices=main.AREA_METHODS, default="mercator")
+    fix.add_argument("--compact", action="store_true")
+    fix.add_argument("--output-format", choices=main.INPUT_FORMATS[1:])
+    fix.add_argument("--precision-mode", choices=main.PRECISION_MODES, default="coordinates",
+                     help="\"topology\" repairs geometries that fixing made invalid")
+    fix.add_argument("--validate", action="store_true", help="Also validate every fixed file")
+
+    validate = commands.add_parser("validate", help="Validate files like /validate")
+    add_common(validate)
+    validate.add_argument("--details", action="store_true",
+                          help="Include the full /validate response of every file in the report")
+    return parser
+
+
+def print_summary(outcomes: List[Dict], elapsed: float):
+    counts: Dict[str, int] = {}
+    for outcome in outcomes:
+        counts[outcome["status"]] = counts.get(outcome["status"], 0) + 1
+    checked = [outcome["validation"] for outcome in outcomes if "validation" in outcome]
+    print(f"\n{len(outcomes)} files in {elapsed:.1f} s: " + ", ".join(f"{count} {status}"
+                                                                for status, count in sorted(counts.items())))
+    if checked:
+        invalid = sum(1 for validation in checked if not validation["valid"])
+        print(f"validated {len(checked)} files, {invalid} invalid")
+        issues: Dict[str, int] = {}
+        for validation in checked:
+            for category in ("invalid", "problematic"):
+                for issue, count in validation[category].items():
+                    issues[issue] = issues.get(issue, 0) + count
+        for issue, count in sorted(issues.items()):
+            print(f"  {issue}: {count} feature(s)")
+    for outcome in outcomes:
+        if outcome["status"] == "failed":
+            print(f"FAILED {outcome['path']}: {outcome.get('message')}")
+
+
+def run(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    prefix = main.normalize_prefix(args.prefix) if args.command == "fix" else None
+    output_dir = Path(args.output_dir).resolve() if args.command == "fix" and args.output_dir else None
+    options = {
+        "input_format": args.input_format,
+        "validation_engine": args.validation_engine,
+        "rules": main.parse_rule_names(args.rules),
+        "skip_rules": main.parse_rule_names(args.skip_rules),
+        "validation_mode": {"mode": args.mode, "sample_size": args.sample_size, "seed": args.seed,
+                            "limit": args.limit, "overlap_min_area": args.overlap_min_area},
+    }
+    try:
+        main.validator.select_rules(options["rules"], options["skip_rules"])
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    if args.command == "fix":
+        options.update(min_decimals=args.min_decimals, engine=args.engine, area_method=args.area_method,
+                       compact=args.compact, output_format=args.output_format, validate=args.validate,
+                       precision_mode=args.precision_mode,
+                       prefix=prefix, output_dir=str(output_dir) if output_dir else None)
+    # Outputs of an earlier run only count if it used the same options and JSON backend
+    settings = hashlib.sha256(json.dumps([args.command, options, main.json_codec.name],
+                                         sort_keys=True).encode()).hexdigest()
+
+    manifest_path = Path(args.manifest)
+    manifest = load_manifest(manifest_path)
+    outcomes: List[Dict] = []
+    tasks: List[Dict] = []
+    for file, root in find_inputs(args.paths, prefix):
+        output = output_path(file, root, prefix, output_dir) if args.command == "fix" else None
+        entry = manifest.get(str(file))
+        previous = None
+        if entry and not args.force and entry["settings"] == settings and (output is None or output.exists()):
+            stat = file.stat()
+            if (entry["size"], entry["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+                outcomes.append({**entry["outcome"], "status": "unchanged"})
+                continue
+            previous = entry["sha256"]
+        tasks.append({"command": args.command, "path": str(file), "output": str(output) if output else None,
+                      "options": options, "previous_sha256": previous,
+                      "details": args.command == "validate" and args.details})
+
+    def finish(outcome: Dict):
+        if outcome["status"] == "unchanged":
+            # Same content under a new mtime: keep the earlier results
+            entry = manifest[outcome["path"]]
+            entry.update(size=outcome["size"], mtime_ns=outcome["mtime_ns"])
+            outcome = {**entry["outcome"], "status": "unchanged"}
+        elif outcome["status"] == "done":
+            stored = {key: value for key, value in outcome.items() if key != "result"}
+            manifest[outcome["path"]] = {"size": outcome["size"], "mtime_ns": outcome["mtime_ns"],
+                                         "sha256": outcome["sha256"], "settings": settings, "outcome": stored}
+        outcomes.append(outcome)
+        if args.verbose or outcome["status"] == "failed":
+            print(f"{outcome['status']:>9} {outcome['path']}", flush=True)
+
+    start = time.perf_counter()
+    try:
+        if args.workers > 0 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=args.workers) as executor:
+                for future in as_completed([executor.submit(run_task, task) for task in tasks]):
+                    finish(future.result())
+        else:
+            for task in tasks:
+                finish(run_task(task))
+    finally:
+        save_manifest(manifest_path, manifest)
+    elapsed = time.perf_counter() - start
+
+    outcomes.sort(key=lambda outcome: outcome["path"])
+    print_summary(outcomes, elapsed)
+    if args.report:
+        Path(args.report).write_text(json.dumps({"command": args.command, "options": options,
+                                                 "seconds": elapsed, "files": outcomes}, indent=2))
+    failed = any(outcome["status"] == "failed" for outcome in outcomes)
+    invalid = any(not outcome["validation"]["valid"] for outcome in outcomes if "validation" in outcome)
+    return 1 if failed or invalid else 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -1,14 +1,60 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, HTMLResponse, FileResponse
+from fastapi.responses import JSONResponse, HTMLResponse, FileResponse, StreamingResponse, PlainTextResponse, Response
 from fastapi.staticfiles import StaticFiles
+import asyncio
+import bisect
+import codecs
+import contextvars
+import cProfile
+import gzip
+import hashlib
+import importlib
+import io
 import json
+import mmap
 import os
-from typing import List, Dict, Any, Tuple, Union
+import pstats
+import random
+import re
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import chain, compress
+from typing import List, Dict, Any, Tuple, Union, Iterator, Optional, Callable
 from pathlib import Path
-from shapely.geometry import shape
-from shapely.ops import transform
-from pyproj import Transformer, CRS
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib json module is used instead
+    orjson = None
+
+class _LazyModule:
+    """A module that is imported on first attribute access.
+
+    Keeps shapely and pyproj, a good part of the import time, off the
+    start-up path; warm_up loads them once the server is up.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+
+    def __getattr__(self, attr: str) -> Any:
+        value = getattr(importlib.import_module(self._name), attr)
+        # Later lookups find the attribute on the instance and skip __getattr__
+        setattr(self, attr, value)
+        return value
+
+shapely = _LazyModule("shapely")
+pyproj = _LazyModule("pyproj")
 
 app = FastAPI(title="GeoJSON Tools")
 
@@ -25,6 +71,1607 @@ app.add_middleware(
 from fastapi import APIRouter
 router = APIRouter()
 
+class StdlibJSONCodec:
+    """JSON parsing and serialization with the stdlib json module."""
+
+    name = "stdlib"
+    # Whether loads_buffer reads a buffer such as an mmap without copying it
+    reads_buffers = False
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+    def loads_buffer(self, buffer: Union[bytes, mmap.mmap]) -> Any:
+        """Parse a bytes-like buffer."""
+        return self.loads(bytes(buffer))
+
+    def dumps(self, obj: Any, indent: Optional[int] = 2) -> str:
+        """Serialize ``obj``; ``indent=None`` gives compact output without whitespace."""
+        if indent is None:
+            return json.dumps(obj, separators=(",", ":"))
+        return json.dumps(obj, indent=indent)
+
+# orjson writes some floats differently from repr(): with exponents ("1e-6", "1e16")
+# and below 1e-4 as plain decimals ("0.00001"). These patterns find candidates.
+_ORJSON_EXPONENT = re.compile(r'e[-\d]')
+_ORJSON_SMALL_FLOAT = re.compile(r'0\.0000')
+_JSON_STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"')
+
+def _repr_floats(text: str) -> str:
+    """Rewrite the floats in orjson output that repr() writes differently."""
+    candidates = [m.start() for m in _ORJSON_EXPONENT.finditer(text) if m.start() and text[m.start() - 1].isdigit()]
+    candidates += [
+        m.start() for m in _ORJSON_SMALL_FLOAT.finditer(text)
+        if not m.start() or not (text[m.start() - 1].isdigit() or text[m.start() - 1] == ".")
+    ]
+    if not candidates:
+        return text
+    candidates.sort()
+
+    # Candidates inside strings are left alone
+    string_starts, string_ends = [], []
+    for m in _JSON_STRING.finditer(text):
+        if m.start() > candidates[-1]:
+            break
+        string_starts.append(m.start())
+        string_ends.append(m.end())
+
+    pieces = []
+    pos = 0
+    for candidate in candidates:
+        k = bisect.bisect_right(string_starts, candidate) - 1
+        if k >= 0 and candidate < string_ends[k]:
+            continue
+        start = candidate
+        while start > 0 and text[start - 1] in "-0123456789.":
+            start -= 1
+        if start < pos:
+            continue
+        end = candidate
+        while end < len(text) and text[end] in "-+0123456789.eE":
+            end += 1
+        pieces.append(text[pos:start])
+        pieces.append(repr(float(text[start:end])))
+        pos = end
+    pieces.append(text[pos:])
+    return "".join(pieces)
+
+# An integer literal orjson would read as a float: beyond 64 bits takes 20 digits
+_LONG_INTEGER = re.compile(r'(?<![\d.])\d{20}')
+# The same in bytes translated by _DIGIT_CLASSES: digits become "0", points
+# stay and anything else becomes a space
+_DIGIT_CLASSES = bytes(ord("0") if 48 <= i <= 57 else i if i == ord(".") else ord(" ") for i in range(256))
+_LONG_INTEGER_CLASSES = b" " + b"0" * 20
+
+def _has_long_integer(data: Union[str, bytes, mmap.mmap]) -> bool:
+    """Whether a document has an integer literal of 20 digits or more (or, rarely, a string of them)."""
+    if isinstance(data, str):
+        return _LONG_INTEGER.search(data) is not None
+    block = ByteLineIndex.BLOCK
+    for start in range(0, len(data), block):
+        # Each block repeats the end of the last one, so literals across the boundary are seen whole
+        classes = data[max(start - len(_LONG_INTEGER_CLASSES), 0):start + block].translate(_DIGIT_CLASSES)
+        if _LONG_INTEGER_CLASSES in classes or (start == 0 and classes.startswith(_LONG_INTEGER_CLASSES[1:])):
+            return True
+    return False
+
+class _NonFinite(float):
+    """NaN or Infinity as read by the stdlib; orjson refuses to write float subclasses, so the stdlib writes it."""
+
+class OrjsonCodec(StdlibJSONCodec):
+    """JSON parsing and serialization with orjson.
+
+    Output matches the stdlib codec except that non-ASCII text is written
+    as UTF-8 instead of \\u escapes. Floats keep Python's repr() text, which
+    is what the decimal fixer counts and produces. Documents orjson would
+    misread or cannot handle are read and written by the stdlib, as with
+    the stdlib codec: integers beyond 64 bits (orjson reads them as floats,
+    so any integer literal of 20 digits or more is enough), NaN and
+    Infinity, and deep nesting.
+    """
+
+    name = "orjson"
+    reads_buffers = True
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        if not _has_long_integer(data):
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass
+        # Either invalid JSON, reported with the stdlib's message, or something only it reads as written
+        return json.loads(data, parse_constant=_NonFinite)
+
+    def loads_buffer(self, buffer: Union[bytes, mmap.mmap]) -> Any:
+        """Parse a bytes-like buffer in place; only documents orjson cannot read are copied for the stdlib."""
+        if not _has_long_integer(buffer):
+            try:
+                with memoryview(buffer) as view:
+                    return orjson.loads(view)
+            except orjson.JSONDecodeError:
+                pass
+        return self.loads(bytes(buffer))
+
+    def dumps(self, obj: Any, indent: Optional[int] = 2) -> str:
+        if indent in (None, 2):
+            try:
+                return _repr_floats(orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode())
+            except (orjson.JSONEncodeError, TypeError):
+                pass
+        # The same UTF-8 output from the stdlib
+        return json.dumps(obj, indent=indent, ensure_ascii=False,
+                          separators=(",", ":") if indent is None else None)
+
+def decimal_places(text: str) -> int:
+    """Decimal places of a number as written, ignoring trailing zeros.
+
+    Exponents are taken into account: "1.50" has 1, "1e-05" has 5 and
+    "1.5e-07" has 8. Integers, NaN and Infinity have none.
+    """
+    mantissa, _, exponent = text.lower().partition("e")
+    whole, _, fraction = mantissa.lstrip("+-").partition(".")
+    digits = (whole + fraction).rstrip("0")
+    if not digits.strip("0"):
+        return 0
+    places = len(fraction) - int(exponent or 0) - (len(whole) + len(fraction) - len(digits))
+    return max(places, 0)
+
+# Lexemes whose decimal places _decimal_counts works out at once
+_DECIMAL_COUNT_BLOCK = 1 << 20
+
+def _decimal_counts(lexemes: List[str]) -> np.ndarray:
+    """decimal_places of many number lexemes as an int16 array.
+
+    Plain decimals are counted with array operations on their characters;
+    the few with an exponent (or NaN and Infinity) go through
+    decimal_places.
+    """
+    counts = np.zeros(len(lexemes), dtype=np.int16)
+    for start in range(0, len(lexemes), _DECIMAL_COUNT_BLOCK):
+        block = lexemes[start:start + _DECIMAL_COUNT_BLOCK]
+        chars = np.array(block, dtype=bytes)
+        width = chars.itemsize
+        codes = chars.view(np.uint8).reshape(len(block), width)
+        length = (codes != 0).sum(axis=1)
+        dot = codes == ord(".")
+        has_dot = dot.any(axis=1)
+        dot_pos = dot.argmax(axis=1)
+        fraction = np.where(has_dot, length - dot_pos - 1, 0)
+        # Trailing zeros of the digits, skipping the point and the padding after the lexeme
+        tail = (codes == ord("0")) | dot | (codes == 0)
+        trailing = np.where(tail.all(axis=1), width, (~tail[:, ::-1]).argmax(axis=1))
+        zeros = trailing - (width - length) - (has_dot & (dot_pos >= width - trailing))
+        counts[start:start + len(block)] = np.maximum(fraction - zeros, 0)
+        special = np.flatnonzero((codes >= ord("A")).any(axis=1))
+        for i in special:
+            counts[start + i] = decimal_places(block[i])
+    return counts
+
+_NUMBER_TYPES = {int, float}
+
+def _count_numbers(value) -> int:
+    """Numbers in a parsed JSON value; -1 if it holds a boolean, which the parser reads without a number hook."""
+    if isinstance(value, list):
+        if value and not isinstance(value[0], (list, dict)) and set(map(type, value)) <= _NUMBER_TYPES:
+            return len(value)
+        total = 0
+        for item in value:
+            count = _count_numbers(item)
+            if count < 0:
+                return -1
+            total += count
+        return total
+    if isinstance(value, dict):
+        return _count_numbers(list(value.values()))
+    if isinstance(value, bool):
+        return -1
+    return 1 if isinstance(value, (int, float)) else 0
+
+
+class DecimalGeometry(dict):
+    """A GeoJSON geometry read by ExactDecimalCodec.
+
+    ``decimals`` holds the decimal places of every number of its
+    "coordinates" as written in the source, in document order.
+    """
+
+    decimals: Optional[np.ndarray] = None
+
+def source_decimals(geometry: Dict) -> Optional[np.ndarray]:
+    """Decimal places of the coordinates of a geometry as written, if it was read by ExactDecimalCodec."""
+    return getattr(geometry, "decimals", None)
+
+class ExactDecimalCodec(StdlibJSONCodec):
+    """The stdlib codec, keeping the decimal places of coordinates as written.
+
+    Every number's text is recorded once while parsing, and each geometry
+    with "coordinates" is returned as a DecimalGeometry whose ``decimals``
+    is a view into one int16 array of the decimal places of all numbers.
+    The precision rule and the decimal fixer then go by the source text
+    rather than by repr() of the parsed float, which drops trailing
+    digits a float cannot hold. Geometries whose coordinates contain
+    booleans are left as plain dicts.
+    """
+
+    name = "exact"
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        lexemes: List[str] = []
+        geometries: List[Tuple[DecimalGeometry, int, int]] = []
+
+        def record(parse: Callable[[str], Any]) -> Callable[[str], Any]:
+            def hook(text: str) -> Any:
+                lexemes.append(text)
+                return parse(text)
+            return hook
+
+        def make_object(pairs: List[Tuple[str, Any]]) -> Dict:
+            obj = dict(pairs)
+            if not isinstance(obj.get("coordinates"), list):
+                return obj
+            # The coordinates are the last numbers read before those of the members after them
+            last = max(k for k, (key, _) in enumerate(pairs) if key == "coordinates")
+            after = _count_numbers([value for _, value in pairs[last + 1:]])
+            count = _count_numbers(obj["coordinates"])
+            if after < 0 or count < 0:
+                return obj
+            geometry = DecimalGeometry(obj)
+            end = len(lexemes) - after
+            geometries.append((geometry, end - count, end))
+            return geometry
+
+        result = json.loads(data, parse_float=record(float), parse_int=record(int),
+                            parse_constant=record(float), object_pairs_hook=make_object)
+        counts = _decimal_counts(lexemes)
+        for geometry, start, end in geometries:
+            geometry.decimals = counts[start:end]
+        return result
+
+JSON_BACKENDS = ("orjson", "stdlib", "exact")
+
+def get_json_codec(backend: str = "auto") -> StdlibJSONCodec:
+    """Codec for ``backend``; "auto" picks orjson when it is installed."""
+    if backend == "auto":
+        backend = "orjson" if orjson is not None else "stdlib"
+    if backend not in JSON_BACKENDS:
+        raise ValueError(f"Unknown JSON backend: {backend}")
+    if backend == "orjson":
+        if orjson is None:
+            raise ValueError("The orjson JSON backend needs the orjson package")
+        return OrjsonCodec()
+    if backend == "exact":
+        return ExactDecimalCodec()
+    return StdlibJSONCodec()
+
+json_codec = get_json_codec(os.environ.get("GEOJSON_JSON_BACKEND", "auto"))
+
+class ResultCache:
+    """Content-addressed cache of endpoint results.
+
+    Results are stored as JSON, keyed by a hash of the uploaded bytes and
+    the parameters that affect the result. The in-memory tier is an LRU
+    bounded by the total size of the stored JSON; an optional directory
+    adds an on-disk tier that survives restarts. The files there are
+    bounded by ``max_disk_bytes``: reading one touches its mtime, and once
+    the files this process has seen (counted when it first writes, then by
+    what it writes) pass the budget, the least recently used are deleted
+    until they take up at most 90% of it.
+    """
+
+    def __init__(self, max_bytes: int, directory: Optional[str] = None, max_disk_bytes: int = 1024 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.directory = Path(directory) if directory else None
+        self.max_disk_bytes = max_disk_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._disk_size: Optional[int] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(content: bytes, **params) -> str:
+        """Hash the upload together with the parameters of the request."""
+        digest = hashlib.sha256(content)
+        digest.update(json.dumps(params, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _disk_files(self) -> List[Tuple[float, int, Path]]:
+        """(mtime, size, path) of every file in the on-disk tier."""
+        files = []
+        for path in self.directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue  # Deleted by another process meanwhile
+            files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def _prune_disk(self, written: int):
+        """Count ``written`` bytes against the disk budget, deleting the least recently used files when over it."""
+        if self._disk_size is None:
+            self._disk_size = sum(size for _, size, _ in self._disk_files())
+        else:
+            self._disk_size += written
+        if self._disk_size <= self.max_disk_bytes:
+            return
+        files = sorted(self._disk_files())
+        self._disk_size = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if self._disk_size <= self.max_disk_bytes * 0.9:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Error pruning cache entry {path.name}: {str(e)}")
+                continue
+            self._disk_size -= size
+
+    def _remember(self, key: str, blob: bytes):
+        if len(blob) > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= len(old)
+        self._entries[key] = blob
+        self._size += len(blob)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached result for a key, or None."""
+        with self._lock:
+            blob = self._entries.get(key)
+            if blob is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return json.loads(blob)
+        if self.directory is not None:
+            try:
+                path = self._path(key)
+                blob = path.read_bytes()
+                os.utime(path)  # Recently used, for pruning
+            except OSError:
+                blob = None
+            if blob is not None:
+                with self._lock:
+                    self._remember(key, blob)
+                    self.hits += 1
+                    self.disk_hits += 1
+                return json.loads(blob)
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, value: Any):
+        """Store a JSON-serializable result."""
+        blob = json.dumps(value).encode()
+        with self._lock:
+            self._remember(key, blob)
+        if self.directory is not None:
+            path = self._path(key)
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+                tmp_path.write_bytes(blob)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                print(f"Error writing cache entry {key}: {str(e)}")
+                return
+            with self._lock:
+                self._prune_disk(len(blob))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "disk_enabled": self.directory is not None,
+                "disk_bytes": self._disk_size,
+                "max_disk_bytes": self.max_disk_bytes
+            }
+
+result_cache = ResultCache(
+    max_bytes=int(os.environ.get("GEOJSON_CACHE_MAX_BYTES", 256 * 1024 * 1024)),
+    directory=os.environ.get("GEOJSON_CACHE_DIR") or None,
+    max_disk_bytes=int(os.environ.get("GEOJSON_CACHE_DIR_MAX_BYTES", 1024 * 1024 * 1024))
+)
+
+# Part of every feature fingerprint; bump it when a change to the rules, the
+# fixer or the area calculation makes stored per-feature results stale
+FEATURE_RESULTS_VERSION = 1
+
+class FeatureResultStore:
+    """Persistent per-feature results, keyed by feature fingerprint.
+
+    A fingerprint hashes a feature's normalized geometry with the
+    parameters that affect its result (see GeometryBatch.fingerprints), so
+    resubmitted features that did not change are not checked, fixed or
+    measured again. Entries live in an SQLite database shared by the
+    worker processes; each holds a JSON result and optionally the fixed
+    coordinates. Once a process has seen more than ``max_entries`` (counted
+    when it connects and then by what it writes), the least recently used
+    entries are deleted. Without a ``path`` nothing is stored.
+    """
+
+    def __init__(self, path: Optional[str], max_entries: int):
+        self.path = Path(path) if path else None
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.reused = 0
+        self.recomputed = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    def _connection(self) -> sqlite3.Connection:
+        """This thread's connection, opened after any fork into a worker process."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("CREATE TABLE IF NOT EXISTS features "
+                               "(key TEXT PRIMARY KEY, result TEXT NOT NULL, coords BLOB, used REAL NOT NULL)")
+            connection.execute("CREATE INDEX IF NOT EXISTS features_used ON features (used)")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+            self._local.entries = connection.execute("SELECT COUNT(*) FROM features").fetchone()[0]
+        return connection
+
+    def get_many(self, keys: List[str]) -> Dict[str, Tuple[Any, Optional[bytes]]]:
+        """(result, coords) of the keys that are stored."""
+        if not self.enabled or not keys:
+            return {}
+        found = {}
+        try:
+            connection = self._connection()
+            unique = list(set(keys))
+            # Stay below SQLite's limit on query parameters
+            for start in range(0, len(unique), 500):
+                batch = unique[start:start + 500]
+                rows = connection.execute(
+                    f"SELECT key, result, coords FROM features WHERE key IN ({','.join('?' * len(batch))})", batch
+                ).fetchall()
+                for key, result, coords in rows:
+                    found[key] = (json.loads(result), coords)
+            if found:
+                # Recency is kept to the hour, so entries reused again soon are not rewritten
+                now = time.time()
+                with connection:
+                    connection.execute("BEGIN")
+                    connection.executemany("UPDATE features SET used = ? WHERE key = ? AND used < ?",
+                                           [(now, key, now - 3600) for key in found])
+        except sqlite3.Error as e:
+            print(f"Error reading feature results: {str(e)}")
+        return found
+
+    def put_many(self, items: List[Tuple[str, Any, Optional[bytes]]]):
+        """Store (key, JSON-serializable result, coords) entries."""
+        if not self.enabled or not items:
+            return
+        now = time.time()
+        try:
+            connection = self._connection()
+            with connection:
+                connection.execute("BEGIN")
+                connection.executemany(
+                    "INSERT OR REPLACE INTO features (key, result, coords, used) VALUES (?, ?, ?, ?)",
+                    [(key, json.dumps(result), coords, now) for key, result, coords in items]
+                )
+            # Replaced entries are counted too, so the table is only counted again once it may be full
+            self._local.entries += len(items)
+            if self._local.entries > self.max_entries:
+                excess = connection.execute("SELECT COUNT(*) FROM features").fetchone()[0] - self.max_entries
+                if excess > 0:
+                    connection.execute("DELETE FROM features WHERE key IN "
+                                       "(SELECT key FROM features ORDER BY used LIMIT ?)", (excess,))
+                self._local.entries = min(self._local.entries, self.max_entries)
+        except sqlite3.Error as e:
+            print(f"Error writing feature results: {str(e)}")
+
+    def count(self, reused: int, recomputed: int) -> Dict[str, int]:
+        """Add to the reuse counters of this process; returns the counts as reported in responses."""
+        with self._lock:
+            self.reused += reused
+            self.recomputed += recomputed
+        return {"reused": reused, "recomputed": recomputed}
+
+    def stats(self) -> Dict[str, Any]:
+        entries = None
+        if self.enabled:
+            try:
+                entries = self._connection().execute("SELECT COUNT(*) FROM features").fetchone()[0]
+            except sqlite3.Error:
+                pass
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "reused": self.reused,
+                "recomputed": self.recomputed
+            }
+
+feature_results = FeatureResultStore(
+    os.environ.get("GEOJSON_FEATURE_STORE") or None,
+    max_entries=int(os.environ.get("GEOJSON_FEATURE_STORE_MAX_ENTRIES", 1_000_000))
+)
+
+def cached_result(key: str) -> Optional[Any]:
+    """result_cache.get, with the feature reuse counts of this request rather than of the one cached."""
+    result = result_cache.get(key)
+    if isinstance(result, dict) and "feature_reuse" in result:
+        result["feature_reuse"] = feature_results.count(0, 0)
+    return result
+
+@router.get("/cache/stats")
+async def cache_stats():
+    """Report result cache hit/miss counters and size, and per-feature reuse."""
+    return {**result_cache.stats(), "features": feature_results.stats()}
+
+class Histogram:
+    """Prometheus-style cumulative histogram, one series per label set."""
+
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...], labels: Tuple[str, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.labels = labels
+        self._series: Dict[Tuple[str, ...], List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str):
+        key = tuple(labels[name] for name in self.labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.setdefault(key, [[0] * (len(self.buckets) + 1), 0.0, 0])
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {key: (list(counts), total, count) for key, (counts, total, count) in self._series.items()}
+        for key, (counts, total, count) in sorted(series.items()):
+            labels = ",".join(f'{name}="{value}"' for name, value in zip(self.labels, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                lines.append(f'{self.name}_bucket{{{labels}{"," if labels else ""}le="{le}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{labels}}} {total}")
+            lines.append(f"{self.name}_count{{{labels}}} {count}")
+        return lines
+
+_SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+_BYTES_BUCKETS = tuple(float(1024 * 4 ** k) for k in range(11))
+_COUNT_BUCKETS = tuple(float(10 ** k) for k in range(9))
+
+METRICS = {
+    "request_seconds": Histogram("geojson_request_duration_seconds", "Time spent handling a request",
+                                 _SECONDS_BUCKETS, ("endpoint",)),
+    "stage_seconds": Histogram("geojson_stage_duration_seconds", "Time spent in each stage of a request",
+                               _SECONDS_BUCKETS, ("endpoint", "stage")),
+    "bytes": Histogram("geojson_request_size_bytes", "Size of the uploaded documents",
+                       _BYTES_BUCKETS, ("endpoint",)),
+    "features": Histogram("geojson_request_features", "Features in the uploaded documents",
+                          _COUNT_BUCKETS, ("endpoint",)),
+    "vertices": Histogram("geojson_request_vertices", "Positions in the uploaded documents",
+                          _COUNT_BUCKETS, ("endpoint",)),
+}
+
+# Add a Server-Timing header with the stage timings to instrumented responses
+SERVER_TIMING = os.environ.get("GEOJSON_SERVER_TIMING", "").lower() in ("1", "true", "yes")
+# Profile a PROFILE_SAMPLE_RATE fraction of requests and keep the profiles of those
+# slower than PROFILE_THRESHOLD_SECONDS in PROFILE_DIR; disabled when no threshold is set
+PROFILE_THRESHOLD_SECONDS = float(os.environ["GEOJSON_PROFILE_THRESHOLD_SECONDS"]) \
+    if os.environ.get("GEOJSON_PROFILE_THRESHOLD_SECONDS") else None
+PROFILE_SAMPLE_RATE = float(os.environ.get("GEOJSON_PROFILE_SAMPLE_RATE", 1.0))
+PROFILE_DIR = Path(os.environ.get("GEOJSON_PROFILE_DIR") or Path(tempfile.gettempdir()) / "geojson-profiles")
+
+class StageTimer:
+    """Stage timings and sizes of one request.
+
+    Code on the request's path reports into the timer of the current
+    context through timed_stage() and record_size(); work done in the
+    process pool is timed there and merged back (see _timed_call).
+    Stages that run in parallel add up, so their sum can exceed the
+    request's duration.
+    """
+
+    def __init__(self, endpoint: str, profile: bool = False):
+        self.endpoint = endpoint
+        self.started = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+        self.sizes: Dict[str, int] = {}
+        self.profiler = cProfile.Profile() if profile else None
+        self.worker_profiles: List[Dict] = []
+
+    def add_stage(self, name: str, seconds: float):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def add_size(self, name: str, value: int):
+        self.sizes[name] = self.sizes.get(name, 0) + value
+
+    def merge(self, stages: Dict[str, float], sizes: Dict[str, int], profile: Optional[Dict] = None):
+        for name, seconds in stages.items():
+            self.add_stage(name, seconds)
+        for name, value in sizes.items():
+            self.add_size(name, value)
+        if profile:
+            self.worker_profiles.append(profile)
+
+    def server_timing(self, total: float) -> str:
+        entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.stages.items()]
+        return ", ".join(entries + [f"total;dur={total * 1000:.1f}"])
+
+    def finish(self) -> float:
+        """Record the request in METRICS and keep its profile if it was slow; returns its duration."""
+        global _profiling_request
+        total = time.perf_counter() - self.started
+        METRICS["request_seconds"].observe(total, endpoint=self.endpoint)
+        for name, seconds in self.stages.items():
+            METRICS["stage_seconds"].observe(seconds, endpoint=self.endpoint, stage=name)
+        for name in ("bytes", "features", "vertices"):
+            if name in self.sizes:
+                METRICS[name].observe(self.sizes[name], endpoint=self.endpoint)
+        if self.profiler is not None:
+            self.profiler.disable()
+            _profiling_request = False
+            if total >= PROFILE_THRESHOLD_SECONDS:
+                self._dump_profile(total)
+        return total
+
+    def _dump_profile(self, total: float):
+        stats = pstats.Stats(self.profiler)
+        for profile in self.worker_profiles:
+            stats.add(_ProfileData(profile))
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        path = PROFILE_DIR / f"{self.endpoint.strip('/').replace('/', '_')}-{int(time.time() * 1000)}-{total:.2f}s.prof"
+        stats.dump_stats(path)
+        print(f"Request to {self.endpoint} took {total:.2f}s, profile written to {path}")
+
+class _ProfileData:
+    """Raw cProfile stats from a worker process, in the form pstats.Stats.add accepts."""
+
+    def __init__(self, stats: Dict):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+# The StageTimer of the request being handled, if it is instrumented
+current_timer = contextvars.ContextVar("current_timer", default=None)
+
+# Requests share the event loop thread, where only one profiler can be active
+_profiling_request = False
+
+def start_timer(endpoint: str) -> StageTimer:
+    """Create a timer for a request, sampled for profiling, and make it current."""
+    global _profiling_request
+    profile = (PROFILE_THRESHOLD_SECONDS is not None and not _profiling_request
+               and random.random() < PROFILE_SAMPLE_RATE)
+    timer = StageTimer(endpoint, profile)
+    current_timer.set(timer)
+    if timer.profiler is not None:
+        _profiling_request = True
+        timer.profiler.enable()
+    return timer
+
+@contextmanager
+def timed_stage(name: str):
+    """Time a block as a stage of the current request, if any."""
+    timer = current_timer.get()
+    if timer is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.add_stage(name, time.perf_counter() - start)
+
+def record_size(name: str, value: int):
+    """Add to a size (bytes, features, vertices) of the current request, if any."""
+    timer = current_timer.get()
+    if timer is not None:
+        timer.add_size(name, value)
+
+def _timed_call(func: Callable, profile: bool, *args) -> Tuple[Any, Dict[str, float], Dict[str, int], Optional[Dict]]:
+    """Run ``func`` in a worker with its own timer; returns the result with the timings to merge."""
+    timer = StageTimer("worker", profile)
+    token = current_timer.set(timer)
+    try:
+        if timer.profiler is not None:
+            timer.profiler.enable()
+        result = func(*args)
+    finally:
+        current_timer.reset(token)
+        if timer.profiler is not None:
+            timer.profiler.disable()
+    profile_stats = None
+    if timer.profiler is not None:
+        timer.profiler.create_stats()
+        profile_stats = timer.profiler.stats
+    return result, timer.stages, timer.sizes, profile_stats
+
+async def run_timed(executor, func: Callable, *args) -> Any:
+    """Await ``func(*args)`` in ``executor`` and merge its stage timings into the current request."""
+    timer = current_timer.get()
+    profile = timer is not None and timer.profiler is not None
+    result, stages, sizes, profile_stats = await asyncio.get_running_loop().run_in_executor(
+        executor, _timed_call, func, profile, *args
+    )
+    if timer is not None:
+        timer.merge(stages, sizes, profile_stats)
+    return result
+
+# Requests to these paths are timed; see StageTimer
+INSTRUMENTED_PATHS = ("/process", "/validate")
+
+@app.middleware("http")
+async def time_requests(request: Request, call_next):
+    if request.url.path not in INSTRUMENTED_PATHS:
+        return await call_next(request)
+    timer = start_timer(request.url.path)
+    try:
+        response = await call_next(request)
+    finally:
+        total = timer.finish()
+    if SERVER_TIMING:
+        response.headers["Server-Timing"] = timer.server_timing(total)
+    return response
+
+@router.get("/metrics")
+async def metrics():
+    """Request and stage timing histograms in the Prometheus text format."""
+    lines = []
+    for histogram in METRICS.values():
+        lines.extend(histogram.render())
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
+
+class LineIndex:
+    """Offsets of every line start in a text, for O(log n) position lookups."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.starts = [0]
+        self.starts.extend(match.end() for match in re.finditer("\n", text))
+
+    def line_col(self, pos: int) -> Tuple[int, int]:
+        """Return the 1-based line and column of a character position."""
+        line = bisect.bisect_right(self.starts, pos)
+        return line, pos - self.starts[line - 1] + 1
+
+    def line(self, line_num: int) -> str:
+        """Return the text of a 1-based line without its line break."""
+        start = self.starts[line_num - 1]
+        end = self.starts[line_num] if line_num < len(self.starts) else len(self.text)
+        return self.text[start:end].rstrip("\r\n")
+
+    def excerpt(self, pos: int) -> Tuple[int, int, str, int]:
+        """Line and column of a position, with the text of its line and the column in that text."""
+        line_num, col_num = self.line_col(pos)
+        return line_num, col_num, self.line(line_num), col_num
+
+class ByteLineIndex:
+    """Position lookups in a bytes-like buffer, such as a memory-mapped file, without decoding it.
+
+    Newlines are counted with NumPy in blocks of BLOCK bytes, starting from
+    the closest position looked up before, so no table of line starts is
+    built. Columns count characters (UTF-8 lead bytes). Only the excerpts
+    around positions are decoded.
+    """
+
+    BLOCK = 16 * 1024 * 1024
+    EXCERPT_BYTES = 400
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap]):
+        self.buffer = buffer
+        self._checkpoints: List[Tuple[int, int]] = [(0, 1)]  # (position, line number there), sorted
+
+    def _count(self, start: int, end: int, count: Callable[[np.ndarray], int]) -> int:
+        total = 0
+        for block in range(start, end, self.BLOCK):
+            # A temporary view, so the buffer can still be closed afterwards
+            view = np.frombuffer(self.buffer, np.uint8, count=min(block + self.BLOCK, end) - block, offset=block)
+            total += count(view)
+            del view
+        return total
+
+    def line_col(self, pos: int) -> Tuple[int, int]:
+        """Return the 1-based line and column of a byte position."""
+        index = bisect.bisect_right(self._checkpoints, (pos, float("inf"))) - 1
+        start, line_num = self._checkpoints[index]
+        line_num += self._count(start, pos, lambda view: int(np.count_nonzero(view == 10)))
+        self._checkpoints.insert(index + 1, (pos, line_num))
+        line_start = self.buffer.rfind(b"\n", 0, pos) + 1
+        col_num = 1 + self._count(line_start, pos, lambda view: int(np.count_nonzero((view & 0xC0) != 0x80)))
+        return line_num, col_num
+
+    def excerpt(self, pos: int) -> Tuple[int, int, str, int]:
+        """Like LineIndex.excerpt, with at most EXCERPT_BYTES of the line on each side of the position."""
+        line_num, col_num = self.line_col(pos)
+        line_start = self.buffer.rfind(b"\n", 0, pos) + 1
+        line_end = self.buffer.find(b"\n", pos)
+        if line_end < 0:
+            line_end = len(self.buffer)
+        start = max(line_start, pos - self.EXCERPT_BYTES)
+        end = min(line_end, pos + self.EXCERPT_BYTES)
+        before = bytes(self.buffer[start:pos]).decode("utf-8", "replace")
+        after = bytes(self.buffer[pos:end]).decode("utf-8", "replace")
+        return line_num, col_num, (before + after).rstrip("\r"), len(before) + 1
+
+# One alternative per token kind; JSON whitespace is skipped in front of each
+# token. Other text ("CHAR") is one character, and unquoted words may go on
+# with non-ASCII letters ("NON_ASCII"), so the str and bytes versions below
+# find the same tokens in a text and in its UTF-8 encoding.
+_TOKEN_PATTERN = r'''[ \t\n\r]*(?:
+    (?P<punct>[{}\[\]:,])
+  | (?P<string>"(?:[^"\\\n]|\\.)*")
+  | (?P<unterminated>"[^\n]*)
+  | (?P<single>'(?:[^'\\\n]|\\.)*')
+  | (?P<number>-?[0-9]+(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?)
+  | (?P<word>[A-Za-z_$](?:[\w$]|NON_ASCII)*)
+  | (?P<other>CHAR)
+)'''
+_JSON_TOKEN = re.compile(_TOKEN_PATTERN.replace("NON_ASCII", r"[^\x00-\x7f]").replace("CHAR", r"[^ \t\n\r]"),
+                         re.VERBOSE | re.ASCII)
+# The same tokens in undecoded bytes
+_JSON_TOKEN_BYTES = re.compile(_TOKEN_PATTERN.replace("NON_ASCII", r"[\x80-\xff]").replace(
+    "CHAR", r"[\xc0-\xff][\x80-\xbf]*|[^ \t\n\r]").encode(), re.VERBOSE)
+
+def _offsets(lengths) -> np.ndarray:
+    """int32 offsets (0, then the running total) of consecutive runs of ``lengths``."""
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int32)
+    np.cumsum(lengths, out=offsets[1:])
+    return offsets
+
+def _ranges(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Concatenation of arange(start, end) for every pair."""
+    lengths = (ends - starts).astype(np.int64)
+    shift = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    return shift + np.arange(lengths.sum(), dtype=np.int64)
+
+def _is_position(value) -> bool:
+    return isinstance(value, list) and len(value) >= 2 and isinstance(value[0], (int, float))
+
+def _is_ring(value, min_length: int) -> bool:
+    return isinstance(value, list) and len(value) >= min_length and _is_position(value[0])
+
+class GeometryBatch:
+    """Columnar (GeoArrow-style) representation of many GeoJSON geometries.
+
+    All positions live in one float64 ``coords`` array. Each geometry is a
+    list of parts, each part a list of rings and each ring a run of
+    positions; ``geom_offsets``, ``part_offsets`` and ``ring_offsets`` index
+    into the next level down. A Point is one part with one single-position
+    ring, a LineString one part with one ring, a Polygon one part with one
+    ring per shell/hole, and the Multi* types one part per member.
+
+    Geometries that cannot be represented (unsupported type, irregular
+    nesting, non-numeric or mixed-dimension positions, rings too short to
+    build) are listed in ``fallback`` so callers can handle them one by one.
+
+    ``decimals`` is None, or, if some geometries were read by
+    ExactDecimalCodec, the decimal places as written of every value of
+    ``coords`` (-1 where unknown).
+
+    The offsets are int32, so a batch holds at most 2**31 - 1 positions.
+    """
+
+    TYPES = ("Point", "MultiPoint", "LineString", "MultiLineString", "Polygon", "MultiPolygon")
+
+    def __init__(self, geometries: List[Tuple[int, Dict]]):
+        """Build from (feature index, GeoJSON geometry) pairs."""
+        self.fallback: List[int] = []
+        entries = []
+        for idx, geometry in geometries:
+            parts = self._parts(geometry.get("type"), geometry.get("coordinates"))
+            if parts is None:
+                self.fallback.append(idx)
+            else:
+                entries.append((idx, geometry["type"], parts, source_decimals(geometry)))
+
+        stacked = self._stack(entries)
+        if stacked is None and entries:
+            # Find the offending geometries so the rest can still be batched
+            good = []
+            for entry in entries:
+                if self._stack([entry]) is None:
+                    self.fallback.append(entry[0])
+                else:
+                    good.append(entry)
+            entries = good
+            stacked = self._stack(entries)
+        if stacked is not None and (stacked[1] != stacked[1][0]).any():
+            # Shapely cannot build a geometry mixing 2D and 3D positions
+            mixed = []
+            good = []
+            start = 0
+            for entry in entries:
+                count = sum(len(ring) for part in entry[2] for ring in part)
+                dims = stacked[1][start:start + count]
+                (mixed if (dims != dims[0]).any() else good).append(entry)
+                start += count
+            if mixed:
+                self.fallback.extend(entry[0] for entry in mixed)
+                entries = good
+                stacked = self._stack(entries)
+        if stacked is None:
+            stacked = np.empty((0, 2)), np.empty(0, dtype=np.int8)
+        self.fallback.sort()
+
+        self.coords, self.position_dims = stacked
+        self.feature_index = np.array([entry[0] for entry in entries], dtype=np.int64)
+        self.types = np.array([entry[1] for entry in entries], dtype=object)
+        geom_parts = [len(entry[2]) for entry in entries]
+        part_rings = [len(part) for entry in entries for part in entry[2]]
+        ring_lengths = [len(ring) for entry in entries for part in entry[2] for ring in part]
+        self.geom_offsets = _offsets(geom_parts)
+        self.part_offsets = _offsets(part_rings)
+        self.ring_offsets = _offsets(ring_lengths)
+        self.decimals = self._source_decimals(entries, ring_lengths)
+        self.reset()
+
+    @classmethod
+    def from_arrays(cls, coords: np.ndarray, position_dims: np.ndarray, feature_index: np.ndarray,
+                    types: np.ndarray, geom_offsets: np.ndarray, part_offsets: np.ndarray,
+                    ring_offsets: np.ndarray, decimals: Optional[np.ndarray] = None,
+                    fallback: Optional[List[int]] = None) -> "GeometryBatch":
+        """Build from arrays laid out as described in the class docstring."""
+        batch = cls.__new__(cls)
+        batch.fallback = fallback or []
+        batch.coords = coords
+        batch.position_dims = position_dims
+        batch.feature_index = feature_index
+        batch.types = types
+        batch.geom_offsets = geom_offsets
+        batch.part_offsets = part_offsets
+        batch.ring_offsets = ring_offsets
+        batch.decimals = decimals
+        batch.reset()
+        return batch
+
+    @classmethod
+    def concatenate(cls, batches: List["GeometryBatch"]) -> "GeometryBatch":
+        """One batch holding the geometries of ``batches``, in order."""
+        if not batches:
+            return cls([])
+        width = max(batch.coords.shape[1] for batch in batches)
+        coords = np.full((sum(len(batch.coords) for batch in batches), width), np.nan)
+        decimals = None
+        if any(batch.decimals is not None for batch in batches):
+            decimals = np.full(coords.shape, -1, dtype=np.int16)
+        offsets = {"geom_offsets": [], "part_offsets": [], "ring_offsets": []}
+        start = 0
+        for batch in batches:
+            end = start + len(batch.coords)
+            coords[start:end, :batch.coords.shape[1]] = batch.coords
+            if batch.decimals is not None:
+                decimals[start:end, :batch.coords.shape[1]] = batch.decimals
+            start = end
+            for name, lengths in offsets.items():
+                lengths.append(np.diff(getattr(batch, name)))
+        return cls.from_arrays(
+            coords,
+            np.concatenate([batch.position_dims for batch in batches]),
+            np.concatenate([batch.feature_index for batch in batches]),
+            np.concatenate([batch.types for batch in batches]),
+            *(_offsets(np.concatenate(lengths)) for lengths in offsets.values()),
+            decimals=decimals,
+            fallback=sorted(chain.from_iterable(batch.fallback for batch in batches)),
+        )
+
+    def take(self, rows: np.ndarray) -> "GeometryBatch":
+        """A batch of the geometries at ``rows``, without fallback features.
+
+        Trailing columns that none of the taken positions use are dropped.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        parts, rings, positions = self._members(rows)
+        dims = self.position_dims[positions]
+        width = int(dims.max()) if len(dims) else 2
+        decimals = None
+        if self.decimals is not None:
+            decimals = self.decimals[positions, :width]
+            if not (decimals >= 0).any():
+                decimals = None
+        batch = GeometryBatch.from_arrays(
+            self.coords[positions, :width], dims, self.feature_index[rows], self.types[rows],
+            _offsets(self.geom_offsets[rows + 1] - self.geom_offsets[rows]),
+            _offsets(self.part_offsets[parts + 1] - self.part_offsets[parts]),
+            _offsets(self.ring_offsets[rings + 1] - self.ring_offsets[rings]),
+            decimals=decimals,
+        )
+        if self._geometries is not None:
+            batch._geometries = self._geometries[rows]
+        return batch
+
+    def _members(self, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Part, ring and position numbers of the geometries at ``rows``."""
+        parts = _ranges(self.geom_offsets[rows], self.geom_offsets[rows + 1])
+        rings = _ranges(self.part_offsets[parts], self.part_offsets[parts + 1])
+        return parts, rings, _ranges(self.ring_offsets[rings], self.ring_offsets[rings + 1])
+
+    def positions_of(self, rows: np.ndarray) -> np.ndarray:
+        """Position numbers (rows of ``coords``) of the geometries at ``rows``, in order."""
+        return self._members(np.asarray(rows, dtype=np.int64))[2]
+
+    def fingerprints(self, salt: bytes) -> List[str]:
+        """A hash of every geometry, for looking up results stored for an identical one.
+
+        The hash covers the type, the number of parts, rings and positions,
+        the coordinates as float64 (so 1 and 1.0 are the same) and the
+        decimal places as written if known, with ``salt`` for the
+        parameters the result depends on.
+        """
+        if not len(self):
+            return []
+        first_part, end_part = self.geom_offsets[:-1], self.geom_offsets[1:]
+        first_ring, end_ring = self.part_offsets[first_part], self.part_offsets[end_part]
+        starts, ends = self.ring_offsets[first_ring], self.ring_offsets[end_ring]
+        dims = self.position_dims[starts]
+        width = self.coords.shape[1]
+        # Byte views sliced per geometry; geometries with fewer dims than the batch go through NumPy
+        coords = memoryview(np.ascontiguousarray(self.coords)).cast("B")
+        part_rings = memoryview(np.diff(self.part_offsets).astype(np.int32)).cast("B")
+        ring_lengths = memoryview(np.diff(self.ring_offsets).astype(np.int32)).cast("B")
+        written = np.zeros(len(self), dtype=bool)
+        if self.decimals is not None:
+            written = self.any_by_geometry((self.decimals >= 0).any(axis=1), self.position_geometry)
+        keys = []
+        for row, (geom_type, p0, p1, r0, r1, start, end, dim, known) in enumerate(zip(
+                self.types.tolist(), first_part.tolist(), end_part.tolist(), first_ring.tolist(), end_ring.tolist(),
+                starts.tolist(), ends.tolist(), dims.tolist(), written.tolist())):
+            digest = hashlib.blake2b(salt, digest_size=16)
+            digest.update(f"{geom_type}:{p1 - p0}:{r1 - r0}:{dim}:".encode())
+            digest.update(part_rings[4 * p0:4 * p1])
+            digest.update(ring_lengths[4 * r0:4 * r1])
+            if dim == width:
+                digest.update(coords[8 * width * start:8 * width * end])
+            else:
+                digest.update(np.ascontiguousarray(self.coords[start:end, :dim]).tobytes())
+            if known:
+                digest.update(b"decimals:" + np.ascontiguousarray(self.decimals[start:end, :dim]).tobytes())
+            keys.append(digest.hexdigest())
+        return keys
+
+    def reset(self):
+        """Forget the Shapely geometries built so far, after ``coords`` changed."""
+        self._geometries = None
+        self._parts_built = None
+        self._rings = None
+
+    def _source_decimals(self, entries, ring_lengths: List[int]) -> Optional[np.ndarray]:
+        """Decimal places as written, shaped like ``coords``; see the class docstring."""
+        known = [entry[3] for entry in entries]
+        if all(decimals is None for decimals in known):
+            return None
+        if all(decimals is not None for decimals in known) and (self.position_dims == self.coords.shape[1]).all():
+            stacked = np.concatenate(known)
+            if len(stacked) == self.coords.size:
+                return stacked.reshape(self.coords.shape)
+        # Positions have one length per geometry here, so a matching count lines up
+        result = np.full(self.coords.shape, -1, dtype=np.int16)
+        counts = np.add.reduceat(ring_lengths, self.part_offsets[self.geom_offsets[:-1]]) if entries else []
+        start = 0
+        for decimals, count in zip(known, counts):
+            dims = self.position_dims[start] if count else 0
+            if decimals is not None and len(decimals) == count * dims:
+                result[start:start + count, :dims] = decimals.reshape(count, dims)
+            start += count
+        return result
+
+    @staticmethod
+    def _parts(geom_type, coordinates) -> Optional[List[List[list]]]:
+        """Split coordinates into parts of rings, or None if they are not well formed."""
+        if not isinstance(coordinates, list) or not coordinates:
+            return None
+        if geom_type == "Point":
+            return [[[coordinates]]] if _is_position(coordinates) else None
+        if geom_type == "MultiPoint":
+            parts = [[[position]] for position in coordinates]
+            return parts if all(_is_position(part[0][0]) for part in parts) else None
+        if geom_type == "LineString":
+            return [[coordinates]] if _is_ring(coordinates, 2) else None
+        if geom_type == "MultiLineString":
+            return [[line] for line in coordinates] if all(_is_ring(line, 2) for line in coordinates) else None
+        if geom_type == "Polygon":
+            polygons = [coordinates]
+        elif geom_type == "MultiPolygon":
+            polygons = coordinates
+        else:
+            return None
+        for polygon in polygons:
+            if not isinstance(polygon, list) or not polygon or not all(_is_ring(ring, 4) for ring in polygon):
+                return None
+        return polygons
+
+    @staticmethod
+    def _stack(entries) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Stack every position of the entries into one (N, max dims) array.
+
+        Returns the array and the dimension of each position; with mixed
+        dimensions the missing trailing values are NaN.
+        """
+        positions = [position for entry in entries for part in entry[2] for ring in part for position in ring]
+        if not positions:
+            return None
+        try:
+            coords = np.array(positions, dtype=np.float64)
+        except (TypeError, ValueError):
+            coords = None
+        if coords is not None and coords.ndim == 2:
+            if coords.shape[1] < 2 or np.isnan(coords).any():
+                return None
+            return coords, np.full(len(coords), coords.shape[1], dtype=np.int8)
+
+        # Mixed 2D/3D positions: fill one column group at a time
+        dims = np.fromiter(map(len, positions), dtype=np.int64, count=len(positions))
+        coords = np.full((len(positions), int(dims.max())), np.nan)
+        try:
+            for dim in np.unique(dims):
+                rows = np.flatnonzero(dims == dim)
+                values = np.array([positions[i] for i in rows], dtype=np.float64)
+                if dim < 2 or values.ndim != 2 or np.isnan(values).any():
+                    return None
+                coords[rows, :dim] = values
+        except (TypeError, ValueError):
+            return None
+        return coords, dims.astype(np.int8)
+
+    def __len__(self) -> int:
+        return len(self.feature_index)
+
+    @property
+    def ring_lengths(self) -> np.ndarray:
+        return np.diff(self.ring_offsets)
+
+    @property
+    def part_geometry(self) -> np.ndarray:
+        """Geometry number of every part."""
+        return np.repeat(np.arange(len(self)), np.diff(self.geom_offsets))
+
+    @property
+    def ring_part(self) -> np.ndarray:
+        """Part number of every ring."""
+        return np.repeat(np.arange(len(self.part_offsets) - 1), np.diff(self.part_offsets))
+
+    @property
+    def ring_geometry(self) -> np.ndarray:
+        """Geometry number of every ring."""
+        return self.part_geometry[self.ring_part]
+
+    @property
+    def ring_is_first(self) -> np.ndarray:
+        """True for the first ring of each part (the shell of a polygon)."""
+        first = np.zeros(self.part_offsets[-1], dtype=bool)
+        first[self.part_offsets[:-1]] = True
+        return first
+
+    @property
+    def position_ring(self) -> np.ndarray:
+        """Ring number of every position."""
+        return np.repeat(np.arange(len(self.ring_offsets) - 1), self.ring_lengths)
+
+    @property
+    def position_geometry(self) -> np.ndarray:
+        """Geometry number of every position."""
+        return np.repeat(self.ring_geometry, self.ring_lengths)
+
+    @property
+    def base_types(self) -> np.ndarray:
+        """Geometry type with the Multi prefix removed (the type of each part)."""
+        return np.array([t[5:] if t.startswith("Multi") else t for t in self.types], dtype=object)
+
+    def any_by_geometry(self, mask: np.ndarray, owner: np.ndarray) -> np.ndarray:
+        """Reduce a mask over parts, rings or positions to a mask over geometries."""
+        result = np.zeros(len(self), dtype=bool)
+        result[owner[mask]] = True
+        return result
+
+    def linearrings(self) -> np.ndarray:
+        """Shapely linear rings for every ring of the (Multi)Polygons; None elsewhere."""
+        if self._rings is None:
+            n_rings = len(self.ring_lengths)
+            rings = np.full(n_rings, None, dtype=object)
+            polygonal = (self.base_types == "Polygon")[self.ring_geometry] if n_rings else np.zeros(0, bool)
+            if polygonal.any():
+                ring_ids = np.flatnonzero(polygonal)
+                position_mask = np.repeat(polygonal, self.ring_lengths)
+                local = np.repeat(np.arange(len(ring_ids)), self.ring_lengths[ring_ids])
+                rings[ring_ids] = shapely.linearrings(self.coords[position_mask, :2], indices=local)
+            self._rings = rings
+        return self._rings
+
+    def part_geometries(self) -> np.ndarray:
+        """Shapely geometry of every part: a Point, LineString or Polygon."""
+        if self._parts_built is not None:
+            return self._parts_built
+        n_parts = len(self.part_offsets) - 1
+        parts = np.full(n_parts, None, dtype=object)
+        part_types = self.base_types[self.part_geometry] if n_parts else np.zeros(0, dtype=object)
+        ring_part = self.ring_part
+        ring_lengths = self.ring_lengths
+        xy = self.coords[:, :2]
+
+        # Point and line parts have exactly one ring
+        for kind, build in (("Point", shapely.points), ("LineString", shapely.linestrings)):
+            part_ids = np.flatnonzero(part_types == kind)
+            if len(part_ids):
+                ring_ids = self.part_offsets[part_ids]
+                position_mask = np.repeat(np.isin(ring_part, part_ids), ring_lengths)
+                if kind == "Point":
+                    parts[part_ids] = build(xy[position_mask])
+                else:
+                    indices = np.repeat(np.arange(len(ring_ids)), ring_lengths[ring_ids])
+                    parts[part_ids] = build(xy[position_mask], indices=indices)
+
+        # Polygon parts: first ring is the shell, the rest are holes
+        part_ids = np.flatnonzero(part_types == "Polygon")
+        if len(part_ids):
+            rings = self.linearrings()
+            ring_ids = np.flatnonzero(rings != None)  # noqa: E711 - element-wise comparison
+            local = np.unique(ring_part[ring_ids], return_inverse=True)[1]
+            parts[part_ids] = shapely.polygons(rings[ring_ids], indices=local)
+
+        self._parts_built = parts
+        return parts
+
+    def geometries(self) -> np.ndarray:
+        """Build all geometries as a Shapely array with the array constructors."""
+        if self._geometries is not None:
+            return self._geometries
+        geoms = np.full(len(self), None, dtype=object)
+        parts = self.part_geometries()
+        part_geometry = self.part_geometry
+        single = ~np.array([t.startswith("Multi") for t in self.types], dtype=bool)
+        single_parts = single[part_geometry] if len(parts) else np.zeros(0, bool)
+        geoms[part_geometry[single_parts]] = parts[single_parts]
+        for kind, build in (("MultiPoint", shapely.multipoints),
+                            ("MultiLineString", shapely.multilinestrings),
+                            ("MultiPolygon", shapely.multipolygons)):
+            part_mask = (self.types == kind)[part_geometry] if len(parts) else np.zeros(0, bool)
+            if part_mask.any():
+                owner = part_geometry[part_mask]
+                local = np.unique(owner, return_inverse=True)[1]
+                geoms[np.unique(owner)] = build(parts[part_mask], indices=local)
+        self._geometries = geoms
+        return geoms
+
+# Nesting of the positions of each geometry type below its coordinates array
+_POSITION_DEPTH = {"Point": 0, "MultiPoint": 1, "LineString": 1, "MultiLineString": 2, "Polygon": 2,
+                   "MultiPolygon": 3}
+
+class FeatureStore:
+    """The features of a document with their coordinates held in one GeometryBatch.
+
+    ``data`` is the document: a FeatureCollection whose ``features`` are
+    ``features``, or a single Feature. Every geometry the batch can hold has
+    its ``coordinates`` replaced by ``placeholder``, so the nested lists are
+    freed and the rest of the feature (properties, other members) is kept
+    as parsed; ``rows`` gives the batch row of every feature, or -1 for the
+    ones whose geometry is still a plain GeoJSON object.
+
+    process_geojson, calculate_area and UnifiedValidator.validate_geometry
+    accept a store in place of the parsed document, and dumps writes it
+    back as the JSON codec would have written the document.
+    """
+
+    def __init__(self, data: Dict, features: List[Dict], batch: GeometryBatch, placeholder: str):
+        self.data = data
+        self.features = features
+        self.batch = batch
+        self.placeholder = placeholder
+        self.rows = np.full(len(features), -1, dtype=np.int32)
+        self.rows[batch.feature_index] = np.arange(len(batch), dtype=np.int32)
+
+    @classmethod
+    def from_features(cls, data: Dict, chunks: Iterator[List[Dict]]) -> "FeatureStore":
+        """Build a store for ``data`` from its features, given in chunks.
+
+        The coordinates of a chunk are moved into arrays before the next
+        chunk is read, so only one chunk is held as nested lists at a time.
+        """
+        placeholder = f"coordinates-{uuid.uuid4().hex}"
+        features: List[Dict] = []
+        batches = []
+        for chunk in chunks:
+            offset = len(features)
+            features.extend(chunk)
+            batch = GeometryBatch([
+                (offset + k, feature["geometry"]) for k, feature in enumerate(chunk)
+                if isinstance(feature.get("geometry"), dict) and feature["geometry"].get("coordinates")
+            ])
+            for i in batch.feature_index.tolist():
+                geometry = features[i]["geometry"]
+                geometry["coordinates"] = placeholder
+                if isinstance(geometry, DecimalGeometry):
+                    geometry.decimals = None
+            batches.append(batch)
+        return cls(data, features, GeometryBatch.concatenate(batches), placeholder)
+
+    def _positions(self, row: int) -> Tuple[int, int]:
+        """First and end position of the geometry at a batch row."""
+        batch = self.batch
+        first_ring = batch.part_offsets[batch.geom_offsets[row]]
+        end_ring = batch.part_offsets[batch.geom_offsets[row + 1]]
+        return int(batch.ring_offsets[first_ring]), int(batch.ring_offsets[end_ring])
+
+    def _nest(self, row: int, items: list, join: Callable[[list, int], Any]) -> Any:
+        """Group one item per position of a geometry into its coordinates array.
+
+        ``join(items, depth)`` makes one array of items at ``depth`` levels
+        below the coordinates array.
+        """
+        batch = self.batch
+        geom_type = batch.types[row]
+        depth = _POSITION_DEPTH[geom_type]
+        if depth == 0:
+            return items[0]
+        if depth == 1:
+            return join(items, 0)
+        start = self._positions(row)[0]
+        rings = batch.part_offsets[batch.geom_offsets[row]:batch.geom_offsets[row + 1] + 1]
+        bounds = (batch.ring_offsets[rings[0]:rings[-1] + 1] - start).tolist()
+        ring_items = [join(items[a:b], depth - 1) for a, b in zip(bounds, bounds[1:])]
+        if depth == 2:
+            return join(ring_items, 0)
+        rings = (rings - rings[0]).tolist()
+        return join([join(ring_items[a:b], 1) for a, b in zip(rings, rings[1:])], 0)
+
+    def geometry(self, i: int) -> Dict:
+        """The GeoJSON geometry of feature ``i``, rebuilt from the arrays if they hold it."""
+        shell = self.features[i].get("geometry")
+        row = int(self.rows[i])
+        if row < 0:
+            return shell
+        start, end = self._positions(row)
+        dims = int(self.batch.position_dims[start])
+        values = self.batch.coords[start:end, :dims]
+        geometry = DecimalGeometry(shell)
+        geometry["coordinates"] = self._nest(row, values.tolist(), lambda items, depth: items)
+        if self.batch.decimals is not None and (self.batch.decimals[start:end, :dims] >= 0).all():
+            geometry.decimals = self.batch.decimals[start:end, :dims].ravel()
+        return geometry
+
+    def subset(self, indices: List[int]) -> "FeatureStore":
+        """A store of the features ``indices`` (in order), sharing their objects with this one."""
+        rows = self.rows[indices]
+        batched = rows >= 0
+        batch = self.batch.take(rows[batched])
+        batch.feature_index = np.flatnonzero(batched)
+        features = [self.features[i] for i in indices]
+        return FeatureStore({"type": "FeatureCollection", "features": features}, features, batch, self.placeholder)
+
+    def detach(self, indices: List[int], coordinates: List[Any]):
+        """Give features ``indices`` these coordinates as plain GeoJSON, taking them out of the arrays."""
+        for i, value in zip(indices, coordinates):
+            self.features[i]["geometry"]["coordinates"] = value
+        keep = np.ones(len(self.batch), dtype=bool)
+        keep[self.rows[indices]] = False
+        self.batch = self.batch.take(np.flatnonzero(keep))
+        self.rows[:] = -1
+        self.rows[self.batch.feature_index] = np.arange(len(self.batch), dtype=np.int32)
+
+    def select(self, indices: List[int]) -> GeometryBatch:
+        """The batch of features ``indices``, like GeometryBatch of their geometries.
+
+        Features whose geometry is not in the arrays are its ``fallback``.
+        """
+        rows = self.rows[indices]
+        batch = self.batch.take(rows[rows >= 0])
+        batch.fallback = [i for i, row in zip(indices, rows.tolist()) if row < 0]
+        return batch
+
+    def shapes(self, types: Tuple[str, ...]) -> Dict[int, Any]:
+        """Shapely geometries of the batched features of the given types, by feature index."""
+        batch = self.batch.take(np.flatnonzero(np.isin(self.batch.types, types)))
+        return dict(zip(batch.feature_index.tolist(), batch.geometries()))
+
+    def _coordinates_text(self, row: int, indent: Optional[int], level: int) -> str:
+        """The coordinates array of a batch row as JSON, starting at nesting ``level``."""
+        start, end = self._positions(row)
+        dims = int(self.batch.position_dims[start])
+        values = self.batch.coords[start:end, :dims]
+        flat = values.ravel().tolist()
+        if np.isfinite(values).all():
+            numbers = list(map(repr, flat))
+        else:
+            numbers = [repr(v) if ok else json_codec.dumps(v, None) for v, ok in zip(flat, np.isfinite(values).flat)]
+        depth = _POSITION_DEPTH[self.batch.types[row]]
+
+        def join(items: List[str], item_depth: int) -> str:
+            if indent is None:
+                return "[" + ",".join(items) + "]"
+            inner = "\n" + " " * (indent * (level + item_depth + 1))
+            return "[" + inner + ("," + inner).join(items) + "\n" + " " * (indent * (level + item_depth)) + "]"
+
+        positions = [join(numbers[k:k + dims], depth) for k in range(0, len(numbers), dims)]
+        return self._nest(row, positions, join)
+
+    def feature_texts(self, indent: Optional[int] = 2, level: int = 0) -> Iterator[str]:
+        """Serialize every feature, as nested ``level`` levels deep with ``indent``.
+
+        Features with ``indent`` are written as they appear at that level of
+        a document serialized with it (see _process_feature_batch); without
+        it they are compact.
+        """
+        quoted = f'"{self.placeholder}"'
+        margin = " " * (indent * level) if indent is not None else ""
+        for feature, row in zip(self.features, self.rows.tolist()):
+            text = json_codec.dumps(feature, indent)
+            if margin:
+                text = margin + text.replace("\n", "\n" + margin)
+            if row >= 0:
+                at = text.index(quoted)
+                line = text.rfind("\n", 0, at) + 1
+                prefix = text[line:at]
+                depth = (len(prefix) - len(prefix.lstrip(" "))) // indent if indent else 0
+                text = text[:at] + self._coordinates_text(row, indent, depth) + text[at + len(quoted):]
+            yield text
+
+    def dumps(self, indent: Optional[int] = 2) -> str:
+        """Serialize the document like json_codec.dumps(data, indent).
+
+        Batched coordinates are written as floats, which is what
+        process_geojson leaves them as.
+        """
+        if self.data.get("type") != "FeatureCollection":
+            return next(self.feature_texts(indent))
+        return _splice_features(dict(self.data), list(self.feature_texts(indent, 2)), indent)
+
+def load_features(content: Union[bytes, str, mmap.mmap]) -> Any:
+    """Parse a document, as a FeatureStore if it is a Feature or FeatureCollection.
+
+    The text is fed to a FeatureStreamSplitter SPLIT_BLOCK_BYTES at a time
+    and the features are parsed chunk by chunk (CHUNK_FEATURES at a time)
+    as they are split off, so neither the whole document as nested lists
+    nor, for a memory-mapped ``content``, a copy of its bytes is ever held.
+    Anything the splitter does not handle is parsed whole, which also
+    raises the codec's usual errors for invalid JSON.
+    """
+    content = content.encode() if isinstance(content, str) else content
+    splitter = FeatureStreamSplitter()
+    envelope: Dict = {}
+
+    def chunks() -> Iterator[List[Dict]]:
+        pending: List[bytes] = []
+        with memoryview(content) as view:
+            for start in range(0, len(view), SPLIT_BLOCK_BYTES):
+                pending += splitter.feed(view[start:start + SPLIT_BLOCK_BYTES])
+                while len(pending) >= CHUNK_FEATURES:
+                    yield [json_codec.loads(raw) for raw in pending[:CHUNK_FEATURES]]
+                    del pending[:CHUNK_FEATURES]
+        splitter.close()
+        if pending:
+            yield [json_codec.loads(raw) for raw in pending]
+
+    try:
+        store = FeatureStore.from_features(envelope, chunks())
+        if splitter.mode != "header":
+            envelope.update(json_codec.loads(splitter.header + splitter.trailer))
+    except ValueError:
+        store = None
+    if store is not None and envelope.get("type") == "FeatureCollection" and envelope.get("features") == []:
+        envelope["features"] = store.features
+        return store
+    del store, splitter
+
+    data = json_codec.loads(content) if isinstance(content, bytes) else json_codec.loads_buffer(content)
+    if isinstance(data, dict) and data.get("type") == "Feature":
+        return FeatureStore.from_features(data, iter([[data]]))
+    if isinstance(data, dict) and data.get("type") == "FeatureCollection" and isinstance(data.get("features"), list) \
+            and all(isinstance(feature, dict) for feature in data["features"]):
+        features = data["features"]
+        return FeatureStore.from_features(data, (features[start:start + CHUNK_FEATURES]
+                                                 for start in range(0, len(features), CHUNK_FEATURES)))
+    return data
+
+class _DuplicateKeyError(ValueError):
+    pass
+
+def _reject_duplicate_keys(pairs: List[Tuple[str, Any]]) -> Dict:
+    """object_pairs_hook that fails on objects with repeated keys."""
+    obj = dict(pairs)
+    if len(obj) != len(pairs):
+        raise _DuplicateKeyError
+    return obj
+
+BACKSLASH = ord("\\")
+
+# Text decoded past the first token error when looking for the parser's error
+PARSE_WINDOW_BYTES = 1024 * 1024
+
+def _leading_parse_error(buffer: Union[bytes, mmap.mmap], hint: int = 0) -> Optional[Tuple[int, str]]:
+    """Byte position and message of the error json.loads reports for a bytes-like document.
+
+    None if the document parses or the duplicate key hook stops it first,
+    as in validate_json_structure. The parser reads from the start, so an
+    error it finds in a prefix of the text is also the first error of the
+    whole text unless it is due to the cut. Prefixes are decoded from
+    ``hint`` (the first error the tokenizer found) plus PARSE_WINDOW_BYTES,
+    doubling until that is certain.
+    """
+    end = hint + PARSE_WINDOW_BYTES
+    while True:
+        end = min(end, len(buffer))
+        while end < len(buffer) and buffer[end] & 0xC0 == 0x80:
+            end -= 1  # Do not cut a character
+        text = buffer[:end].decode("utf-8")
+        try:
+            json.loads(text, object_pairs_hook=_reject_duplicate_keys)
+            if end == len(buffer):
+                return None
+        except _DuplicateKeyError:
+            return None
+        except json.JSONDecodeError as e:
+            if end == len(buffer) or (e.pos + 16 < len(text) and not e.msg.startswith("Unterminated string")):
+                return len(text[:e.pos].encode()), e.msg
+        end *= 2
+
+def _count_members(buffer: Union[bytes, mmap.mmap]) -> int:
+    """Number of name/value pairs in the objects of a valid JSON document: its colons outside strings.
+
+    Counted with NumPy in blocks of ByteLineIndex.BLOCK bytes without
+    decoding; only quotes after a backslash are looked at one by one.
+    """
+    total = 0
+    inside = False
+    for block in range(0, len(buffer), ByteLineIndex.BLOCK):
+        view = np.frombuffer(buffer, np.uint8, count=min(ByteLineIndex.BLOCK, len(buffer) - block), offset=block)
+        quotes = np.flatnonzero(view == ord('"'))
+        previous = view[np.maximum(quotes - 1, 0)]
+        if len(quotes) and quotes[0] == 0:
+            previous[0] = buffer[block - 1] if block else 0
+        escaped = []
+        for pos in quotes[previous == BACKSLASH].tolist():
+            run = 1
+            while block + pos - run > 0 and buffer[block + pos - run - 1] == BACKSLASH:
+                run += 1
+            if run % 2:
+                escaped.append(pos)
+        if escaped:
+            quotes = np.setdiff1d(quotes, escaped)
+        colons = np.flatnonzero(view == ord(":"))
+        total += int(np.count_nonzero((np.searchsorted(quotes, colons) + inside) % 2 == 0))
+        inside ^= bool(len(quotes) % 2)
+        del view
+    return total
+
+def _count_parsed_members(data: Any) -> int:
+    """Number of name/value pairs in the objects of a parsed document (or FeatureStore)."""
+    stack = [data.data if isinstance(data, FeatureStore) else data]
+    total = 0
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            total += len(value)
+            stack.extend(item for item in value.values() if isinstance(item, (dict, list)))
+        elif isinstance(value, list):
+            stack.extend(item for item in value if isinstance(item, (dict, list)))
+    return total
+
+VALIDATION_ENGINES = ("vectorized", "scalar")
+VALIDATION_MODES = ("full", "fail_fast", "sample", "limit")
+
 class UnifiedValidator:
     ERROR_CODES = {
         'DUPLICATE_KEY': 23,
@@ -35,8 +1682,19 @@ class UnifiedValidator:
         'TRAILING_COMMA': 5
     }
 
+    ERROR_DESCRIPTIONS = {
+        1: "Invalid JSON syntax",
+        4: "Missing double quotes around a string or property name",
+        5: "Trailing comma before a closing bracket or brace",
+        6: "Unexpected closing brace '}'",
+        7: "Unexpected closing bracket ']'",
+        22: "Multiple root elements",
+        23: "Duplicate key in object"
+    }
+
     VALIDATION_CRITERIA = {
         'invalid': {
+            'invalid_geometry': {'relevant': ['Point', 'MultiPoint', 'LineString', 'MultiLineString', 'Polygon', 'MultiPolygon', 'GeometryCollection'], 'input': 'shapely_geom'},
             'unclosed': {'relevant': ['Polygon'], 'input': 'json_geometry'},
             'less_three_unique_nodes': {'relevant': ['Polygon'], 'input': 'json_geometry'},
             'exterior_not_ccw': {'relevant': ['Polygon'], 'input': 'shapely_geom'},
@@ -45,41 +1703,99 @@ class UnifiedValidator:
         },
         'problematic': {
             'holes': {'relevant': ['Polygon'], 'input': 'shapely_geom'},
-            'self_intersection': {'relevant': ['Polygon'], 'input': 'shapely_geom'},
+            'self_intersection': {'relevant': ['LineString', 'Polygon'], 'input': 'shapely_geom'},
             'duplicate_nodes': {'relevant': ['LineString', 'Polygon'], 'input': 'json_geometry'},
             'excessive_coordinate_precision': {'relevant': ['Point', 'LineString', 'Polygon'], 'input': 'json_geometry'},
             'excessive_vertices': {'relevant': ['LineString', 'Polygon'], 'input': 'json_geometry'},
             '3d_coordinates': {'relevant': ['Point', 'LineString', 'Polygon'], 'input': 'json_geometry'},
             'outside_lat_lon_boundaries': {'relevant': ['Point', 'LineString', 'Polygon'], 'input': 'json_geometry'},
-            'crosses_antimeridian': {'relevant': ['LineString', 'Polygon'], 'input': 'json_geometry'}
+            'crosses_antimeridian': {'relevant': ['LineString', 'Polygon'], 'input': 'json_geometry'},
+            'overlapping_features': {'relevant': ['Polygon', 'MultiPolygon'], 'input': 'feature_collection', 'default': False},
+            'duplicate_geometry': {'relevant': ['Point', 'MultiPoint', 'LineString', 'MultiLineString', 'Polygon', 'MultiPolygon', 'GeometryCollection'], 'input': 'feature_collection', 'default': False}
         }
     }
 
+    # Filled by @UnifiedValidator.rule below, in VALIDATION_CRITERIA order
+    RULES: Dict[str, "ValidationRule"] = {}
+
+    # Features per GeometryBatch; also how often validate_geometry reports progress
+    BATCH_FEATURES = 5000
+
+    # First batch size in fail_fast mode; it doubles up to BATCH_FEATURES, so an early error is found quickly
+    FAIL_FAST_BATCH = 64
+
+    # Structure errors reported at most, unless a mode asks for fewer
+    MAX_STRUCTURE_ERRORS = 500
+
+    # Single geometries with more vertices than this are reported as excessive_vertices
+    MAX_VERTICES = 10000
+
+    # duplicate_geometry compares coordinates rounded to this many decimals (about 1 cm)
+    DUPLICATE_DECIMALS = 7
+
+    @classmethod
+    def rule(cls, name: str, bulk=None):
+        """Register the check for a VALIDATION_CRITERIA entry.
+
+        The decorated function receives one input as declared in the table
+        (the GeoJSON geometry dict or the Shapely geometry) and returns True
+        if the geometry has the issue. ``bulk`` optionally evaluates the rule
+        for a whole GeometryBatch and returns a mask over its geometries.
+
+        Rules with the "feature_collection" input compare features with each
+        other: they run once, after the per-feature rules, on a FeatureSet
+        of all checked features and return findings, dicts whose
+        "features" lists the feature indices involved.
+
+        Entries with "default": False only run when named in ``rules``.
+        """
+        for category, criteria in cls.VALIDATION_CRITERIA.items():
+            if name in criteria:
+                break
+        else:
+            raise KeyError(f"{name} is not listed in VALIDATION_CRITERIA")
+
+        def register(check):
+            cls.RULES[name] = ValidationRule(name, category, criteria[name], check, bulk)
+            order = [n for group in cls.VALIDATION_CRITERIA.values() for n in group]
+            cls.RULES = {n: cls.RULES[n] for n in order if n in cls.RULES}
+            return check
+        return register
+
+    def select_rules(self, rules: Optional[List[str]] = None, skip_rules: Optional[List[str]] = None) -> List["ValidationRule"]:
+        """Rules to run: the default ones, or only ``rules``, minus ``skip_rules``."""
+        for name in (rules or []) + (skip_rules or []):
+            if name not in self.RULES:
+                raise ValueError(f"Unknown validation rule: {name}")
+        selected = [rule for name, rule in self.RULES.items() if (rule.default if rules is None else name in rules)]
+        return [rule for rule in selected if rule.name not in (skip_rules or [])]
+
     def get_line_col(self, text: str, pos: int) -> Tuple[int, int]:
         """Convert character position to line and column numbers."""
-        lines = text[:pos+1].splitlines()
-        if not lines:
-            return 1, 1
-        line_num = len(lines)
-        col_num = len(lines[-1])
-        return line_num, col_num
+        return LineIndex(text).line_col(pos)
 
-    def format_error_message(self, code: int, pos: int, json_input: str, context: str = "") -> str:
-        """Format error message with location and context."""
-        line_num, col_num = self.get_line_col(json_input, pos)
+    def format_error_message(self, code: int, pos: int, json_input: Union[str, bytes, mmap.mmap], context: str = "",
+                             line_index: Union[LineIndex, "ByteLineIndex", None] = None) -> str:
+        """Format error message with location and context.
+
+        Pass a ``line_index`` built once for ``json_input`` when formatting
+        many errors, so the document is not rescanned per error. For
+        bytes-like input ``pos`` is a byte offset.
+        """
+        if line_index is None:
+            line_index = LineIndex(json_input) if isinstance(json_input, str) else ByteLineIndex(json_input)
         desc = self.ERROR_DESCRIPTIONS.get(code, "Unknown error")
         
-        lines = json_input.splitlines()
-        if 0 <= line_num-1 < len(lines):
-            error_line = lines[line_num-1]
+        if 0 <= pos <= len(json_input):
+            line_num, col_num, error_line, pointer_col = line_index.excerpt(pos)
             if len(error_line) > 100:
-                if col_num > 80:
-                    error_line = "..." + error_line[col_num-40:col_num+40] + "..."
-                    col_num = 43
+                if pointer_col > 80:
+                    error_line = "..." + error_line[pointer_col-40:pointer_col+40] + "..."
+                    pointer_col = 43
                 else:
                     error_line = error_line[:100] + "..."
             
-            pointer = " " * (col_num-1) + "^"
+            pointer = " " * (pointer_col-1) + "^"
             context_msg = f"\nAt line {line_num}, column {col_num}:\n{error_line}\n{pointer}"
             if context:
                 context_msg += f"\nContext: {context}"
@@ -88,329 +1804,1169 @@ class UnifiedValidator:
         
         return f"{desc}{context_msg}"
 
-    def validate_json_structure(self, json_input: str) -> List[Dict]:
-        """Validate JSON structure and return list of errors."""
+    def validate_json_structure(self, json_input: Union[str, bytes, mmap.mmap],
+                                max_errors: Optional[int] = None) -> List[Dict]:
+        """Validate JSON structure and return list of errors.
+
+        If the document does not parse, it is tokenized once (tracking
+        strings and escapes, so brackets inside strings are ignored) and
+        every structural problem listed in ERROR_CODES is reported, up to
+        ``max_errors`` (MAX_STRUCTURE_ERRORS) errors. The scan stops as
+        soon as that many are found.
+
+        Bytes-like input, such as a memory-mapped upload, is tokenized as
+        bytes and positions are byte offsets; otherwise the errors are the
+        same as for its decoded text. Only the text up to shortly after the
+        first error is decoded, for the parser (see _leading_parse_error).
+        """
         errors = []
-        structure_count = 0
-        error_count = 0
-        ERROR_LIMIT = 500
+        ERROR_LIMIT = max_errors or self.MAX_STRUCTURE_ERRORS
+        seen = set()
+
+        def add(code: int, pos: int, context: str):
+            if (code, pos) in seen or len(errors) >= ERROR_LIMIT:
+                return
+            seen.add((code, pos))
+            errors.append({
+                'code': code,
+                'structure': len(errors),
+                'position': pos,
+                'context': context
+            })
 
         try:
-            # Quick validation attempt first
-            try:
-                json.loads(json_input)
-                return []  # Return empty list if JSON is valid
-            except json.JSONDecodeError as e:
-                errors.append({
-                    'code': 1,
-                    'structure': structure_count,
-                    'position': e.pos,
-                    'context': e.msg
-                })
-                structure_count += 1
-                error_count += 1
+            # Quick validation attempt first; json.loads silently keeps the
+            # last of duplicate keys, so the hook detects them
+            binary = not isinstance(json_input, str)
+            if not binary:
+                try:
+                    json.loads(json_input, object_pairs_hook=_reject_duplicate_keys)
+                    return []  # Return empty list if JSON is valid
+                except json.JSONDecodeError as e:
+                    add(1, e.pos, e.msg)
+                    if len(errors) >= ERROR_LIMIT:
+                        return errors
+                except _DuplicateKeyError:
+                    pass
 
-            # Additional structure validation
-            stack = []
-            positions = []
-            root_count = 0
-            
-            for i, char in enumerate(json_input):
-                if char in '{[':
-                    if not stack:
-                        root_count += 1
-                        if root_count > 1:
-                            errors.append({
-                                'code': self.ERROR_CODES['MULTIPLE_ROOT'],
-                                'structure': structure_count,
-                                'position': i,
-                                'context': f"Found another root element starting with '{char}'"
-                            })
-                            structure_count += 1
-                            error_count += 1
-                    stack.append(char)
-                    positions.append(i)
-                elif char in '}]':
-                    if not stack:
-                        code = self.ERROR_CODES['UNEXPECTED_BRACE_CLOSE'] if char == '}' else self.ERROR_CODES['UNEXPECTED_BRACKET_CLOSE']
-                        errors.append({
-                            'code': code,
-                            'structure': structure_count,
-                            'position': i,
-                            'context': f"Found closing '{char}' without matching opening bracket/brace"
-                        })
-                        structure_count += 1
-                        error_count += 1
-                    elif stack and ((stack[-1] == '{' and char == '}') or (stack[-1] == '[' and char == ']')):
-                        stack.pop()
-                        positions.pop()
-                    else:
-                        errors.append({
-                            'code': self.ERROR_CODES['UNEXPECTED_BRACKET_CLOSE'],
-                            'structure': structure_count,
-                            'position': i,
-                            'context': f"Expected closing '{']' if stack[-1] == '[' else '}'}'  but found '{char}'"
-                        })
-                        structure_count += 1
-                        error_count += 1
-                        if stack:
-                            stack.pop()
-                            positions.pop()
-
-                if error_count >= ERROR_LIMIT:
+            # Frames are [opening char, position, state, keys, last comma position]
+            stack: List[list] = []
+            root_done = False
+
+            def value(pos: int, desc: str):
+                """Handle a value token (or the opening of a container)."""
+                nonlocal root_done
+                if not stack:
+                    if root_done:
+                        add(self.ERROR_CODES['MULTIPLE_ROOT'], pos, f"Found another root element starting with {desc}")
+                    return
+                frame = stack[-1]
+                state = frame[2]
+                if frame[0] == '{':
+                    if state in ('key_or_end', 'key'):
+                        add(1, pos, f"Expected property name but found {desc}")
+                    elif state == 'colon':
+                        add(1, pos, f"Expected ':' but found {desc}")
+                    elif state == 'comma_or_end':
+                        add(1, pos, f"Expected ',' or '}}' but found {desc}")
+                elif state == 'comma_or_end':
+                    add(1, pos, f"Expected ',' or ']' but found {desc}")
+
+            def value_done():
+                nonlocal root_done
+                if stack:
+                    stack[-1][2] = 'comma_or_end'
+                else:
+                    root_done = True
+
+            def key(pos: int, name: str) -> bool:
+                """Handle a string-like token; returns True if it was used as a property name."""
+                if not stack or stack[-1][0] != '{':
+                    return False
+                frame = stack[-1]
+                if frame[2] == 'comma_or_end':
+                    add(1, pos, f"Expected ',' or '}}' but found {name}")
+                elif frame[2] not in ('key_or_end', 'key'):
+                    return False
+                if name in frame[3]:
+                    add(self.ERROR_CODES['DUPLICATE_KEY'], pos, f"Duplicate key {name}")
+                frame[3].add(name)
+                frame[2] = 'colon'
+                return True
+
+            for match in (_JSON_TOKEN_BYTES if binary else _JSON_TOKEN).finditer(json_input):
+                if len(errors) >= ERROR_LIMIT:
                     break
+                kind = match.lastgroup
+                token = match.group(kind)
+                if binary:
+                    token = token.decode("utf-8", "replace")
+                pos = match.start(kind)
 
+                if kind == 'punct':
+                    if token in '{[':
+                        value(pos, f"'{token}'")
+                        if not stack and root_done:
+                            root_done = False
+                        stack.append([token, pos, 'key_or_end' if token == '{' else 'value_or_end', set(), -1])
+                    elif token in '}]':
+                        code = self.ERROR_CODES['UNEXPECTED_BRACE_CLOSE'] if token == '}' else self.ERROR_CODES['UNEXPECTED_BRACKET_CLOSE']
+                        opening = '{' if token == '}' else '['
+                        if not any(frame[0] == opening for frame in stack):
+                            add(code, pos, f"Found closing '{token}' without matching opening bracket/brace")
+                            continue
+                        while stack[-1][0] != opening:
+                            # The inner containers were never closed
+                            inner = stack.pop()
+                            add(code, pos, f"Expected closing '{']' if inner[0] == '[' else '}'}' but found '{token}'")
+                        frame = stack.pop()
+                        if frame[2] in ('key', 'value') and frame[4] >= 0 and (frame[0] == '[' or frame[2] == 'key'):
+                            add(self.ERROR_CODES['TRAILING_COMMA'], frame[4], f"Comma followed by '{token}'")
+                        elif frame[0] == '{' and frame[2] in ('colon', 'value'):
+                            add(1, pos, "Missing value for the last property")
+                        value_done()
+                    elif token == ':':
+                        if stack and stack[-1][0] == '{' and stack[-1][2] == 'colon':
+                            stack[-1][2] = 'value'
+                        else:
+                            add(1, pos, "Unexpected ':'")
+                    else:
+                        if stack and stack[-1][2] == 'comma_or_end':
+                            stack[-1][2] = 'key' if stack[-1][0] == '{' else 'value'
+                            stack[-1][4] = pos
+                        else:
+                            add(1, pos, "Unexpected ','")
+                elif kind == 'string':
+                    if not key(pos, token):
+                        value(pos, "a string")
+                        value_done()
+                elif kind in ('single', 'word') and token not in ('true', 'false', 'null'):
+                    add(self.ERROR_CODES['MISSING_QUOTES'], pos, f"{token} is not enclosed in double quotes")
+                    if not key(pos, f'"{token.strip(chr(39))}"'):
+                        value(pos, token)
+                        value_done()
+                elif kind == 'unterminated':
+                    add(1, pos, "Unterminated string")
+                    if not key(pos, token):
+                        value(pos, "a string")
+                        value_done()
+                elif kind == 'other':
+                    add(1, pos, f"Unexpected character '{token}'")
+                else:
+                    # Numbers and true/false/null
+                    if stack and stack[-1][0] == '{' and stack[-1][2] in ('key_or_end', 'key'):
+                        add(self.ERROR_CODES['MISSING_QUOTES'], pos, f"Property name {token} is not enclosed in double quotes")
+                        key(pos, f'"{token}"')
+                    else:
+                        value(pos, token)
+                        value_done()
+
+            for frame in stack:
+                add(1, frame[1], f"'{frame[0]}' is never closed")
+
+            if binary:
+                # Put the parser's error first, as for text
+                found = errors[:]
+                errors.clear()
+                seen.clear()
+                leading = _leading_parse_error(json_input, min((error['position'] for error in found), default=0))
+                if leading is None and not found:
+                    return []
+                if leading is not None:
+                    add(1, *leading)
+                for error in found:
+                    add(error['code'], error['position'], error['context'])
+
+        except UnicodeDecodeError:
+            raise
         except Exception as e:
-            errors.append({
-                'code': 1,
-                'structure': structure_count,
-                'position': 0,
-                'context': str(e)
-            })
+            add(1, 0, str(e))
 
         return errors
 
-    def validate_geometry(self, geojson_data: Dict) -> Dict[str, Any]:
-        """Validate GeoJSON geometry and return validation results."""
+    def validate_geometry(self, geojson_data: Union[Dict, "FeatureStore"], engine: str = "vectorized",
+                          rules: Optional[List[str]] = None, skip_rules: Optional[List[str]] = None,
+                          progress: Optional[Callable[[int, int], None]] = None, mode: str = "full",
+                          sample_size: int = 1000, seed: int = 0, limit: int = 100,
+                          overlap_min_area: float = 1.0,
+                          feature_results: Optional["FeatureResultStore"] = None,
+                          reuse: bool = True) -> Dict[str, Any]:
+        """Validate GeoJSON geometry and return validation results.
+
+        Every rule registered for VALIDATION_CRITERIA runs on the geometries
+        it is relevant to; rules relevant to a Polygon (say) run on every
+        member of a MultiPolygon or GeometryCollection. ``rules`` and
+        ``skip_rules`` restrict which rules run.
+
+        The "vectorized" engine builds all well-formed geometries with
+        Shapely's array constructors and evaluates rules on the whole batch;
+        anything it cannot represent is checked feature by feature like the
+        "scalar" engine does. Offending features are reported as sorted,
+        deduplicated indices.
+
+        The cross-feature rules, if selected in ``rules``, then compare the
+        checked features with each other; their findings (overlapping pairs with the overlap area in
+        square metres, at least ``overlap_min_area``, and groups of
+        duplicate geometries) are listed under "cross_feature".
+
+        ``mode`` trades completeness for speed:
+
+        - "full" checks every feature.
+        - "fail_fast" stops at the first invalid feature and reports only
+          the issues of the features up to it.
+        - "sample" checks ``sample_size`` features drawn with ``seed`` and
+          adds counts extrapolated to all features as "estimated".
+        - "limit" reports at most ``limit`` features per issue and stops
+          running a rule once it has found that many.
+
+        "mode" in the result says how many features were checked and
+        skipped. ``progress(done, total)`` is called as features are
+        checked, batch by batch (BATCH_FEATURES features at a time).
+
+        ``geojson_data`` may be a FeatureStore, whose arrays the vectorized
+        engine then checks without rebuilding them from the features.
+
+        With ``feature_results`` the vectorized engine takes the issues of
+        geometries checked before by the same rules from that store and
+        stores those of the others; "feature_reuse" in the result counts
+        both; ``reuse=False`` checks every geometry and only stores. Not
+        done in "limit" mode or when a rule has no bulk form.
+        """
+        if engine not in VALIDATION_ENGINES:
+            raise ValueError(f"Unknown validation engine: {engine}")
+        if mode not in VALIDATION_MODES:
+            raise ValueError(f"Unknown validation mode: {mode}")
+        active = self.select_rules(rules, skip_rules)
         results = {
             "valid": True,
             "errors": [],
             "problematic": {},
             "invalid": {},
+            "cross_feature": {},
             "feature_count": 0,
             "geometry_types": {},
-            "skipped_validation": []
+            "skipped_validation": [rule for rule in self.RULES if rule not in {r.name for r in active}]
         }
+        cross_rules = [rule for rule in active if rule.input == 'feature_collection']
+        active = [rule for rule in active if rule.input != 'feature_collection']
+        reuse_salt = None
+        if (feature_results is not None and feature_results.enabled and engine == "vectorized"
+                and mode != "limit" and all(rule.bulk for rule in active)):
+            reuse_salt = json.dumps(["validate", FEATURE_RESULTS_VERSION, sorted(rule.name for rule in active),
+                                     self.MAX_VERTICES]).encode()
+        reused: List[int] = []
+        # Shapely geometries of the checked features, for the cross-feature rules
+        built: List[Tuple[int, Any]] = []
+        summary: Dict[str, Any] = {"mode": mode}
+        selected: List[int] = []
+        # Features up to this index were checked before validation stopped
+        last_checked = -1
+        missing: List[int] = []
+        store = geojson_data if isinstance(geojson_data, FeatureStore) else None
+        if store is not None:
+            geojson_data = store.data
         
         try:
             if geojson_data.get("type") == "FeatureCollection":
                 features = geojson_data.get("features", [])
-                results["feature_count"] = len(features)
-                
-                for i, feature in enumerate(features):
-                    if "geometry" not in feature:
-                        results["invalid"].setdefault("missing_geometry", []).append(i)
-                        results["valid"] = False
-                        continue
-                        
-                    geometry = feature.get("geometry", {})
-                    geom_type = geometry.get("type")
-                    
-                    if geom_type:
-                        results["geometry_types"][geom_type] = results["geometry_types"].get(geom_type, 0) + 1
-                    
-                    try:
-                        if geometry and geometry.get("coordinates"):
-                            # Check for less than three unique nodes in polygons
-                            if geom_type == "Polygon":
-                                coords = geometry["coordinates"][0]  # Exterior ring
-                                unique_coords = {tuple(c) for c in coords}
-                                if len(unique_coords) < 3:
-                                    results["invalid"].setdefault("less_three_unique_nodes", []).append(i)
-                                    results["valid"] = False
-                            
-                            # Create Shapely geometry for additional checks
-                            geom = shape(geometry)
-                            
-                            # Check if geometry is valid
-                            if not geom.is_valid:
-                                results["invalid"].setdefault("invalid_geometry", []).append(i)
-                                results["valid"] = False
-                            
-                            # Check for self-intersections
-                            if geom_type in ["LineString", "Polygon"] and not geom.is_simple:
-                                results["problematic"].setdefault("self_intersection", []).append(i)
-                            
-                            # Check for holes in polygons
-                            if geom_type == "Polygon" and len(geometry["coordinates"]) > 1:
-                                results["problematic"].setdefault("holes", []).append(i)
-                            
-                            # Check coordinate precision and boundaries
-                            self._check_coordinates(geometry["coordinates"], i, results)
-                            
-                    except Exception as e:
-                        results["invalid"].setdefault("geometry_error", []).append(i)
-                        results["errors"].append(f"❌ Feature {i}: {str(e)}")
-                        results["valid"] = False
-            
             elif geojson_data.get("type") == "Feature":
-                results["feature_count"] = 1
-                geometry = geojson_data.get("geometry", {})
-                geom_type = geometry.get("type")
-                
+                features = [geojson_data]
+            else:
+                features = []
+            results["feature_count"] = len(features)
+            record_size("features", len(features))
+
+            selected = list(range(len(features)))
+            if mode == "sample":
+                selected = sorted(random.Random(seed).sample(selected, min(sample_size, len(features))))
+                summary.update(sample_size=len(selected), seed=seed)
+
+            for feature in features:
+                geom_type = (feature.get("geometry") or {}).get("type") if "geometry" in feature else None
                 if geom_type:
-                    results["geometry_types"][geom_type] = 1
-                
-                try:
-                    if geometry and geometry.get("coordinates"):
-                        # Similar checks as above for single feature
-                        if geom_type == "Polygon":
-                            coords = geometry["coordinates"][0]
-                            unique_coords = {tuple(c) for c in coords}
-                            if len(unique_coords) < 3:
-                                results["invalid"].setdefault("less_three_unique_nodes", []).append(0)
-                                results["valid"] = False
-                        
-                        geom = shape(geometry)
-                        if not geom.is_valid:
-                            results["invalid"].setdefault("invalid_geometry", []).append(0)
-                            results["valid"] = False
-                        
-                        self._check_coordinates(geometry["coordinates"], 0, results)
-                        
-                except Exception as e:
-                    results["invalid"].setdefault("geometry_error", []).append(0)
-                    results["errors"].append(f"❌ Error: {str(e)}")
-                    results["valid"] = False
+                    results["geometry_types"][geom_type] = results["geometry_types"].get(geom_type, 0) + 1
+
+            pending = []
+            for i in selected:
+                feature = features[i]
+                if "geometry" not in feature:
+                    missing.append(i)
+                    continue
+                geometry = feature.get("geometry") or {}
+                if geometry.get("coordinates") or geometry.get("geometries"):
+                    pending.append((i, geometry))
+
+            last_checked = selected[-1] if selected else -1
+            if mode == "fail_fast" and missing:
+                # Only the features before the first one without geometry still matter; validation
+                # stops early only for an invalid feature among those
+                last_checked = missing[0]
+                pending = [(i, geometry) for i, geometry in pending if i < last_checked]
+
+            start = 0
+            size = self.FAIL_FAST_BATCH if mode == "fail_fast" else self.BATCH_FEATURES
+            while start < len(pending):
+                chunk = pending[start:start + size]
+                start += len(chunk)
+                size = min(2 * size, self.BATCH_FEATURES)
+                chunk_rules = active
+                if mode == "limit":
+                    chunk_rules = [rule for rule in active
+                                   if len(set(results[rule.category].get(rule.name, ()))) < limit]
+                    if not chunk_rules and not cross_rules:
+                        last_checked = chunk[0][0] - 1
+                        break
+                if engine == "vectorized":
+                    # Rules without a bulk form still run feature by feature
+                    bulk_rules = [rule for rule in chunk_rules if rule.bulk]
+                    scalar_only = [rule for rule in chunk_rules if not rule.bulk]
+                    batch = store.select([i for i, _ in chunk]) if store is not None else GeometryBatch(chunk)
+                    record_size("vertices", len(batch.coords))
+                    if reuse_salt is not None:
+                        if cross_rules:
+                            batch.geometries()
+                        reused.extend(self._validate_batch_reusing(batch, results, bulk_rules,
+                                                                   feature_results, reuse_salt, reuse))
+                    else:
+                        self._validate_batch(batch, results, bulk_rules)
+                    fallback = set(batch.fallback)
+                    for i, geometry in chunk:
+                        if i in fallback:
+                            record_size("vertices", _count_positions(geometry))
+                            self._validate_feature_geometry(i, geometry, results, chunk_rules)
+                        elif scalar_only:
+                            geometry = store.geometry(i) if store is not None else geometry
+                            self._validate_feature_geometry(i, geometry, results, scalar_only)
+                    if cross_rules:
+                        built.extend(zip(batch.feature_index.tolist(), batch.geometries()))
+                        built.extend(_shape_or_none(i, geometry) for i, geometry in chunk if i in fallback)
+                else:
+                    for i, geometry in chunk:
+                        if store is not None:
+                            geometry = store.geometry(i)
+                        record_size("vertices", _count_positions(geometry))
+                        self._validate_feature_geometry(i, geometry, results, chunk_rules)
+                        if cross_rules:
+                            built.append(_shape_or_none(i, geometry))
+                        if mode == "fail_fast" and results["invalid"]:
+                            break
+                if progress:
+                    progress(chunk[-1][0] + 1, len(features))
+                if mode == "fail_fast" and results["invalid"]:
+                    last_checked = min(min(indices) for indices in results["invalid"].values())
+                    break
+
+            if cross_rules:
+                built = sorted((i, geom) for i, geom in built if geom is not None and i <= last_checked)
+                feature_set = FeatureSet([i for i, _ in built], [geom for _, geom in built], overlap_min_area)
+                for rule in cross_rules:
+                    findings = rule.check(feature_set)
+                    if findings:
+                        results["cross_feature"][rule.name] = findings
+                        results[rule.category][rule.name] = [i for finding in findings for i in finding["features"]]
         
         except Exception as e:
             results["valid"] = False
             results["errors"].append(f"❌ Error validating geometry: {str(e)}")
+
+        if missing:
+            results["invalid"] = {"missing_geometry": missing, **results["invalid"]}
+        if progress:
+            progress(results["feature_count"], results["feature_count"])
+        if reuse_salt is not None:
+            reused_count = sum(1 for i in reused if i <= last_checked)
+            checked = sum(1 for i in selected if i <= last_checked)
+            results["feature_reuse"] = {"reused": reused_count, "recomputed": checked - reused_count}
+        for group in (results["invalid"], results["problematic"]):
+            for issue, indices in group.items():
+                group[issue] = sorted(set(i for i in indices if i <= last_checked))
+            for issue in [issue for issue, indices in group.items() if not indices]:
+                del group[issue]
+        if mode == "fail_fast":
+            results["errors"] = [
+                error for error in results["errors"]
+                if not (_FEATURE_ERROR.match(error) and int(_FEATURE_ERROR.match(error).group(1)) > last_checked)
+            ]
+        if mode == "limit":
+            summary["limit"] = limit
+            summary["limited_issues"] = [issue for group in (results["invalid"], results["problematic"])
+                                         for issue, indices in group.items() if len(indices) >= limit]
+            for group in (results["invalid"], results["problematic"]):
+                for issue, indices in group.items():
+                    group[issue] = indices[:limit]
+            for rule_name, findings in results["cross_feature"].items():
+                results["cross_feature"][rule_name] = findings[:limit]
+        if mode == "sample" and selected:
+            # Pairs and groups of features do not scale with the sample, so cross-feature issues are not estimated
+            scale = results["feature_count"] / len(selected)
+            summary["estimated"] = {
+                category: {issue: round(len(indices) * scale) for issue, indices in results[category].items()
+                           if issue not in results["cross_feature"]}
+                for category in ("invalid", "problematic")
+            }
+        if results["invalid"]:
+            results["valid"] = False
+        checked = bisect.bisect_right(selected, last_checked)
+        summary.update(features_checked=checked, features_skipped=results["feature_count"] - checked)
+        if mode == "fail_fast":
+            summary["stopped_early"] = checked < len(selected)
+        results["mode"] = summary
         
         return results
 
-    def _check_coordinates(self, coordinates: Union[List, Tuple], feature_index: int, results: Dict):
-        """Check coordinates for various issues."""
-        def check_coord(coord):
-            # Check coordinate precision
-            if any(len(str(c).split('.')[-1]) > 7 for c in coord[:2]):
-                results["problematic"].setdefault("excessive_coordinate_precision", []).append(feature_index)
-            
-            # Check for 3D coordinates
-            if len(coord) > 2:
-                results["problematic"].setdefault("3d_coordinates", []).append(feature_index)
-            
-            # Check lat/lon boundaries
-            if abs(coord[1]) > 90 or abs(coord[0]) > 180:
-                results["problematic"].setdefault("outside_lat_lon_boundaries", []).append(feature_index)
+    def _validate_feature_geometry(self, i: int, geometry: Dict, results: Dict, rules: List["ValidationRule"]):
+        """Run rules for a single feature.
 
-        if isinstance(coordinates[0], (int, float)):
-            check_coord(coordinates)
-        else:
-            for coord in coordinates:
-                if isinstance(coord[0], (int, float)):
-                    check_coord(coord)
-                else:
-                    self._check_coordinates(coord, feature_index, results)
+        The Shapely geometry is built at most once and only if a relevant
+        rule needs it. If it cannot be built, or a rule fails, the feature
+        is reported under geometry_error and rules needing the failed input
+        are skipped.
+        """
+        members = _geometry_members(geometry)
+        shapely_geom = None
+        failed_inputs = set()
+
+        def shapely_member(path: Tuple[int, ...]):
+            nonlocal shapely_geom
+            if shapely_geom is None:
+                shapely_geom = shapely.geometry.shape(geometry)
+            geom = shapely_geom
+            for k in path:
+                geom = geom.geoms[k]
+            return geom
+
+        for rule in rules:
+            if rule.input in failed_inputs:
+                continue
+            if geometry.get("type") in rule.relevant:
+                targets = [((), geometry)]
+            else:
+                targets = [(path, member) for path, member in members if member.get("type") in rule.relevant]
+            try:
+                for path, member in targets:
+                    value = member if rule.input == 'json_geometry' else shapely_member(path)
+                    if rule.check(value):
+                        results[rule.category].setdefault(rule.name, []).append(i)
+                        break
+            except Exception as e:
+                failed_inputs.add(rule.input)
+                if i not in results["invalid"].get("geometry_error", []):
+                    results["invalid"].setdefault("geometry_error", []).append(i)
+                    results["errors"].append(f"❌ Feature {i}: {str(e)}")
+
+    def _validate_batch(self, batch: GeometryBatch, results: Dict, rules: List["ValidationRule"]):
+        """Evaluate rules on a GeometryBatch as array operations."""
+        if not len(batch):
+            return
+        for rule in rules:
+            relevant = np.isin(batch.types, rule.relevant)
+            per_member = [f"Multi{t}" for t in rule.relevant if f"Multi{t}" not in rule.relevant]
+            relevant |= np.isin(batch.types, per_member)
+            if not relevant.any():
+                continue
+            hits = batch.feature_index[rule.bulk(batch) & relevant]
+            if len(hits):
+                results[rule.category].setdefault(rule.name, []).extend(hits.tolist())
+
+    def _validate_batch_reusing(self, batch: GeometryBatch, results: Dict, rules: List["ValidationRule"],
+                                store: "FeatureResultStore", salt: bytes, reuse: bool = True) -> List[int]:
+        """_validate_batch, taking the issues of geometries checked before from ``store``.
+
+        Issues of the other geometries (all of them without ``reuse``) are
+        stored; returns the feature indices whose issues were reused.
+        """
+        keys = batch.fingerprints(salt)
+        cached = store.get_many(keys) if reuse else {}
+        hits = np.array([key in cached for key in keys], dtype=bool)
+        reused = batch.feature_index[hits].tolist()
+        for key, i in zip(compress(keys, hits), reused):
+            for category, name in cached[key][0]:
+                results[category].setdefault(name, []).append(i)
+        fresh = np.flatnonzero(~hits)
+        checked = batch.take(fresh) if len(reused) else batch
+        found: Dict[str, Dict[str, List[int]]] = {"invalid": {}, "problematic": {}}
+        self._validate_batch(checked, found, rules)
+        issues: Dict[int, List[List[str]]] = {i: [] for i in checked.feature_index.tolist()}
+        for category, group in found.items():
+            for name, indices in group.items():
+                results[category].setdefault(name, []).extend(indices)
+                for i in indices:
+                    issues[i].append([category, name])
+        store.put_many([(keys[row], issues[i], None)
+                        for row, i in zip(fresh.tolist(), checked.feature_index.tolist())])
+        return reused
+
+class ValidationRule:
+    """A registered geometry check; see UnifiedValidator.rule."""
+
+    def __init__(self, name: str, category: str, criteria: Dict, check, bulk=None):
+        self.name = name
+        self.category = category
+        self.relevant = criteria['relevant']
+        self.input = criteria['input']
+        self.default = criteria.get('default', True)
+        self.check = check
+        self.bulk = bulk
+
+def _geometry_members(geometry: Dict, path: Tuple[int, ...] = ()) -> List[Tuple[Tuple[int, ...], Dict]]:
+    """Single-part members of a geometry as (path into .geoms, GeoJSON geometry) pairs."""
+    geom_type = geometry.get("type")
+    if geom_type == "GeometryCollection":
+        members = []
+        for k, member in enumerate(geometry.get("geometries") or []):
+            members.extend(_geometry_members(member or {}, path + (k,)))
+        return members
+    if geom_type in ("MultiPoint", "MultiLineString", "MultiPolygon"):
+        parts = geometry.get("coordinates") or []
+        decimals = source_decimals(geometry)
+        if decimals is None:
+            return [(path + (k,), {"type": geom_type[5:], "coordinates": part}) for k, part in enumerate(parts)]
+        members = []
+        start = 0
+        for k, part in enumerate(parts):
+            member = DecimalGeometry(type=geom_type[5:], coordinates=part)
+            count = _count_numbers(part)
+            if count < 0:
+                # A boolean has no lexeme, so the counts of this and later parts cannot be placed
+                start = len(decimals) + 1
+            elif start + count <= len(decimals):
+                member.decimals = decimals[start:start + count]
+            start += max(count, 0)
+            members.append((path + (k,), member))
+        return members
+    return [(path, geometry)]
+
+def _rings_of(geometry: Dict) -> List[list]:
+    """Position lists of a single LineString (one) or Polygon (one per ring)."""
+    coordinates = geometry["coordinates"]
+    return coordinates if geometry.get("type") == "Polygon" else [coordinates]
+
+def _positions_of(geometry: Dict) -> List[list]:
+    """All positions of a single Point, LineString or Polygon."""
+    if geometry.get("type") == "Point":
+        return [geometry["coordinates"]]
+    return [position for ring in _rings_of(geometry) for position in ring]
+
+def _shape_or_none(i: int, geometry: Dict) -> Tuple[int, Any]:
+    """(i, Shapely geometry), or (i, None) if it cannot be built; the per-feature rules report why."""
+    try:
+        return i, shapely.geometry.shape(geometry)
+    except Exception:
+        return i, None
+
+class FeatureSet:
+    """Shapely geometries of the checked features, for the cross-feature rules."""
+
+    def __init__(self, feature_index: List[int], geometries: List[Any], min_overlap_area: float):
+        self.feature_index = np.array(feature_index, dtype=np.int64)
+        self.geometries = np.empty(len(geometries), dtype=object)
+        self.geometries[:] = geometries
+        self.min_overlap_area = min_overlap_area
+
+    def __len__(self) -> int:
+        return len(self.feature_index)
+
+# Bulk forms share these helpers: flags over rings/positions reduced to geometries
+
+def _segments_within_rings(batch: GeometryBatch) -> np.ndarray:
+    """Mask over positions k that have a following position k+1 in the same ring."""
+    same_ring = np.ones(max(len(batch.coords) - 1, 0), dtype=bool)
+    same_ring[batch.ring_offsets[1:-1] - 1] = False
+    return same_ring
+
+def _bulk_invalid_geometry(batch: GeometryBatch) -> np.ndarray:
+    return ~shapely.is_valid(batch.geometries())
+
+def _bulk_unclosed(batch: GeometryBatch) -> np.ndarray:
+    first = batch.coords[batch.ring_offsets[:-1]]
+    last = batch.coords[batch.ring_offsets[1:] - 1]
+    open_ring = ~((first == last) | (np.isnan(first) & np.isnan(last))).all(axis=1)
+    return batch.any_by_geometry(open_ring, batch.ring_geometry)
+
+def _bulk_less_three_unique_nodes(batch: GeometryBatch) -> np.ndarray:
+    shells = batch.ring_is_first & (batch.base_types == "Polygon")[batch.ring_geometry]
+    if not shells.any():
+        return np.zeros(len(batch), dtype=bool)
+    position_mask = np.repeat(shells, batch.ring_lengths)
+    owner = batch.position_ring[position_mask]
+    # Adding 0.0 turns -0.0 into 0.0 so both count as the same node, as in a Python set;
+    # rows are compared by their bytes so NaN padding of 2D positions compares equal
+    nodes = np.ascontiguousarray(np.column_stack([owner, batch.coords[position_mask] + 0.0]))
+    rows = nodes.view(np.dtype((np.void, nodes.dtype.itemsize * nodes.shape[1]))).ravel()
+    _, first = np.unique(rows, return_index=True)
+    counts = np.bincount(owner[first], minlength=len(batch.ring_lengths))
+    return batch.any_by_geometry(shells & (counts < 3), batch.ring_geometry)
+
+def _ring_orientation(batch: GeometryBatch) -> Tuple[np.ndarray, np.ndarray]:
+    """Polygon ring ids and whether each is counter-clockwise."""
+    ring_ids = np.flatnonzero((batch.base_types == "Polygon")[batch.ring_geometry])
+    return ring_ids, shapely.is_ccw(batch.linearrings()[ring_ids])
+
+def _bulk_exterior_not_ccw(batch: GeometryBatch) -> np.ndarray:
+    ring_ids, ccw = _ring_orientation(batch)
+    bad = np.zeros(len(batch.ring_lengths), dtype=bool)
+    bad[ring_ids[~ccw]] = True
+    return batch.any_by_geometry(bad & batch.ring_is_first, batch.ring_geometry)
+
+def _bulk_interior_not_cw(batch: GeometryBatch) -> np.ndarray:
+    ring_ids, ccw = _ring_orientation(batch)
+    bad = np.zeros(len(batch.ring_lengths), dtype=bool)
+    bad[ring_ids[ccw]] = True
+    return batch.any_by_geometry(bad & ~batch.ring_is_first, batch.ring_geometry)
+
+def _bulk_inner_and_exterior_ring_intersect(batch: GeometryBatch) -> np.ndarray:
+    holes = np.flatnonzero(~batch.ring_is_first & (batch.base_types == "Polygon")[batch.ring_geometry])
+    if not len(holes):
+        return np.zeros(len(batch), dtype=bool)
+    rings = batch.linearrings()
+    shells = batch.part_offsets[batch.ring_part[holes]]
+    bad = np.zeros(len(batch.ring_lengths), dtype=bool)
+    bad[holes[shapely.intersects(rings[holes], rings[shells])]] = True
+    return batch.any_by_geometry(bad, batch.ring_geometry)
+
+def _bulk_holes(batch: GeometryBatch) -> np.ndarray:
+    polygon_parts = (batch.base_types == "Polygon")[batch.part_geometry]
+    return batch.any_by_geometry(polygon_parts & (np.diff(batch.part_offsets) > 1), batch.part_geometry)
+
+def _bulk_self_intersection(batch: GeometryBatch) -> np.ndarray:
+    parts = batch.part_geometries()
+    line_or_polygon = np.isin(batch.base_types, ["LineString", "Polygon"])[batch.part_geometry]
+    simple = np.ones(len(parts), dtype=bool)
+    simple[line_or_polygon] = shapely.is_simple(parts[line_or_polygon])
+    return batch.any_by_geometry(~simple, batch.part_geometry)
+
+def _bulk_duplicate_nodes(batch: GeometryBatch) -> np.ndarray:
+    coords = batch.coords
+    same = ((coords[:-1] == coords[1:]) | (np.isnan(coords[:-1]) & np.isnan(coords[1:]))).all(axis=1)
+    return batch.any_by_geometry(same & _segments_within_rings(batch), batch.position_geometry[:-1])
+
+def _bulk_excessive_coordinate_precision(batch: GeometryBatch) -> np.ndarray:
+    xy = batch.coords[:, :2]
+    abs_xy = np.abs(xy)
+    with np.errstate(invalid="ignore", over="ignore"):
+        excessive = np.rint(abs_xy * 1e7) / 1e7 != abs_xy
+    # repr() switches to exponent notation outside this range, so count those values from the text
+    special = ((abs_xy < 1e-4) & (abs_xy != 0)) | (abs_xy >= 1e16) | ~np.isfinite(abs_xy)
+    for row, col in zip(*np.nonzero(special)):
+        excessive[row, col] = count_decimal_places(xy[row, col]) > 7
+    if batch.decimals is not None:
+        written = batch.decimals[:, :2]
+        excessive = np.where(written >= 0, written > 7, excessive)
+    return batch.any_by_geometry(excessive.any(axis=1), batch.position_geometry)
+
+def _bulk_excessive_vertices(batch: GeometryBatch) -> np.ndarray:
+    part_positions = np.add.reduceat(batch.ring_lengths, batch.part_offsets[:-1]) if len(batch.ring_lengths) else np.zeros(0, int)
+    return batch.any_by_geometry(part_positions > UnifiedValidator.MAX_VERTICES, batch.part_geometry)
+
+def _bulk_3d_coordinates(batch: GeometryBatch) -> np.ndarray:
+    return batch.any_by_geometry(batch.position_dims > 2, batch.position_geometry)
+
+def _bulk_outside_lat_lon_boundaries(batch: GeometryBatch) -> np.ndarray:
+    abs_xy = np.abs(batch.coords[:, :2])
+    return batch.any_by_geometry((abs_xy[:, 1] > 90) | (abs_xy[:, 0] > 180), batch.position_geometry)
+
+def _bulk_crosses_antimeridian(batch: GeometryBatch) -> np.ndarray:
+    jumps = np.abs(np.diff(batch.coords[:, 0])) > 180
+    return batch.any_by_geometry(jumps & _segments_within_rings(batch), batch.position_geometry[:-1])
+
+@UnifiedValidator.rule('invalid_geometry', bulk=_bulk_invalid_geometry)
+def _rule_invalid_geometry(geom) -> bool:
+    return not geom.is_valid
+
+@UnifiedValidator.rule('unclosed', bulk=_bulk_unclosed)
+def _rule_unclosed(geometry: Dict) -> bool:
+    return any(ring[0] != ring[-1] for ring in geometry["coordinates"])
+
+@UnifiedValidator.rule('less_three_unique_nodes', bulk=_bulk_less_three_unique_nodes)
+def _rule_less_three_unique_nodes(geometry: Dict) -> bool:
+    return len({tuple(c) for c in geometry["coordinates"][0]}) < 3
+
+@UnifiedValidator.rule('exterior_not_ccw', bulk=_bulk_exterior_not_ccw)
+def _rule_exterior_not_ccw(geom) -> bool:
+    return not geom.exterior.is_ccw
+
+@UnifiedValidator.rule('interior_not_cw', bulk=_bulk_interior_not_cw)
+def _rule_interior_not_cw(geom) -> bool:
+    return any(ring.is_ccw for ring in geom.interiors)
+
+@UnifiedValidator.rule('inner_and_exterior_ring_intersect', bulk=_bulk_inner_and_exterior_ring_intersect)
+def _rule_inner_and_exterior_ring_intersect(geom) -> bool:
+    return any(ring.intersects(geom.exterior) for ring in geom.interiors)
+
+@UnifiedValidator.rule('holes', bulk=_bulk_holes)
+def _rule_holes(geom) -> bool:
+    return len(geom.interiors) > 0
+
+@UnifiedValidator.rule('self_intersection', bulk=_bulk_self_intersection)
+def _rule_self_intersection(geom) -> bool:
+    return not geom.is_simple
+
+@UnifiedValidator.rule('duplicate_nodes', bulk=_bulk_duplicate_nodes)
+def _rule_duplicate_nodes(geometry: Dict) -> bool:
+    return any(a == b for ring in _rings_of(geometry) for a, b in zip(ring, ring[1:]))
+
+@UnifiedValidator.rule('excessive_coordinate_precision', bulk=_bulk_excessive_coordinate_precision)
+def _rule_excessive_coordinate_precision(geometry: Dict) -> bool:
+    positions = _positions_of(geometry)
+    decimals = source_decimals(geometry)
+    if decimals is not None and len(decimals) == sum(map(len, positions)):
+        decimals = decimals.tolist()
+        start = 0
+        for coord in positions:
+            if any(places > 7 for places in decimals[start:start + 2]):
+                return True
+            start += len(coord)
+        return False
+    return any(count_decimal_places(c) > 7 for coord in positions for c in coord[:2] if isinstance(c, (int, float)))
+
+@UnifiedValidator.rule('excessive_vertices', bulk=_bulk_excessive_vertices)
+def _rule_excessive_vertices(geometry: Dict) -> bool:
+    return len(_positions_of(geometry)) > UnifiedValidator.MAX_VERTICES
+
+@UnifiedValidator.rule('3d_coordinates', bulk=_bulk_3d_coordinates)
+def _rule_3d_coordinates(geometry: Dict) -> bool:
+    return any(len(coord) > 2 for coord in _positions_of(geometry))
+
+@UnifiedValidator.rule('outside_lat_lon_boundaries', bulk=_bulk_outside_lat_lon_boundaries)
+def _rule_outside_lat_lon_boundaries(geometry: Dict) -> bool:
+    return any(abs(coord[1]) > 90 or abs(coord[0]) > 180 for coord in _positions_of(geometry))
+
+@UnifiedValidator.rule('crosses_antimeridian', bulk=_bulk_crosses_antimeridian)
+def _rule_crosses_antimeridian(geometry: Dict) -> bool:
+    return any(abs(b[0] - a[0]) > 180 for ring in _rings_of(geometry) for a, b in zip(ring, ring[1:]))
+
+@UnifiedValidator.rule('overlapping_features')
+def _rule_overlapping_features(features: FeatureSet) -> List[Dict]:
+    """Pairs of (Multi)Polygons sharing at least ``min_overlap_area`` square metres.
+
+    Candidate pairs come from one bulk STRtree query; pairs that only touch
+    are dropped before intersecting, all pairs are intersected in one call,
+    and the overlap areas are geodesic (see _geodesic_areas). Invalid
+    polygons are left out: invalid_geometry reports them, and their
+    overlaps are not well defined.
+    """
+    geoms = features.geometries
+    polygonal = np.isin(shapely.get_type_id(geoms), (3, 6)) & ~shapely.is_empty(geoms)
+    polygonal[polygonal] = shapely.is_valid(geoms[polygonal])
+    polygonal = np.flatnonzero(polygonal)
+    if len(polygonal) < 2:
+        return []
+    polygons = geoms[polygonal]
+    left, right = shapely.STRtree(polygons).query(polygons, predicate="intersects")
+    pairs = left < right
+    left, right = left[pairs], right[pairs]
+    # Interiors intersect: the pair shares more than a boundary
+    inner = shapely.relate_pattern(polygons[left], polygons[right], "T********")
+    left, right = left[inner], right[inner]
+    areas = _geodesic_areas(shapely.intersection(polygons[left], polygons[right]))
+    found = (areas > 0) & (areas >= features.min_overlap_area)
+    pairs = np.sort(features.feature_index[polygonal[np.column_stack([left[found], right[found]])]], axis=1)
+    findings = [{"features": pair, "area": round(area, 2)} for pair, area in zip(pairs.tolist(), areas[found].tolist())]
+    return sorted(findings, key=lambda finding: finding["features"])
+
+@UnifiedValidator.rule('duplicate_geometry')
+def _rule_duplicate_geometry(features: FeatureSet) -> List[Dict]:
+    """Groups of features with the same geometry, up to ring order, orientation and start vertex.
+
+    Geometries are normalized and hashed as WKB after rounding the
+    coordinates to DUPLICATE_DECIMALS, so near-duplicates group too;
+    "exact" says whether the members also match before rounding. Z values
+    are ignored.
+    """
+    geoms = features.geometries
+    present = np.flatnonzero(~shapely.is_empty(geoms))
+    decimals = UnifiedValidator.DUPLICATE_DECIMALS
+    rounded = shapely.transform(geoms[present], lambda coords: np.round(coords, decimals))
+    keys = shapely.to_wkb(shapely.normalize(rounded), output_dimension=2)
+    groups: Dict[bytes, List[int]] = {}
+    for k, key in enumerate(keys):
+        groups.setdefault(key, []).append(k)
+    findings = []
+    for members in groups.values():
+        if len(members) > 1:
+            exact = shapely.to_wkb(shapely.normalize(geoms[present[members]]), output_dimension=2)
+            findings.append({"features": sorted(features.feature_index[present[members]].tolist()),
+                             "exact": len(set(exact)) == 1})
+    return sorted(findings, key=lambda finding: finding["features"])
 
 validator = UnifiedValidator()
 
+# JSON uploads at least this large are memory-mapped for validation instead of read and decoded
+MMAP_THRESHOLD_BYTES = int(os.environ.get("GEOJSON_MMAP_THRESHOLD_BYTES", 64 * 1024 * 1024))
+
+def map_file(source) -> mmap.mmap:
+    """Memory-map a file object read-only, spooling it to a temporary file first if it has no descriptor."""
+    try:
+        return mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, io.UnsupportedOperation):
+        with tempfile.TemporaryFile() as spool:
+            source.seek(0)
+            shutil.copyfileobj(source, spool)
+            spool.flush()
+            return mmap.mmap(spool.fileno(), 0, access=mmap.ACCESS_READ)
+
 @router.post("/validate")
-async def validate_file(file: UploadFile = File(...)):
-    """Endpoint to validate JSON/GeoJSON files."""
+async def validate_file(
+    file: UploadFile = File(...),
+    no_cache: bool = Form(False),
+    engine: str = Form("vectorized"),
+    rules: Optional[str] = Form(None),
+    skip_rules: Optional[str] = Form(None),
+    input_format: str = Form("auto"),
+    mode: str = Form("full"),
+    sample_size: int = Form(1000),
+    seed: int = Form(0),
+    limit: int = Form(100),
+    overlap_min_area: float = Form(1.0)
+):
+    """Endpoint to validate JSON/GeoJSON files.
+
+    ``rules`` and ``skip_rules`` are comma-separated rule names that limit
+    which geometry checks run. Results are cached by content; ``no_cache``
+    skips the lookup and refreshes the cached entry. GeoJSON text sequences
+    and NDJSON (``input_format``, as for /process) are validated record by
+    record with errors reported by line.
+
+    ``mode`` is "full", "fail_fast", "sample" (``sample_size`` features
+    drawn with ``seed``) or "limit" (``limit`` features per issue); see
+    UnifiedValidator.validate_geometry. "validation_mode" in the response
+    says how much was checked. Features overlapping by at least
+    ``overlap_min_area`` square metres are listed in "cross_feature".
+    """
+    if engine not in VALIDATION_ENGINES:
+        raise HTTPException(status_code=400, detail=f"Unknown validation engine: {engine}")
+    if input_format not in INPUT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown input format: {input_format}")
+    check_validation_mode(mode, sample_size, limit)
+    mode_options = {"mode": mode, "sample_size": sample_size, "seed": seed, "limit": limit,
+                    "overlap_min_area": overlap_min_area}
+    rules = parse_rule_names(rules)
+    skip_rules = parse_rule_names(skip_rules)
     try:
-        content = await file.read()
-        content_str = content.decode()
-        
-        # Validate JSON structure
-        structure_errors = validator.validate_json_structure(content_str)
-        
-        if structure_errors:
-            error_messages = []
-            for error in structure_errors:
-                error_msg = validator.format_error_message(
-                    error['code'],
-                    error['position'],
-                    content_str,
-                    error.get('context', '')
-                )
-                error_messages.append(f"Error [Code {error['code']}]:\n{error_msg}")
-            
-            return JSONResponse({
-                "structure_valid": False,
-                "structure_errors": "\n\n".join(error_messages),
-                "is_geojson": False
-            })
-        
-        # Parse JSON and check if it's GeoJSON
-        data = json.loads(content_str)
-        is_geojson = isinstance(data, dict) and data.get("type") in ["Feature", "FeatureCollection"]
-        
-        if is_geojson:
-            # Validate geometry
-            geometry_validation = validator.validate_geometry(data)
-            
-            # Format geometry validation results
-            geometry_details = []
-            
-            if geometry_validation["invalid"]:
-                geometry_details.append("\n🔴 Invalid Geometry Issues:")
-                for issue, features in geometry_validation["invalid"].items():
-                    issue_name = ' '.join(word.capitalize() for word in issue.split('_'))
-                    geometry_details.append(f"  • {issue_name} in feature(s): {', '.join(map(str, features))}")
-            
-            if geometry_validation["problematic"]:
-                geometry_details.append("\n🟡 Problematic Geometry Issues:")
-                for issue, features in geometry_validation["problematic"].items():
-                    issue_name = ' '.join(word.capitalize() for word in issue.split('_'))
-                    geometry_details.append(f"  • {issue_name} in feature(s): {', '.join(map(str, features))}")
-            
-            if geometry_validation["errors"]:
-                geometry_details.extend(geometry_validation["errors"])
-            
-            # Add feature summary
-            geometry_details.append(f"\n📊 Feature Summary:")
-            geometry_details.append(f"  • Total Features: {geometry_validation['feature_count']}")
-            for geom_type, count in geometry_validation["geometry_types"].items():
-                geometry_details.append(f"  • {geom_type}: {count} feature(s)")
-            
-            # Add final validation result
-            if not geometry_validation["valid"]:
-                geometry_details.append("\n❌ Final Result: Some geometries need fixing.")
-            else:
-                geometry_details.append("\n✅ Final Result: All geometries are valid.")
-            
-            return JSONResponse({
-                "structure_valid": True,
-                "is_geojson": True,
-                "geometry_valid": geometry_validation["valid"],
-                "feature_count": geometry_validation["feature_count"],
-                "geometry_types": geometry_validation["geometry_types"],
-                "invalid": geometry_validation["invalid"],
-                "problematic": geometry_validation["problematic"],
-                "errors": geometry_validation["errors"]
-            })
-        else:
-            return JSONResponse({
-                "structure_valid": True,
-                "is_geojson": False,
-                "message": "This is a valid JSON file but not a GeoJSON file"
-            })
-            
+        validator.select_rules(rules, skip_rules)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        with timed_stage("read"):
+            # Large JSON uploads are mapped from the spooled upload instead of read into memory
+            source = file.file
+            source.seek(0, os.SEEK_END)
+            size = source.tell()
+            source.seek(0)
+            input_format = detect_input_format(input_format, file.filename, source.read(64))
+            source.seek(0)
+            mapped = size >= MMAP_THRESHOLD_BYTES and input_format == "json"
+            content = map_file(source) if mapped else await file.read()
+        record_size("bytes", size)
+        try:
+            cache_key = result_cache.make_key(content, endpoint="validate", engine=engine, rules=rules,
+                                              skip_rules=skip_rules, json_backend=json_codec.name,
+                                              input_format=input_format, **mode_options)
+            with timed_stage("cache"):
+                result = None if no_cache else cached_result(cache_key)
+            if result is None:
+                result = validate_content(content, engine, rules, skip_rules, input_format=input_format,
+                                          **mode_options, reuse=not no_cache)
+                with timed_stage("cache"):
+                    result_cache.set(cache_key, result)
+        finally:
+            if mapped:
+                content.close()
+        return JSONResponse(result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def check_validation_mode(mode: str, sample_size: int, limit: int):
+    """Reject unknown validation modes and non-positive sizes with a 400."""
+    if mode not in VALIDATION_MODES:
+        raise HTTPException(status_code=400, detail=f"Unknown validation mode: {mode}")
+    if sample_size < 1 or limit < 1:
+        raise HTTPException(status_code=400, detail="sample_size and limit must be at least 1")
+
+def parse_rule_names(value: Optional[str]) -> Optional[List[str]]:
+    """Split a comma-separated form field into rule names (None if not given)."""
+    if value is None or not value.strip():
+        return None
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+def structure_error_limit(mode: str, limit: int) -> int:
+    """Structure errors to report in a validation mode."""
+    if mode == "fail_fast":
+        return 1
+    if mode == "limit":
+        return limit
+    return UnifiedValidator.MAX_STRUCTURE_ERRORS
+
+def validate_content(content: Union[bytes, mmap.mmap], engine: str = "vectorized",
+                     rules: Optional[List[str]] = None, skip_rules: Optional[List[str]] = None,
+                     progress: Optional[Callable[[int, int], None]] = None,
+                     input_format: str = "json", mode: str = "full", sample_size: int = 1000,
+                     seed: int = 0, limit: int = 100, overlap_min_area: float = 1.0,
+                     reuse: bool = True) -> Dict[str, Any]:
+    """Validate an uploaded JSON/GeoJSON document and build the /validate response.
+
+    ``progress``, the ``mode`` options, ``overlap_min_area`` and ``reuse``
+    (of feature_results) are passed on to UnifiedValidator.validate_geometry;
+    "fail_fast" and "limit" also cut
+    the structure errors short (see structure_error_limit). The document
+    is parsed once for both checks (see check_structure), and a
+    memory-mapped ``content`` gets the same report.
+    """
+    mode_options = {"mode": mode, "sample_size": sample_size, "seed": seed, "limit": limit,
+                    "overlap_min_area": overlap_min_area}
+    if input_format in SEQUENCE_FORMATS:
+        return validate_sequence_content(bytes(content), input_format, engine, rules, skip_rules, progress,
+                                         **mode_options)
+    max_errors = structure_error_limit(mode, limit)
+    # Validate JSON structure, which also parses the document
+    structure_errors, data = check_structure(content, max_errors)
+
+    if structure_errors:
+        error_messages = []
+        line_index = ByteLineIndex(content)
+        for error in structure_errors:
+            error_msg = validator.format_error_message(
+                error['code'],
+                error['position'],
+                content,
+                error.get('context', ''),
+                line_index
+            )
+            error_messages.append(f"Error [Code {error['code']}]:\n{error_msg}")
+
+        return {
+            "structure_valid": False,
+            "structure_errors": "\n\n".join(error_messages),
+            "is_geojson": False,
+            "validation_mode": {"mode": mode, "structure_errors_limited": len(structure_errors) >= max_errors}
+        }
+
+    # Check if it's GeoJSON
+    return validate_parsed(data, engine, rules, skip_rules, progress, reuse=reuse, **mode_options)
+
+def validate_parsed(data: Any, engine: str = "vectorized", rules: Optional[List[str]] = None,
+                    skip_rules: Optional[List[str]] = None, progress: Optional[Callable[[int, int], None]] = None,
+                    mode: str = "full", sample_size: int = 1000, seed: int = 0, limit: int = 100,
+                    overlap_min_area: float = 1.0, reuse: bool = True) -> Dict[str, Any]:
+    """The /validate response for a parsed document (or FeatureStore) whose structure is valid."""
+    mode_options = {"mode": mode, "sample_size": sample_size, "seed": seed, "limit": limit,
+                    "overlap_min_area": overlap_min_area}
+    is_geojson = isinstance(data, FeatureStore) or (
+        isinstance(data, dict) and data.get("type") in ["Feature", "FeatureCollection"])
+
+    if is_geojson:
+        # Validate geometry
+        with timed_stage("geometry"):
+            geometry_validation = validator.validate_geometry(data, engine, rules, skip_rules, progress,
+                                                              **mode_options, feature_results=feature_results,
+                                                              reuse=reuse)
+
+        # Format geometry validation results
+        geometry_details = []
+
+        if geometry_validation["invalid"]:
+            geometry_details.append("\n🔴 Invalid Geometry Issues:")
+            for issue, features in geometry_validation["invalid"].items():
+                issue_name = ' '.join(word.capitalize() for word in issue.split('_'))
+                geometry_details.append(f"  • {issue_name} in feature(s): {', '.join(map(str, features))}")
+
+        if geometry_validation["problematic"]:
+            geometry_details.append("\n🟡 Problematic Geometry Issues:")
+            for issue, features in geometry_validation["problematic"].items():
+                issue_name = ' '.join(word.capitalize() for word in issue.split('_'))
+                geometry_details.append(f"  • {issue_name} in feature(s): {', '.join(map(str, features))}")
+
+        if geometry_validation["errors"]:
+            geometry_details.extend(geometry_validation["errors"])
+
+        # Add feature summary
+        geometry_details.append(f"\n📊 Feature Summary:")
+        geometry_details.append(f"  • Total Features: {geometry_validation['feature_count']}")
+        for geom_type, count in geometry_validation["geometry_types"].items():
+            geometry_details.append(f"  • {geom_type}: {count} feature(s)")
+
+        # Add final validation result
+        if not geometry_validation["valid"]:
+            geometry_details.append("\n❌ Final Result: Some geometries need fixing.")
+        else:
+            geometry_details.append("\n✅ Final Result: All geometries are valid.")
+
+        return {
+            "structure_valid": True,
+            "is_geojson": True,
+            "geometry_valid": geometry_validation["valid"],
+            "feature_count": geometry_validation["feature_count"],
+            "geometry_types": geometry_validation["geometry_types"],
+            "invalid": geometry_validation["invalid"],
+            "problematic": geometry_validation["problematic"],
+            "cross_feature": geometry_validation["cross_feature"],
+            "errors": geometry_validation["errors"],
+            "skipped_validation": geometry_validation["skipped_validation"],
+            "validation_mode": geometry_validation["mode"],
+            "feature_reuse": feature_results.count(**geometry_validation.get(
+                "feature_reuse", {"reused": 0, "recomputed": geometry_validation["mode"]["features_checked"]}
+            ))
+        }
+    else:
+        return {
+            "structure_valid": True,
+            "is_geojson": False,
+            "message": "This is a valid JSON file but not a GeoJSON file",
+            "validation_mode": {"mode": mode}
+        }
+
+def check_structure(buffer: Union[bytes, mmap.mmap], max_errors: Optional[int] = None) -> Tuple[List[Dict], Any]:
+    """Structure errors of a document, and the parsed document (see load_features) if there are none.
+
+    The document is parsed once, for the geometry checks too, straight
+    from ``buffer`` (which may be memory-mapped). A parse only counts if
+    it kept every name/value pair, which _count_members counts in the
+    bytes, so duplicate keys are still found. Otherwise
+    validate_json_structure scans the bytes, giving the errors it gives
+    for the decoded text; nothing decodes the whole document.
+    """
+    data = failure = None
+    with timed_stage("parse"):
+        try:
+            data = load_features(buffer)
+        except ValueError as e:
+            failure = e
+    with timed_stage("structure"):
+        # Codecs skip a byte order mark, which json.loads rejects in text
+        if data is not None and buffer[:3] != codecs.BOM_UTF8 and \
+                _count_members(buffer) == _count_parsed_members(data):
+            return [], data
+        errors = validator.validate_json_structure(buffer, max_errors)
+    if not errors and failure is not None:
+        # Valid JSON the codec does not take
+        raise failure
+    return errors, data
+
+_FEATURE_ERROR = re.compile(r"^❌ Feature (\d+):")
+
+def validate_sequence_content(content: bytes, fmt: str, engine: str = "vectorized",
+                              rules: Optional[List[str]] = None, skip_rules: Optional[List[str]] = None,
+                              progress: Optional[Callable[[int, int], None]] = None, mode: str = "full",
+                              sample_size: int = 1000, seed: int = 0, limit: int = 100,
+                              overlap_min_area: float = 1.0) -> Dict[str, Any]:
+    """Validate a GeoJSON text sequence or NDJSON document record by record.
+
+    Records that are not valid JSON get their structure errors in
+    "line_errors", with line and column in the whole document; records that
+    are not a Feature or geometry get one error there too. The geometry of
+    the remaining records is validated together and issues are reported by
+    line number instead of feature index.
+
+    In "fail_fast" mode reading stops at the first broken record and only
+    the records before it are validated; in "limit" mode at most ``limit``
+    line errors are reported.
+    """
+    max_errors = structure_error_limit(mode, limit)
+    line_errors: List[Dict] = []
+    features: List[Dict] = []
+    lines: List[int] = []
+    stopped = False
+    for line, raw in split_sequence(content, fmt):
+        if mode == "fail_fast" and line_errors:
+            stopped = True
+            break
+        remaining = max_errors - len(line_errors)
+        try:
+            with timed_stage("parse"):
+                item = json_codec.loads(raw)
+        except Exception:
+            if remaining > 0:
+                line_errors.extend(_record_structure_errors(line, raw, remaining))
+            continue
+        kind = item.get("type") if isinstance(item, dict) else None
+        if kind == "Feature":
+            features.append(item)
+        elif kind in GEOJSON_GEOMETRY_TYPES:
+            features.append({"type": "Feature", "properties": None, "geometry": item})
+        else:
+            if remaining > 0:
+                line_errors.append({"line": line, "column": 1, "code": None,
+                                    "message": "Expected a GeoJSON Feature or geometry"})
+            continue
+        lines.append(line)
+    limited = len(line_errors) >= max_errors
+
+    with timed_stage("geometry"):
+        geometry_validation = validator.validate_geometry(
+            {"type": "FeatureCollection", "features": features}, engine, rules, skip_rules, progress,
+            mode, sample_size, seed, limit, overlap_min_area
+        )
+    summary = geometry_validation["mode"]
+    summary["line_errors_limited"] = limited
+    if mode == "fail_fast":
+        summary["stopped_early"] = summary["stopped_early"] or stopped
+    for category in ("invalid", "problematic"):
+        for issue, indexes in geometry_validation[category].items():
+            geometry_validation[category][issue] = [lines[index] for index in indexes]
+    for findings in geometry_validation["cross_feature"].values():
+        for finding in findings:
+            finding["features"] = [lines[index] for index in finding["features"]]
+    errors = [
+        _FEATURE_ERROR.sub(lambda match: f"❌ Line {lines[int(match.group(1))]}:", error)
+        for error in geometry_validation["errors"]
+    ]
+    result = {
+        "format": fmt,
+        "structure_valid": not line_errors,
+        "is_geojson": bool(features),
+        "line_errors": line_errors,
+        "geometry_valid": geometry_validation["valid"],
+        "feature_count": geometry_validation["feature_count"],
+        "geometry_types": geometry_validation["geometry_types"],
+        "invalid": geometry_validation["invalid"],
+        "problematic": geometry_validation["problematic"],
+        "cross_feature": geometry_validation["cross_feature"],
+        "errors": errors,
+        "skipped_validation": geometry_validation["skipped_validation"],
+        "validation_mode": summary
+    }
+    if line_errors:
+        result["structure_errors"] = "\n".join(
+            f"Line {error['line']}, column {error['column']}: {error['message']}" for error in line_errors
+        )
+    return result
+
+def _record_structure_errors(line: int, raw: bytes, max_errors: Optional[int] = None) -> List[Dict]:
+    """Structure errors of one sequence record, positioned in the whole document."""
+    try:
+        text = raw.decode()
+    except UnicodeDecodeError as e:
+        return [{"line": line, "column": 1, "code": None, "message": f"Invalid UTF-8: {e}"}]
+    with timed_stage("structure"):
+        structure_errors = validator.validate_json_structure(text, max_errors)
+    line_index = LineIndex(text)
+    results = []
+    for error in structure_errors:
+        record_line, column = line_index.line_col(min(max(error["position"], 0), len(text)))
+        message = validator.ERROR_DESCRIPTIONS.get(error["code"], "Unknown error")
+        if error.get("context"):
+            message += f" ({error['context']})"
+        results.append({"line": line + record_line - 1, "column": column, "code": error["code"], "message": message})
+    return results or [{"line": line, "column": 1, "code": None, "message": "Invalid JSON"}]
+
 def count_decimal_places(num):
     """Count the number of decimal places in a number."""
-    str_num = str(abs(float(num)))
-    if '.' in str_num:
-        decimals = len(str_num.split('.')[1])
-        # Remove trailing zeros
-        str_decimals = str_num.split('.')[1].rstrip('0')
-        return len(str_decimals) if str_decimals else 0
-    return 0
-
-def fix_coordinates(coordinates, min_decimals):
-    """Fix coordinates to have exactly the specified number of decimal places."""
+    return decimal_places(repr(abs(float(num))))
+
+def fix_coordinates(coordinates, min_decimals, decimals: Optional[Iterator[int]] = None):
+    """Fix coordinates to have exactly the specified number of decimal places.
+
+    Numbers with fewer than ``min_decimals`` decimals are padded with zeros
+    and a final 1; the rest are rounded to ``min_decimals``. ``decimals``
+    optionally yields the decimal places of each number as written (see
+    source_decimals), in order; otherwise they are counted from repr().
+    """
     if isinstance(coordinates, (int, float)):
-        str_num = str(abs(float(coordinates)))
-        parts = str_num.split('.')
-        
-        # Handle cases with no decimal point
-        if len(parts) == 1:
-            parts.append('0')
-            
-        whole = parts[0]
-        decimal = parts[1] if len(parts) > 1 else ''
-        
-        # If we have fewer decimals than required
-        if len(decimal) < min_decimals:
-            # Pad with zeros first
-            decimal = decimal.ljust(min_decimals - 1, '0')
-            # Add '1' at the end
-            decimal = decimal + '1'
-            # Construct the new number
-            result = float(f"{whole}.{decimal}")
+        places = next(decimals) if decimals is not None else count_decimal_places(coordinates)
+        # repr() writes at least one decimal, so whole numbers count as one
+        if max(places, 1) < min_decimals:
+            # Pad with zeros and add a '1' at the end
+            result = float(f"{abs(float(coordinates)):.{min_decimals - 1}f}1")
             # Apply original sign
             return -result if coordinates < 0 else result
         else:
@@ -418,62 +2974,304 @@ def fix_coordinates(coordinates, min_decimals):
             format_str = f"{{:.{min_decimals}f}}"
             return float(format_str.format(float(coordinates)))
     elif isinstance(coordinates, list):
-        return [fix_coordinates(coord, min_decimals) for coord in coordinates]
+        return [fix_coordinates(coord, min_decimals, decimals) for coord in coordinates]
     return coordinates
 
-def process_geojson(data: Dict, min_decimals: int) -> Dict:
-    """Process GeoJSON coordinates to fix decimal places."""
-    if not isinstance(data, dict):
+COORDINATE_ENGINES = ("vectorized", "scalar")
+# "coordinates" fixes every number on its own; "topology" also repairs geometries that breaks
+PRECISION_MODES = ("coordinates", "topology")
+
+def _count_positions(geometry: Dict) -> int:
+    """Number of positions in a GeoJSON geometry, for instrumentation."""
+    def count(coordinates) -> int:
+        if not isinstance(coordinates, list) or not coordinates:
+            return 0
+        if not isinstance(coordinates[0], list):
+            return 1
+        return sum(count(item) for item in coordinates)
+    if geometry.get("type") == "GeometryCollection":
+        return sum(_count_positions(member or {}) for member in geometry.get("geometries") or [])
+    return count(geometry.get("coordinates"))
+
+def _collect_rings(coordinates: list, rings: List[list]) -> bool:
+    """Collect the lists of positions (rings, line strings) of a coordinates array.
+
+    Returns False if the nesting is irregular, in which case the caller
+    should fall back to the scalar engine.
+    """
+    first = coordinates[0]
+    if isinstance(first, list) and first and isinstance(first[0], (int, float)):
+        rings.append(coordinates)
+        return True
+    for item in coordinates:
+        if not isinstance(item, list) or not item or not _collect_rings(item, rings):
+            return False
+    return True
+
+def fix_coordinate_array(values: np.ndarray, min_decimals: int, decimals: Optional[np.ndarray] = None) -> np.ndarray:
+    """Vectorized equivalent of fix_coordinates for a float64 array.
+
+    ``decimals`` optionally gives the decimal places of each value as
+    written, with -1 where they are unknown; otherwise they are inferred
+    from the float. Values whose repr() the float arithmetic cannot judge
+    (exponent notation, non-finite numbers) or whose rounding is too close
+    to call are passed through fix_coordinates, so the result matches the
+    scalar engine exactly.
+    """
+    values = np.asarray(values, dtype=np.float64)
+
+    def scalar(i: int) -> float:
+        places = None if decimals is None or decimals.flat[i] < 0 else iter([int(decimals.flat[i])])
+        return fix_coordinates(float(values.flat[i]), min_decimals, places)
+
+    if not 0 <= min_decimals <= 15:
+        return np.array([scalar(i) for i in range(values.size)]).reshape(values.shape)
+
+    abs_values = np.abs(values)
+    scale = 10.0 ** min_decimals
+    known = np.zeros(values.shape, dtype=bool) if decimals is None else decimals >= 0
+    fallback = ~np.isfinite(values) | (abs_values >= 1e16) | (~known & (abs_values < 1e-4) & (abs_values != 0))
+    with np.errstate(invalid="ignore", over="ignore"):
+        # Values with fewer than min_decimals decimals get padded with a trailing 1
+        if min_decimals >= 2:
+            coarse = 10.0 ** (min_decimals - 1)
+            shifted = np.rint(abs_values * coarse)
+            pad = shifted / coarse == abs_values
+            if decimals is not None:
+                pad = np.where(known, np.maximum(decimals, 1) < min_decimals, pad)
+            padded = (shifted * 10 + 1) / scale
+            padded = np.where(values < 0, -padded, padded)
+            fallback |= pad & (shifted * 10 + 1 >= 2 ** 53)
+        else:
+            pad = np.zeros(values.shape, dtype=bool)
+            padded = values
+
+        # The rest are rounded to min_decimals like "{:.Nf}".format(x)
+        scaled = values * scale
+        rounded = np.rint(scaled)
+        tie = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) <= 2 * np.spacing(np.abs(scaled))
+        fallback |= ~pad & (tie | (np.abs(rounded) >= 2 ** 53))
+        result = np.where(pad, padded, rounded / scale)
+
+    for i in np.flatnonzero(fallback):
+        result.flat[i] = scalar(i)
+    return result
+
+def _fix_rings_vectorized(rings: List[list], min_decimals: int,
+                          ring_decimals: Optional[List[Optional[np.ndarray]]] = None) -> bool:
+    """Fix lists of positions in place as one array; False if they are not numeric and uniform.
+
+    ``ring_decimals`` optionally holds the decimal places as written of the
+    numbers of each ring (None where unknown).
+    """
+    try:
+        values = np.array(list(chain.from_iterable(rings)), dtype=np.float64)
+    except (TypeError, ValueError):
+        return False
+    if values.ndim != 2 or np.isnan(values).any():
+        return False
+    decimals = None
+    if ring_decimals is not None and any(d is not None for d in ring_decimals):
+        decimals = np.concatenate([
+            d if d is not None else np.full(len(ring) * values.shape[1], -1, dtype=np.int16)
+            for ring, d in zip(rings, ring_decimals)
+        ]).reshape(values.shape)
+    rows = fix_coordinate_array(values, min_decimals, decimals).tolist()
+    start = 0
+    for ring in rings:
+        end = start + len(ring)
+        ring[:] = rows[start:end]
+        start = end
+    return True
+
+def _iter_decimals(decimals: Optional[np.ndarray]) -> Optional[Iterator[int]]:
+    """``decimals`` in the form fix_coordinates takes."""
+    return None if decimals is None else iter(decimals.tolist())
+
+def _split_decimals(decimals: Optional[np.ndarray], rings: List[list]) -> List[Optional[np.ndarray]]:
+    """Split the decimal places of a geometry's numbers by ring.
+
+    The slices only line up if every position has the same length and holds
+    only numbers, so otherwise the decimal places are left unknown.
+    """
+    if decimals is None or not rings:
+        return [None] * len(rings)
+    dims = len(rings[0][0])
+    bounds = np.cumsum([0] + [len(ring) * dims for ring in rings])
+    if bounds[-1] != len(decimals) or set(map(len, chain.from_iterable(rings))) != {dims}:
+        return [None] * len(rings)
+    return [decimals[bounds[k]:bounds[k + 1]] for k in range(len(rings))]
+
+def _fix_geometries_vectorized(geometries: List[Dict], min_decimals: int) -> None:
+    """Fix the coordinates of many geometries in place with one array pass.
+
+    Decimal places as written (source_decimals) are used where the
+    geometries have them and all positions share one dimension.
+    """
+    rings: List[list] = []
+    ring_decimals: List[Optional[np.ndarray]] = []
+    points: List[Tuple[Dict, list]] = []
+    for geometry in geometries:
+        coordinates = geometry["coordinates"]
+        decimals = source_decimals(geometry)
+        if not isinstance(coordinates, list):
+            geometry["coordinates"] = fix_coordinates(coordinates, min_decimals, _iter_decimals(decimals))
+            continue
+        first = len(rings)
+        if isinstance(coordinates[0], (int, float)):
+            # A single position (Point): wrap it so it is fixed along with the rings
+            wrapper = [coordinates]
+            rings.append(wrapper)
+            points.append((geometry, wrapper))
+        elif not _collect_rings(coordinates, rings):
+            del rings[first:]
+            geometry["coordinates"] = fix_coordinates(coordinates, min_decimals, _iter_decimals(decimals))
+            continue
+        ring_decimals.extend(_split_decimals(decimals, rings[first:]))
+
+    record_size("vertices", sum(len(ring) for ring in rings))
+    if not _fix_rings_vectorized(rings, min_decimals, ring_decimals):
+        # Mixed dimensions or non-numeric members: retry per dimension, then ring by ring
+        by_dimension: Dict[int, Tuple[List[list], List[Optional[np.ndarray]]]] = {}
+        for ring, decimals in zip(rings, ring_decimals):
+            group, group_decimals = by_dimension.setdefault(len(ring[0]), ([], []))
+            group.append(ring)
+            group_decimals.append(decimals)
+        for group, group_decimals in by_dimension.values():
+            if _fix_rings_vectorized(group, min_decimals, group_decimals):
+                continue
+            for ring, decimals in zip(group, group_decimals):
+                if not _fix_rings_vectorized([ring], min_decimals, [decimals]):
+                    ring[:] = fix_coordinates(ring, min_decimals, _iter_decimals(decimals))
+
+    for geometry, wrapper in points:
+        geometry["coordinates"] = wrapper[0]
+
+def _fix_store(store: FeatureStore, min_decimals: int, engine: str):
+    """Fix the coordinates held in a FeatureStore's arrays in place."""
+    batch = store.batch
+    used = np.arange(batch.coords.shape[1]) < batch.position_dims[:, None]
+    values = batch.coords[used]
+    decimals = batch.decimals[used] if batch.decimals is not None else None
+    record_size("vertices", len(batch.coords))
+    if engine == "vectorized":
+        batch.coords[used] = fix_coordinate_array(values, min_decimals, decimals)
+    else:
+        batch.coords[used] = fix_coordinates(values.tolist(), min_decimals, _iter_decimals(decimals))
+    # Fixed values are floats again, whose decimal places are their repr()'s
+    batch.decimals = None
+    batch.reset()
+
+def process_geojson(data: Union[Dict, FeatureStore], min_decimals: int, engine: str = "vectorized") -> Dict:
+    """Process GeoJSON coordinates to fix decimal places.
+
+    ``engine`` selects the "vectorized" NumPy implementation or the original
+    per-scalar "scalar" one; both produce identical coordinates. Geometries
+    read by ExactDecimalCodec are fixed by their decimal places as written.
+    A FeatureStore is fixed in its arrays and returned.
+    """
+    if engine not in COORDINATE_ENGINES:
+        raise ValueError(f"Unknown coordinate engine: {engine}")
+    store = data if isinstance(data, FeatureStore) else None
+    if store is not None:
+        _fix_store(store, min_decimals, engine)
+        features = [feature for feature, row in zip(store.features, store.rows.tolist()) if row < 0]
+        record_size("features", len(store.features))
+    elif not isinstance(data, dict):
         return data
-        
-    if data.get("type") == "FeatureCollection":
+    elif data.get("type") == "FeatureCollection":
         features = data.get("features", [])
-        for feature in features:
-            if feature.get("geometry") and feature["geometry"].get("coordinates"):
-                feature["geometry"]["coordinates"] = fix_coordinates(
-                    feature["geometry"]["coordinates"],
-                    min_decimals
-                )
     elif data.get("type") == "Feature":
-        if data.get("geometry") and data["geometry"].get("coordinates"):
-            data["geometry"]["coordinates"] = fix_coordinates(
-                data["geometry"]["coordinates"],
-                min_decimals
-            )
+        features = [data]
+    else:
+        features = []
+
+    geometries = [
+        feature["geometry"] for feature in features
+        if feature.get("geometry") and feature["geometry"].get("coordinates")
+    ]
+    if store is None:
+        record_size("features", len(features))
+    if engine == "vectorized":
+        _fix_geometries_vectorized(geometries, min_decimals)
+    else:
+        for geometry in geometries:
+            record_size("vertices", _count_positions(geometry))
+            geometry["coordinates"] = fix_coordinates(geometry["coordinates"], min_decimals,
+                                                      _iter_decimals(source_decimals(geometry)))
     
     return data
 
-def calculate_area(geojson_data):
+AREA_METHODS = ("mercator", "geodesic")
+
+@lru_cache(maxsize=None)
+def get_web_mercator_transformer() -> "pyproj.Transformer":
+    """WGS84 -> Web Mercator transformer, built once per process."""
+    return pyproj.Transformer.from_crs(pyproj.CRS.from_epsg(4326), pyproj.CRS.from_epsg(3857), always_xy=True)
+
+@lru_cache(maxsize=None)
+def get_geod() -> "pyproj.Geod":
+    """WGS84 ellipsoid for geodesic area calculation."""
+    return pyproj.Geod(ellps="WGS84")
+
+def _geodesic_areas(geoms: np.ndarray) -> np.ndarray:
+    """Geodesic areas in square metres of an array of geometries, as abs(get_geod().geometry_area_perimeter(g)[0]).
+
+    The rings of all polygonal parts are taken apart and their coordinates
+    fetched with Shapely's array functions in three calls; only the
+    Geod.polygon_area_perimeter call loops, once per ring, and the signed
+    ring areas are summed per geometry in their original order. Lines and
+    points count as no area.
+    """
+    parts, part_owner = shapely.get_parts(geoms, return_index=True)
+    rings, ring_part = shapely.get_rings(parts, return_index=True)
+    coords, coord_ring = shapely.get_coordinates(rings, return_index=True)
+    bounds = np.searchsorted(coord_ring, np.arange(len(rings) + 1))
+    geod = get_geod()
+    ring_areas = [geod.polygon_area_perimeter(coords[start:end, 0], coords[start:end, 1])[0]
+                  for start, end in zip(bounds[:-1].tolist(), bounds[1:].tolist())]
+    return np.abs(np.bincount(part_owner[ring_part], weights=ring_areas, minlength=len(geoms)))
+
+def _to_web_mercator(coords: np.ndarray) -> np.ndarray:
+    """Reproject an (N, 2) lon/lat array in one transformer call."""
+    x, y = get_web_mercator_transformer().transform(coords[:, 0], coords[:, 1])
+    return np.column_stack([x, y])
+
+def calculate_area(geojson_data, method: str = "mercator", geometries: Optional[Dict[int, Any]] = None):
     """
     Calculate areas for all polygons in the GeoJSON.
     Returns a list of dictionaries with feature index and area in square meters.
+
+    ``method`` is "mercator" (planar area in Web Mercator, the historical
+    behaviour) or "geodesic" (true area on the WGS84 ellipsoid). Shapely
+    geometries already built for the features can be passed in as
+    ``geometries`` (feature index -> geometry) to avoid rebuilding them;
+    for a FeatureStore they are built from its arrays.
     """
+    if method not in AREA_METHODS:
+        raise ValueError(f"Unknown area method: {method}")
     areas = []
-    
-    # Create transformer from WGS84 to Web Mercator for accurate area calculation
-    transformer = Transformer.from_crs(CRS.from_epsg(4326), CRS.from_epsg(3857), always_xy=True)
+    if isinstance(geojson_data, FeatureStore):
+        geometries = {**geojson_data.shapes(("Polygon", "MultiPolygon")), **(geometries or {})}
+        geojson_data = geojson_data.data
     
     if geojson_data["type"] == "FeatureCollection":
         features = geojson_data["features"]
     else:
         features = [geojson_data]
-    
+
+    indices = []
+    shapes = []
     for idx, feature in enumerate(features):
-        if feature.get("geometry", {}).get("type") in ["Polygon", "MultiPolygon"]:
+        if (feature.get("geometry") or {}).get("type") in ["Polygon", "MultiPolygon"]:
             try:
                 # Create Shapely geometry
-                geom = shape(feature["geometry"])
-                
-                # Transform coordinates to Web Mercator
-                transformed_geom = transform(transformer.transform, geom)
-                
-                # Calculate area in square meters
-                area = transformed_geom.area
-                
-                areas.append({
-                    "index": idx,
-                    "area": round(area, 2)  # Round to 2 decimal places
-                })
+                if geometries is not None and idx in geometries:
+                    geom = geometries[idx]
+                else:
+                    geom = shapely.geometry.shape(feature["geometry"])
+                indices.append(idx)
+                shapes.append(geom)
             except Exception as e:
                 print(f"Error calculating area for feature {idx}: {str(e)}")
                 areas.append({
@@ -481,91 +3279,1602 @@ def calculate_area(geojson_data):
                     "area": None,
                     "error": str(e)
                 })
+
+    if shapes:
+        geoms = np.empty(len(shapes), dtype=object)
+        geoms[:] = shapes
+        if method == "geodesic":
+            values = _geodesic_areas(geoms).tolist()
+        else:
+            # Transform all coordinates to Web Mercator in a single call
+            values = shapely.area(shapely.transform(geoms, _to_web_mercator)).tolist()
+        for idx, area in zip(indices, values):
+            areas.append({
+                "index": idx,
+                "area": round(area, 2)  # Round to 2 decimal places
+            })
+        areas.sort(key=lambda item: item["index"])
     
     return areas
 
+def compare_areas(original_areas: List[Dict], processed_areas: List[Dict]) -> List[Dict]:
+    """Pair up original and processed areas and compute their difference."""
+    area_comparison = []
+    for orig, proc in zip(original_areas, processed_areas):
+        if orig["area"] is not None and proc["area"] is not None:
+            area_comparison.append({
+                "index": orig["index"],
+                "original_area": orig["area"],
+                "processed_area": proc["area"],
+                "difference": proc["area"] - orig["area"],
+                "difference_percentage": ((proc["area"] - orig["area"]) / orig["area"]) * 100 if orig["area"] != 0 else 0
+            })
+    return area_comparison
+
+def _lists(value: Any) -> Any:
+    """Nested tuples, as in shapely.geometry.mapping, as nested lists."""
+    return [_lists(item) for item in value] if isinstance(value, tuple) else value
+
+def _preserve_topology(batch: GeometryBatch, before: np.ndarray,
+                       min_decimals: int) -> Tuple[List[int], List[Any], List[int]]:
+    """Find and repair the geometries of a fixed batch that fixing made invalid.
+
+    ``before`` holds the geometries as they were before fixing. Those that
+    were valid and no longer are get snapped to the grid of
+    ``min_decimals`` decimals with shapely.set_precision, which keeps them
+    valid, in one call. A result with the same type, parts and holes
+    replaces the fixed geometry if fixing its coordinates again keeps it
+    valid, with exteriors counter-clockwise; the others (a polygon smaller
+    than the grid collapses, say, a hole merges into its shell, or the
+    geometry has Z values) are left as fixed and flagged.
+
+    Returns the feature indices of the repaired geometries, their new
+    coordinates, and the feature indices flagged.
+    """
+    if not len(batch):
+        return [], [], []
+    broken = np.flatnonzero(shapely.is_valid(before) & ~shapely.is_valid(batch.geometries()))
+    if not len(broken):
+        return [], [], []
+    snapped = shapely.set_precision(before[broken], 10.0 ** -min_decimals)
+    # The batch builds 2D geometries, so a repair would drop Z values
+    flat = batch.position_dims[batch.ring_offsets[batch.part_offsets[batch.geom_offsets[broken]]]] == 2
+    usable = ((shapely.get_type_id(snapped) == shapely.get_type_id(before[broken]))
+              & (shapely.get_num_geometries(snapped) == shapely.get_num_geometries(before[broken]))
+              & (_interior_ring_counts(snapped) == _interior_ring_counts(before[broken]))
+              & ~shapely.is_empty(snapped) & shapely.is_valid(snapped) & flat)
+    usable = np.flatnonzero(usable)
+    candidates = []
+    for geom in snapped[usable]:
+        if geom.geom_type == "Polygon":
+            geom = shapely.geometry.polygon.orient(geom)
+        elif geom.geom_type == "MultiPolygon":
+            geom = shapely.MultiPolygon([shapely.geometry.polygon.orient(part) for part in geom.geoms])
+        mapping = shapely.geometry.mapping(geom)
+        grid = _lists(mapping["coordinates"])
+        candidates.append((mapping["type"], grid, fix_coordinates(grid, min_decimals)))
+    refixed = np.empty(len(candidates), dtype=object)
+    refixed[:] = [shapely.geometry.shape({"type": kind, "coordinates": fixed}) for kind, _, fixed in candidates]
+    # Grid coordinates would not have exactly min_decimals decimals, so those that need them are flagged
+    refixed_valid = shapely.is_valid(refixed)
+    repaired = np.zeros(len(broken), dtype=bool)
+    repaired[usable[refixed_valid]] = True
+    indices = batch.feature_index[broken]
+    coordinates = [fixed for (_, _, fixed), valid in zip(candidates, refixed_valid.tolist()) if valid]
+    return indices[repaired].tolist(), coordinates, indices[~repaired].tolist()
+
+def _interior_ring_counts(geoms: np.ndarray) -> np.ndarray:
+    """Number of holes of each geometry, over all its parts."""
+    parts, owner = shapely.get_parts(geoms, return_index=True)
+    return np.bincount(owner, weights=shapely.get_num_interior_rings(parts), minlength=len(geoms)).astype(int)
+
+def fix_features(store: FeatureStore, min_decimals: int, engine: str, area_method: str = "mercator",
+                 reuse: bool = True, precision_mode: str = "coordinates") -> Tuple[List[Dict], Dict[str, Any]]:
+    """Fix a FeatureStore in place; returns its area comparison and details.
+
+    Features whose fingerprint (geometry, ``min_decimals``, ``area_method``
+    and ``precision_mode``) has a result in feature_results get its fixed
+    coordinates and areas; only the rest are fixed and measured, and their
+    results are stored. ``reuse=False`` recomputes every feature. The
+    details have the counts as "feature_reuse".
+
+    With the "topology" ``precision_mode``, geometries that fixing made
+    invalid are repaired or flagged (see _preserve_topology) before their
+    areas are measured, and listed in the details as "topology".
+    """
+    if precision_mode not in PRECISION_MODES:
+        raise ValueError(f"Unknown precision mode: {precision_mode}")
+    topology = precision_mode == "topology"
+    batch = store.batch
+    salt = json.dumps(["process", FEATURE_RESULTS_VERSION, min_decimals, area_method, precision_mode]).encode()
+    keys = batch.fingerprints(salt) if feature_results.enabled else []
+    cached = feature_results.get_many(keys) if reuse else {}
+    hits = np.array([key in cached for key in keys], dtype=bool) if cached else np.zeros(len(batch), dtype=bool)
+    reused = np.zeros(len(store.features), dtype=bool)
+    reused[batch.feature_index[hits]] = True
+    fresh = np.flatnonzero(~reused)
+    work = store.subset(fresh.tolist()) if hits.any() else store
+
+    with timed_stage("area_original"):
+        # Built here, they are also the geometries calculate_area measures
+        before = work.batch.geometries() if topology else None
+        original_areas = calculate_area(work, area_method)
+    with timed_stage("fix"):
+        process_geojson(work, min_decimals, engine)
+    repaired, coordinates, flagged = [], [], []
+    if topology:
+        with timed_stage("topology"):
+            repaired, coordinates, flagged = _preserve_topology(work.batch, before, min_decimals)
+
+    if work is not store:
+        fresh_rows = store.rows[fresh]
+        positions = batch.positions_of(fresh_rows[fresh_rows >= 0])
+        batch.coords[positions, :work.batch.coords.shape[1]] = work.batch.coords
+        for row in np.flatnonzero(hits).tolist():
+            result, coords = cached[keys[row]]
+            start, end = store._positions(row)
+            dims = int(batch.position_dims[start])
+            batch.coords[start:end, :dims] = np.frombuffer(coords, dtype=np.float64).reshape(end - start, dims)
+        batch.decimals = None
+        batch.reset()
+        if repaired:
+            work.detach(repaired, coordinates)
+        repaired = fresh[repaired].tolist()
+        flagged = fresh[flagged].tolist()
+
+    # Repaired geometries leave the arrays, so they are not stored
+    items = []
+    if keys:
+        skipped = set(repaired)
+        for row in np.flatnonzero(~hits).tolist():
+            index = int(batch.feature_index[row])
+            if index not in skipped:
+                start, end = store._positions(row)
+                dims = int(batch.position_dims[start])
+                items.append((keys[row], index, np.ascontiguousarray(batch.coords[start:end, :dims]).tobytes()))
+    if repaired:
+        store.detach(repaired, coordinates)
+
+    with timed_stage("area_processed"):
+        processed_areas = calculate_area(work, area_method)
+
+    if work is not store:
+        for row in chain(original_areas, processed_areas):
+            row["index"] = int(fresh[row["index"]])
+        for row in np.flatnonzero(hits).tolist():
+            result = cached[keys[row]][0]
+            index = int(batch.feature_index[row])
+            if result["original_area"] is not None:
+                original_areas.append({"index": index, "area": result["original_area"]})
+                processed_areas.append({"index": index, "area": result["processed_area"]})
+            if result.get("flagged"):
+                flagged.append(index)
+        original_areas.sort(key=lambda item: item["index"])
+        processed_areas.sort(key=lambda item: item["index"])
+
+    if items:
+        original = {row["index"]: row["area"] for row in original_areas}
+        processed = {row["index"]: row["area"] for row in processed_areas}
+        flagged_set = set(flagged)
+        feature_results.put_many([
+            (key, {"original_area": original.get(index), "processed_area": processed.get(index),
+                   "flagged": index in flagged_set}, coords)
+            for key, index, coords in items
+        ])
+    details: Dict[str, Any] = {
+        "feature_reuse": {"reused": int(hits.sum()), "recomputed": len(store.features) - int(hits.sum())}
+    }
+    if topology:
+        details["topology"] = {"repaired": sorted(repaired), "flagged": sorted(flagged)}
+    return compare_areas(original_areas, processed_areas), details
+
+class FeatureStreamSplitter:
+    """Incrementally split a FeatureCollection byte stream into single features.
+
+    Bytes are fed in chunks; every complete element of the top-level
+    ``features`` array is returned as raw JSON bytes as soon as its closing
+    brace arrives. Only the feature being read is buffered, along with the
+    members before (``header``) and after (``trailer``) the features array.
+    If the document has no top-level ``features`` array, nothing is split
+    and the whole document ends up in ``header``. With ``spans`` the
+    (start, end) byte offsets of every feature in the stream are kept in
+    ``spans`` as well.
+    """
+
+    _STRUCTURAL = re.compile(rb'["{}\[\]:,]')
+    _STRING_SPECIAL = re.compile(rb'["\\]')
+    # Inside a feature only braces and strings matter, so coordinates are skipped in C
+    _FEATURE_SPECIAL = re.compile(rb'["{}]')
+    _ELEMENT_START = re.compile(rb'\S')
+
+    def __init__(self, spans: bool = False):
+        self.header = b""
+        self.trailer = b""
+        self.mode = "header"
+        self.spans: Optional[List[Tuple[int, int]]] = [] if spans else None
+        self._buffer = bytearray()
+        self._offset = 0  # stream offset of the start of the buffer
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._string_start = 0
+        self._expect_key = False
+        self._last_key = b""
+        self._element_start = 0
+        # Between features: "start" of the array, after an "element" or after a "comma"
+        self._separator = "start"
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        """Consume a chunk and return the features it completed."""
+        self._buffer += chunk
+        features = []
+        buf = self._buffer
+        pos = self._pos
+        consumed = 0
+        while True:
+            if self._in_string:
+                match = self._STRING_SPECIAL.search(buf, pos)
+                if match is None:
+                    pos = len(buf)
+                    break
+                if match.group() == b"\\":
+                    if match.end() >= len(buf):
+                        # The escaped character is in the next chunk
+                        pos = match.start()
+                        break
+                    pos = match.end() + 1
+                    continue
+                self._in_string = False
+                pos = match.end()
+                if self.mode == "header" and self._depth == 1 and self._expect_key:
+                    self._last_key = bytes(buf[self._string_start:pos])
+                continue
+
+            if self.mode == "features":
+                if self._depth == 2:
+                    # Between elements: the next significant byte opens a feature or closes the array
+                    match = self._ELEMENT_START.search(buf, pos)
+                    if match is None:
+                        pos = len(buf)
+                        break
+                    char = match.group()
+                    pos = match.end()
+                    if char == b"{" and self._separator != "element":
+                        self._element_start = match.start()
+                        self._depth += 1
+                        self._separator = "element"
+                    elif char == b"," and self._separator == "element":
+                        self._separator = "comma"
+                    elif char == b"]" and self._separator != "comma":
+                        self.mode = "trailer"
+                        consumed = match.start()
+                        pos = len(buf)
+                        break
+                    elif char in b"{,]":
+                        raise ValueError("Features array is missing a comma or has an extra one")
+                    else:
+                        raise ValueError("Features array contains a non-object element")
+                    continue
+                match = self._FEATURE_SPECIAL.search(buf, pos)
+                if match is None:
+                    pos = len(buf)
+                    break
+                char = match.group()
+                pos = match.end()
+                if char == b'"':
+                    self._in_string = True
+                elif char == b"{":
+                    self._depth += 1
+                else:
+                    self._depth -= 1
+                    if self._depth == 2:
+                        features.append(bytes(buf[self._element_start:pos]))
+                        if self.spans is not None:
+                            self.spans.append((self._offset + self._element_start, self._offset + pos))
+                        consumed = pos
+                continue
+
+            if self.mode == "trailer":
+                pos = len(buf)
+                break
+
+            match = self._STRUCTURAL.search(buf, pos)
+            if match is None:
+                pos = len(buf)
+                break
+            char = match.group()
+            pos = match.end()
+            if char == b'"':
+                self._in_string = True
+                self._string_start = match.start()
+            elif char in b"{[":
+                self._depth += 1
+                if (char == b"[" and self._depth == 2 and not self._expect_key
+                        and self._last_key == b'"features"'):
+                    self.mode = "features"
+                    self.header = bytes(buf[:pos])
+                    consumed = pos
+                else:
+                    self._expect_key = char == b"{" and self._depth == 1
+            elif char in b"}]":
+                self._depth -= 1
+            elif self._depth == 1:
+                self._expect_key = char == b","
+
+        # Drop everything already handed out in one go rather than per feature
+        if consumed:
+            del buf[:consumed]
+            self._offset += consumed
+            pos -= consumed
+            self._element_start -= consumed
+            self._string_start -= consumed
+        self._pos = pos
+        return features
+
+    def close(self) -> None:
+        """Finish the stream; raises ValueError if it ended mid-document."""
+        if self.mode == "features" or self._in_string:
+            raise ValueError("Unexpected end of input inside the features array")
+        if self.mode == "header":
+            self.header = bytes(self._buffer)
+        else:
+            self.trailer = bytes(self._buffer)
+            # The envelope without its features must itself be a valid object
+            json.loads(self.header + self.trailer)
+        self._buffer = bytearray()
+
+STREAM_CHUNK_SIZE = 1024 * 1024
+STREAM_BATCH_BYTES = 1024 * 1024
+
+def _process_feature_batch(raw_features: List[bytes], offset: int, min_decimals: int, engine: str, indent: Optional[int] = None,
+                           area_method: str = "mercator", reuse: bool = True,
+                           precision_mode: str = "coordinates") -> Tuple[List[str], List[Dict], Dict[str, Any]]:
+    """Fix a batch of raw features; returns their serialized form, area comparison and details (see fix_features).
+
+    With ``indent`` each feature is serialized as it would appear inside
+    the collection serialized with that indent, so the texts can be joined
+    into the full document without re-serializing it; without it features
+    are compact.
+    """
+    with timed_stage("parse"):
+        features = [json_codec.loads(raw) for raw in raw_features]
+        store = FeatureStore.from_features({"type": "FeatureCollection", "features": features}, iter([features]))
+    comparison, details = fix_features(store, min_decimals, engine, area_method, reuse, precision_mode)
+    for row in comparison:
+        row["index"] += offset
+    for indices in details.get("topology", {}).values():
+        indices[:] = [i + offset for i in indices]
+    with timed_stage("serialize"):
+        serialized = list(store.feature_texts(indent, 2))
+    return serialized, comparison, details
+
+def _without_member(part: bytes, name: str, header: bool) -> bytes:
+    """The header (or trailer) of a split FeatureCollection without its top-level member ``name``."""
+    if f'"{name}"'.encode() not in part:
+        return part
+    members = json_codec.loads(part + b"]}" if header else b'{"features": [' + part)
+    if name not in members:
+        return part
+    del members[name]
+    text = json_codec.dumps(members, None).encode()
+    # The features array is the last member of a header and the first of a trailer
+    return text[:text.rindex(b"]")] if header else text[text.index(b"]"):]
+
+def stream_processed_geojson(splitter: FeatureStreamSplitter, pending: List[bytes], source, min_decimals: int, engine: str,
+                             area_method: str = "mercator") -> Iterator[bytes]:
+    """Yield a fixed FeatureCollection feature by feature.
+
+    ``pending`` holds features already split from ``source`` while reading
+    the header. Features are fixed in small batches, so memory stays bounded
+    by the larger of the biggest feature and STREAM_BATCH_BYTES. The area
+    comparison rows are spooled to a temporary file and appended as an
+    ``area_comparison`` member once all features are written; one the
+    input already had is dropped, as in the non-streamed response.
+    """
+    comparison_file = tempfile.SpooledTemporaryFile(max_size=STREAM_BATCH_BYTES, mode="w+")
+    count = 0
+    rows = 0
+
+    def flush(batch: List[bytes]) -> Iterator[bytes]:
+        nonlocal count, rows
+        serialized, comparison, _ = _process_feature_batch(batch, count, min_decimals, engine, area_method=area_method)
+        for text in serialized:
+            yield (",\n" if count else "\n").encode() + text.encode()
+            count += 1
+        for row in comparison:
+            comparison_file.write(("," if rows else "") + json.dumps(row))
+            rows += 1
+
+    try:
+        yield _without_member(splitter.header, "area_comparison", True)
+        batch: List[bytes] = []
+        batch_bytes = 0
+        while True:
+            for raw in pending:
+                batch.append(raw)
+                batch_bytes += len(raw)
+                if batch_bytes >= STREAM_BATCH_BYTES:
+                    yield from flush(batch)
+                    batch, batch_bytes = [], 0
+            chunk = source.read(STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            pending = splitter.feed(chunk)
+        splitter.close()
+        if batch:
+            yield from flush(batch)
+
+        # Insert the area comparison before the closing brace of the root object
+        trailer = _without_member(splitter.trailer, "area_comparison", False)
+        closing = trailer.rfind(b"}")
+        yield b"\n" + trailer[:closing] + b', "area_comparison": ['
+        comparison_file.seek(0)
+        while True:
+            text = comparison_file.read(STREAM_CHUNK_SIZE)
+            if not text:
+                break
+            yield text.encode()
+        yield b"]" + trailer[closing:]
+    finally:
+        comparison_file.close()
+
+# Newline-delimited GeoJSON: RFC 8142 text sequences (every record starts with
+# an RS byte) and NDJSON (one record per line). Records are Features or bare
+# geometries and are fixed and validated independently of each other.
+INPUT_FORMATS = ("auto", "json", "geojsonseq", "ndjson")
+SEQUENCE_FORMATS = ("geojsonseq", "ndjson")
+SEQUENCE_MEDIA_TYPES = {"json": "application/json", "geojsonseq": "application/geo+json-seq",
+                        "ndjson": "application/x-ndjson"}
+_SEQUENCE_EXTENSIONS = {".geojsons": "geojsonseq", ".geojsonseq": "geojsonseq",
+                        ".geojsonl": "ndjson", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+GEOJSON_GEOMETRY_TYPES = ("Point", "MultiPoint", "LineString", "MultiLineString", "Polygon", "MultiPolygon",
+                          "GeometryCollection")
+RECORD_SEPARATOR = b"\x1e"
+
+def detect_input_format(input_format: str, filename: Optional[str], head: bytes) -> str:
+    """Resolve "auto" from a leading RS byte or the file extension; other formats are returned as is."""
+    if input_format not in INPUT_FORMATS:
+        raise ValueError(f"Unknown input format: {input_format}")
+    if input_format != "auto":
+        return input_format
+    if head.lstrip()[:1] == RECORD_SEPARATOR:
+        return "geojsonseq"
+    return _SEQUENCE_EXTENSIONS.get(Path(filename or "").suffix.lower(), "json")
+
+def resolve_output_format(output_format: Optional[str], input_format: str) -> str:
+    """Output format, defaulting to the input format."""
+    if not output_format:
+        return input_format
+    if output_format not in INPUT_FORMATS[1:]:
+        raise ValueError(f"Unknown output format: {output_format}")
+    return output_format
+
+class SequenceSplitter:
+    """Incrementally split a GeoJSON text sequence or NDJSON stream into records.
+
+    Bytes are fed in chunks; feed() returns (line number, record bytes) for
+    every record completed by the chunk, close() the last one. Line numbers
+    are 1-based and point at the line the record starts on. Blank records
+    are skipped.
+    """
+
+    def __init__(self, fmt: str):
+        self.delimiter = RECORD_SEPARATOR if fmt == "geojsonseq" else b"\n"
+        self._buffer = bytearray()
+        self._line = 1  # line number at the start of the buffer
+
+    def _records(self, pieces: List[bytes]) -> List[Tuple[int, bytes]]:
+        records = []
+        line_breaks = 1 if self.delimiter == b"\n" else 0
+        for piece in pieces:
+            record = piece.strip()
+            if record:
+                leading = piece[:len(piece) - len(piece.lstrip())]
+                records.append((self._line + leading.count(b"\n"), record))
+            self._line += piece.count(b"\n") + line_breaks
+        return records
+
+    def feed(self, chunk: bytes) -> List[Tuple[int, bytes]]:
+        self._buffer += chunk
+        end = self._buffer.rfind(self.delimiter)
+        if end < 0:
+            return []
+        complete = bytes(self._buffer[:end])
+        del self._buffer[:end + 1]
+        return self._records(complete.split(self.delimiter))
+
+    def close(self) -> List[Tuple[int, bytes]]:
+        records = self._records([bytes(self._buffer)])
+        self._buffer = bytearray()
+        return records
+
+def split_sequence(content: bytes, fmt: str) -> List[Tuple[int, bytes]]:
+    """All records of a sequence document with their line numbers."""
+    with timed_stage("split"):
+        splitter = SequenceSplitter(fmt)
+        return splitter.feed(content) + splitter.close()
+
+def _fix_records(raw_records: List[bytes], min_decimals: int, engine: str,
+                 area_method: str) -> Tuple[List[Any], List[Dict]]:
+    """Fix parsed records together; raises ValueError for a record that is not a Feature or geometry."""
+    with timed_stage("parse"):
+        items = [json_codec.loads(raw) for raw in raw_records]
+    features = []
+    for item in items:
+        kind = item.get("type") if isinstance(item, dict) else None
+        if kind == "Feature":
+            features.append(item)
+        elif kind in GEOJSON_GEOMETRY_TYPES:
+            features.append({"type": "Feature", "properties": None, "geometry": item})
+        else:
+            raise ValueError("Expected a GeoJSON Feature or geometry")
+    batch = {"type": "FeatureCollection", "features": features}
+    with timed_stage("area_original"):
+        original_areas = calculate_area(batch, area_method)
+    with timed_stage("fix"):
+        process_geojson(batch, min_decimals, engine)
+    with timed_stage("area_processed"):
+        processed_areas = calculate_area(batch, area_method)
+    # Bare geometries were fixed in place and are written back unwrapped
+    return items, compare_areas(original_areas, processed_areas)
+
+def _process_record_batch(records: List[Tuple[int, bytes]], offset: int, min_decimals: int, engine: str,
+                          indent: Optional[int] = None,
+                          area_method: str = "mercator") -> Tuple[List[str], List[Dict], List[Dict]]:
+    """Fix a batch of sequence records independently of each other.
+
+    Returns the serialized records (``indent`` as for _process_feature_batch),
+    the area comparison with the line of every row, and a {"line", "message"}
+    error for every record that could not be fixed; those are left out of
+    the output. ``offset`` is the output index of the first record.
+    """
+    try:
+        items, comparison = _fix_records([raw for _, raw in records], min_decimals, engine, area_method)
+        lines = [line for line, _ in records]
+        errors: List[Dict] = []
+    except Exception:
+        # Retry record by record so one bad line does not fail its neighbours
+        items, comparison, lines, errors = [], [], [], []
+        for line, raw in records:
+            try:
+                fixed, rows = _fix_records([raw], min_decimals, engine, area_method)
+            except Exception as e:
+                errors.append({"line": line, "message": str(e)})
+                continue
+            for row in rows:
+                row["index"] = len(items)
+            items.extend(fixed)
+            comparison.extend(rows)
+            lines.append(line)
+    for row in comparison:
+        row["line"] = lines[row["index"]]
+        row["index"] += offset
+    with timed_stage("serialize"):
+        if indent is None:
+            serialized = [json_codec.dumps(item, None) for item in items]
+        else:
+            margin = " " * (2 * indent)
+            serialized = [margin + json_codec.dumps(item, indent).replace("\n", "\n" + margin) for item in items]
+    return serialized, comparison, errors
+
+def format_sequence_record(text: str, fmt: str) -> str:
+    """A compact record as it is written to a sequence of the given format."""
+    return ("\x1e" if fmt == "geojsonseq" else "") + text + "\n"
+
+def stream_processed_sequence(splitter: SequenceSplitter, source, min_decimals: int, engine: str,
+                              output_format: str) -> Iterator[bytes]:
+    """Yield fixed records of a sequence as they are read.
+
+    Records are fixed in batches of up to STREAM_BATCH_BYTES. Records that
+    cannot be fixed are left out and reported with their line number on the
+    server log. With "json" output the records are written as the features
+    of a FeatureCollection.
+    """
+    count = 0
+
+    def flush(batch: List[Tuple[int, bytes]]) -> Iterator[bytes]:
+        nonlocal count
+        serialized, _, errors = _process_record_batch(batch, count, min_decimals, engine)
+        for error in errors:
+            print(f"Skipping line {error['line']}: {error['message']}")
+        for text in serialized:
+            if output_format == "json":
+                yield (",\n" if count else "\n").encode() + text.encode()
+            else:
+                yield format_sequence_record(text, output_format).encode()
+            count += 1
+
+    if output_format == "json":
+        yield b'{"type": "FeatureCollection", "features": ['
+    batch: List[Tuple[int, bytes]] = []
+    batch_bytes = 0
+    while True:
+        chunk = source.read(STREAM_CHUNK_SIZE)
+        records = splitter.feed(chunk) if chunk else splitter.close()
+        for record in records:
+            batch.append(record)
+            batch_bytes += len(record[1])
+            if batch_bytes >= STREAM_BATCH_BYTES:
+                yield from flush(batch)
+                batch, batch_bytes = [], 0
+        if not chunk:
+            break
+    if batch:
+        yield from flush(batch)
+    if output_format == "json":
+        yield b"\n]}"
+
+def read_stream_header(source) -> Tuple[FeatureStreamSplitter, List[bytes]]:
+    """Feed a file to a splitter until its features array starts.
+
+    Returns the splitter and the features completed by the last chunk
+    read; the splitter is still in "header" mode (and closed) if the file
+    has no features array. Raises ValueError for malformed input.
+    """
+    splitter = FeatureStreamSplitter()
+    pending: List[bytes] = []
+    while splitter.mode == "header":
+        chunk = source.read(STREAM_CHUNK_SIZE)
+        if not chunk:
+            splitter.close()
+            break
+        pending = splitter.feed(chunk)
+    return splitter, pending
+
+def _process_whole_document(content: bytes, min_decimals: int, engine: str, area_method: str) -> Any:
+    """Fix a document that is not streamed, with its area comparison added if it is an object."""
+    data = json_codec.loads(content)
+    original_areas = calculate_area(data, area_method) if isinstance(data, dict) else []
+    processed_data = process_geojson(data, min_decimals, engine)
+    processed_areas = calculate_area(processed_data, area_method) if isinstance(processed_data, dict) else []
+    if isinstance(processed_data, dict):
+        processed_data["area_comparison"] = compare_areas(original_areas, processed_areas)
+    return processed_data
+
+@router.post("/process/stream")
+async def process_file_stream(
+    file: UploadFile = File(...),
+    min_decimals: int = Form(...),
+    prefix: str = Form("fixed_"),
+    engine: str = Form("vectorized"),
+    area_method: str = Form("mercator"),
+    input_format: str = Form("auto"),
+    output_format: Optional[str] = Form(None)
+):
+    """Process a single GeoJSON file incrementally and stream the result.
+
+    FeatureCollections are read from the upload feature by feature and the
+    fixed collection is sent back as a chunked response, so memory does not
+    grow with the file size. Other documents are processed in one piece.
+    Errors found after streaming has started abort the response.
+
+    GeoJSON text sequences and NDJSON are streamed record by record, as a
+    sequence or (``output_format=json``) a FeatureCollection without an
+    area comparison; records that cannot be fixed are skipped.
+    """
+    if engine not in COORDINATE_ENGINES:
+        raise HTTPException(status_code=400, detail=f"Unknown coordinate engine: {engine}")
+    if area_method not in AREA_METHODS:
+        raise HTTPException(status_code=400, detail=f"Unknown area method: {area_method}")
+    prefix = normalize_prefix(prefix)
+    headers = {"Content-Disposition": f'attachment; filename="{prefix}{file.filename}"'}
+    source = file.file
+    try:
+        head = await file.read(64)
+        await file.seek(0)
+        input_format = detect_input_format(input_format, file.filename, head)
+        output_format = resolve_output_format(output_format, input_format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if input_format in SEQUENCE_FORMATS:
+        return StreamingResponse(
+            stream_processed_sequence(SequenceSplitter(input_format), source, min_decimals, engine, output_format),
+            media_type=SEQUENCE_MEDIA_TYPES[output_format],
+            headers=headers
+        )
+    if output_format != "json":
+        raise HTTPException(status_code=400, detail="Streaming a JSON document as a sequence is not supported")
+
+    # Read until the features array starts so malformed uploads get a proper error
+    try:
+        splitter, pending = await asyncio.to_thread(read_stream_header, source)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Error processing file: {str(e)}")
+
+    if splitter.mode == "header":
+        try:
+            processed_data = await asyncio.to_thread(_process_whole_document, splitter.header, min_decimals, engine,
+                                                     area_method)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Error processing file: {str(e)}")
+        return JSONResponse(processed_data, headers=headers)
+
+    return StreamingResponse(
+        stream_processed_geojson(splitter, pending, source, min_decimals, engine, area_method),
+        media_type="application/json",
+        headers=headers
+    )
+
+# Size of the worker pool for /process; 0 processes everything inline
+PROCESS_WORKERS = int(os.environ.get("GEOJSON_PROCESS_WORKERS", os.cpu_count() or 1))
+# FeatureCollections larger than this are split into chunks of CHUNK_FEATURES features
+CHUNK_THRESHOLD_BYTES = int(os.environ.get("GEOJSON_CHUNK_THRESHOLD_BYTES", 8 * 1024 * 1024))
+CHUNK_FEATURES = int(os.environ.get("GEOJSON_CHUNK_FEATURES", 2000))
+# load_features feeds documents to the splitter in pieces of this size
+SPLIT_BLOCK_BYTES = 16 * 1024 * 1024
+
+_process_executor: Optional[ProcessPoolExecutor] = None
+
+def get_process_executor() -> Optional[ProcessPoolExecutor]:
+    """Return the shared worker pool, creating it on first use."""
+    global _process_executor
+    if _process_executor is None and PROCESS_WORKERS > 0:
+        # Workers are forked with shapely and pyproj loaded; forking while another thread
+        # imports them would copy its import lock, held, into the workers
+        warm_up()
+        _process_executor = ProcessPoolExecutor(max_workers=PROCESS_WORKERS)
+    return _process_executor
+
+@app.on_event("shutdown")
+def shutdown_process_executor():
+    global _process_executor
+    if _process_executor is not None:
+        _process_executor.shutdown(cancel_futures=True)
+        _process_executor = None
+
+def process_document(content: bytes, min_decimals: int, engine: str, area_method: str = "mercator",
+                     compact: bool = False, reuse: bool = True, precision_mode: str = "coordinates",
+                     validation: Optional[Dict[str, Any]] = None) -> Tuple[str, List[Dict], Dict[str, Any]]:
+    """Fix one uploaded document; returns the output text, area comparison and details.
+
+    Features and FeatureCollections are worked on as a FeatureStore, which
+    reuses stored per-feature results and in "topology" ``precision_mode``
+    repairs broken geometries (see fix_features); the details have its
+    "feature_reuse" and "topology". With ``validation`` (options of
+    validate_parsed) the fixed document is also validated as it is held,
+    without being written and parsed again, into "validation".
+    """
+    if precision_mode not in PRECISION_MODES:
+        raise ValueError(f"Unknown precision mode: {precision_mode}")
+    with timed_stage("parse"):
+        data = load_features(content)
+    if isinstance(data, FeatureStore):
+        area_comparison, details = fix_features(data, min_decimals, engine, area_method, reuse, precision_mode)
+    else:
+        with timed_stage("area_original"):
+            original_areas = calculate_area(data, area_method) if isinstance(data, dict) else []
+        with timed_stage("fix"):
+            data = process_geojson(data, min_decimals, engine)
+        with timed_stage("area_processed"):
+            processed_areas = calculate_area(data, area_method) if isinstance(data, dict) else []
+        area_comparison = compare_areas(original_areas, processed_areas)
+        details = {"feature_reuse": {"reused": 0, "recomputed": 0}}
+        if precision_mode == "topology":
+            details["topology"] = {"repaired": [], "flagged": []}
+    if validation is not None:
+        details["validation"] = validate_parsed(data, **validation)
+    with timed_stage("serialize"):
+        if isinstance(data, FeatureStore):
+            text = data.dumps(None if compact else 2)
+        else:
+            text = json_codec.dumps(data, None if compact else 2)
+    return text, area_comparison, details
+
+def split_feature_collection(content: bytes) -> Optional[Tuple[bytes, List[bytes], bytes]]:
+    """Split a FeatureCollection into header, raw features and trailer; None if it has no features array."""
+    with timed_stage("split"):
+        splitter = FeatureStreamSplitter()
+        features = splitter.feed(content)
+        splitter.close()
+    if splitter.mode == "header":
+        return None
+    return splitter.header, features, splitter.trailer
+
+def _join_feature_collection(header: bytes, trailer: bytes, feature_texts: List[str], indent: Optional[int] = 2) -> str:
+    """Serialize a collection from its envelope and features pre-serialized with ``indent``."""
+    return _splice_features(json_codec.loads(header + trailer), feature_texts, indent)
+
+def _splice_features(envelope: Dict, feature_texts: List[str], indent: Optional[int] = 2) -> str:
+    """Serialize ``envelope`` with ``feature_texts`` as its features; ``envelope`` is modified."""
+    if envelope.get("type") != "FeatureCollection" or not feature_texts:
+        envelope["features"] = [json_codec.loads(text) for text in feature_texts]
+        return json_codec.dumps(envelope, indent)
+    # Serialize a unique placeholder in place of the features and splice them in
+    placeholder = f"features-{uuid.uuid4().hex}"
+    envelope["features"] = placeholder
+    before, _, after = json_codec.dumps(envelope, indent).partition(f'"{placeholder}"')
+    # One join over all the pieces, so the features text is copied only once
+    separator, opening, closing = (",", "[", "]") if indent is None else (",\n", "[\n", "\n" + " " * indent + "]")
+    pieces = [before, opening]
+    for text in feature_texts:
+        pieces.append(text)
+        pieces.append(separator)
+    pieces[-1] = closing
+    pieces.append(after)
+    return "".join(pieces)
+
+def _spill_upload(content: bytes) -> str:
+    """Write a document to a temporary file for the worker processes; returns its path."""
+    fd, path = tempfile.mkstemp(prefix="geojson-upload-", suffix=".json")
+    with os.fdopen(fd, "wb") as spool:
+        spool.write(content)
+    return path
+
+def _read_upload(upload: Union[bytes, str], start: int = 0, end: Optional[int] = None) -> bytes:
+    """Bytes ``start:end`` of a document given as bytes or as the path of a spilled upload."""
+    if isinstance(upload, bytes):
+        return upload if start == 0 and end is None else upload[start:end]
+    with open(upload, "rb") as source:
+        source.seek(start)
+        return source.read(-1 if end is None else end - start)
+
+def _process_upload_document(upload: Union[bytes, str], *args) -> Tuple[str, List[Dict], Dict[str, Any]]:
+    """process_document on a document given as for _read_upload."""
+    return process_document(_read_upload(upload), *args)
+
+def _split_upload(upload: Union[bytes, str]) -> Optional[Tuple[bytes, List[Tuple[int, int]], bytes]]:
+    """Header, feature byte spans and trailer of a FeatureCollection; None if it has no features array."""
+    with timed_stage("split"):
+        splitter = FeatureStreamSplitter(spans=True)
+        splitter.feed(_read_upload(upload))
+        splitter.close()
+    if splitter.mode == "header":
+        return None
+    return splitter.header, splitter.spans, splitter.trailer
+
+def _process_upload_features(upload: Union[bytes, str], spans: List[Tuple[int, int]], *args
+                             ) -> Tuple[List[str], List[Dict], Dict[str, Any]]:
+    """_process_feature_batch on the features at ``spans`` of a document given as for _read_upload."""
+    base = spans[0][0]
+    block = _read_upload(upload, base, spans[-1][1])
+    return _process_feature_batch([block[start - base:end - base] for start, end in spans], *args)
+
+async def run_process_document(content: bytes, min_decimals: int, engine: str, area_method: str = "mercator",
+                               progress: Optional[Callable[[int, int], None]] = None,
+                               compact: bool = False, output_format: str = "json",
+                               reuse: bool = True, precision_mode: str = "coordinates",
+                               validation: Optional[Dict[str, Any]] = None) -> Tuple[str, List[Dict], Dict[str, Any]]:
+    """Run process_document off the event loop.
+
+    Small files go to a worker process whole. Large FeatureCollections are
+    split into chunks of CHUNK_FEATURES features that are fixed in parallel
+    and merged back in order. Without a pool everything runs inline.
+
+    Workers are not sent the document: it is written once to a temporary
+    file, and each worker reads its own part (the byte spans of its
+    features) from there.
+
+    With ``progress`` every FeatureCollection is chunked and
+    ``progress(done, total)`` is called as chunks finish; work then runs in
+    threads if there is no pool, so the event loop stays free.
+
+    A sequence ``output_format`` writes the features of a collection as
+    records (members of the collection other than its features are
+    dropped) and any other document as a single record.
+
+    With ``validation`` the document is fixed and validated whole by one
+    process_document call, so the validator sees the fixed features as
+    they are held.
+
+    Returns the text, area comparison and details (see process_document).
+    """
+    executor = get_process_executor()
+    sequence = output_format in SEQUENCE_FORMATS
+    options = (reuse, precision_mode, validation)
+    if executor is None and progress is None and not sequence:
+        return process_document(content, min_decimals, engine, area_method, compact, *options)
+
+    upload: Union[bytes, str] = content
+    if executor is not None:
+        with timed_stage("spill"):
+            upload = await asyncio.to_thread(_spill_upload, content)
+    try:
+        return await _run_process_upload(upload, executor, min_decimals, engine, area_method, progress, compact,
+                                         output_format, options)
+    finally:
+        if upload is not content:
+            os.unlink(upload)
+
+async def _run_process_upload(upload: Union[bytes, str], executor: Optional[ProcessPoolExecutor], min_decimals: int,
+                              engine: str, area_method: str, progress: Optional[Callable[[int, int], None]],
+                              compact: bool, output_format: str,
+                              options: Tuple[bool, str, Optional[Dict[str, Any]]]
+                              ) -> Tuple[str, List[Dict], Dict[str, Any]]:
+    """The body of run_process_document, on a document given as for _read_upload."""
+    sequence = output_format in SEQUENCE_FORMATS
+    reuse, precision_mode, validation = options
+    size = len(upload) if isinstance(upload, bytes) else os.path.getsize(upload)
+    if validation is not None or (progress is None and not sequence and size < CHUNK_THRESHOLD_BYTES):
+        result = await run_timed(executor, _process_upload_document, upload, min_decimals, engine, area_method,
+                                 compact or sequence, *options)
+        if progress:
+            progress(1, 1)
+        if sequence:
+            return (format_sequence_record(result[0], output_format),) + result[1:]
+        return result
+
+    parts = await run_timed(executor, _split_upload, upload)
+    if parts is None:
+        text, area_comparison, details = await run_timed(executor, _process_upload_document, upload, min_decimals,
+                                                         engine, area_method, compact or sequence, *options)
+        if progress:
+            progress(1, 1)
+        return (format_sequence_record(text, output_format) if sequence else text), area_comparison, details
+    header, spans, trailer = parts
+    indent = None if compact or sequence else 2
+    done = 0
+
+    async def run_chunk(start: int):
+        nonlocal done
+        chunk = spans[start:start + CHUNK_FEATURES]
+        result = await run_timed(
+            executor, _process_upload_features, upload, chunk, start, min_decimals, engine, indent, area_method,
+            reuse, precision_mode
+        )
+        done += len(chunk)
+        if progress:
+            progress(done, len(spans))
+        return result
+
+    if progress:
+        progress(0, len(spans))
+    chunks = await asyncio.gather(*[run_chunk(start) for start in range(0, len(spans), CHUNK_FEATURES)])
+    feature_texts: List[str] = []
+    area_comparison: List[Dict] = []
+    details: Dict[str, Any] = {"feature_reuse": {"reused": 0, "recomputed": 0}}
+    if precision_mode == "topology":
+        details["topology"] = {"repaired": [], "flagged": []}
+    for texts, comparison, chunk_details in chunks:
+        feature_texts.extend(texts)
+        area_comparison.extend(comparison)
+        for name, value in chunk_details["feature_reuse"].items():
+            details["feature_reuse"][name] += value
+        for name, indices in chunk_details.get("topology", {}).items():
+            details["topology"][name].extend(indices)
+    with timed_stage("join"):
+        if sequence:
+            text = await asyncio.to_thread(_join_records, feature_texts, output_format)
+        else:
+            text = await asyncio.to_thread(_join_feature_collection, header, trailer, feature_texts, indent)
+    return text, area_comparison, details
+
+async def run_process_sequence(content: bytes, input_format: str, min_decimals: int, engine: str,
+                               area_method: str = "mercator", output_format: Optional[str] = None,
+                               progress: Optional[Callable[[int, int], None]] = None,
+                               compact: bool = False) -> Tuple[str, List[Dict], List[Dict]]:
+    """Fix a GeoJSON text sequence or NDJSON document.
+
+    Records are fixed in chunks of CHUNK_FEATURES, in parallel like the
+    features of a large collection, and written as a sequence of
+    ``output_format`` (default: the input format) or, with "json", as a
+    FeatureCollection. Returns the text, the area comparison and the
+    per-line errors of records left out.
+    """
+    output_format = output_format or input_format
+    executor = get_process_executor()
+    records = split_sequence(content, input_format)
+    indent = None if compact or output_format != "json" else 2
+    done = 0
+
+    async def run_chunk(start: int):
+        nonlocal done
+        chunk = records[start:start + CHUNK_FEATURES]
+        if executor is None and progress is None:
+            result = _process_record_batch(chunk, start, min_decimals, engine, indent, area_method)
+        else:
+            result = await run_timed(executor, _process_record_batch, chunk, start, min_decimals, engine, indent,
+                                     area_method)
+        done += len(chunk)
+        if progress:
+            progress(done, len(records))
+        return result
+
+    if progress:
+        progress(0, len(records))
+    chunks = await asyncio.gather(*[run_chunk(start) for start in range(0, len(records), CHUNK_FEATURES)])
+    texts: List[str] = []
+    area_comparison: List[Dict] = []
+    errors: List[Dict] = []
+    for chunk_texts, comparison, chunk_errors in chunks:
+        # Indexes count output records, so shift them past the records dropped so far
+        for row in comparison:
+            row["index"] -= len(errors)
+        texts.extend(chunk_texts)
+        area_comparison.extend(comparison)
+        errors.extend(chunk_errors)
+    with timed_stage("join"):
+        text = await asyncio.to_thread(_join_records, texts, output_format, indent)
+    return text, area_comparison, errors
+
+def _join_records(texts: List[str], output_format: str, indent: Optional[int] = None) -> str:
+    """Write serialized records as a sequence, or as a FeatureCollection for "json"."""
+    if output_format == "json":
+        return _join_feature_collection(b'{"type": "FeatureCollection", "features": [', b"]}", texts, indent)
+    return "".join(format_sequence_record(text, output_format) for text in texts)
+
+def _document_result(data: str, area_comparison: List[Dict], details: Dict[str, Any]) -> Dict[str, Any]:
+    """Result dict of a fixed document; its reuse counts are added to the counters of feature_results."""
+    result = {"data": data, "area_comparison": area_comparison}
+    result.update(details, feature_reuse=feature_results.count(**details["feature_reuse"]))
+    return result
+
+def process_content(content: bytes, min_decimals: int, engine: str = "vectorized", area_method: str = "mercator",
+                    compact: bool = False, input_format: str = "json",
+                    output_format: Optional[str] = None, reuse: bool = True,
+                    precision_mode: str = "coordinates",
+                    validation: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Fix one document in this process, without the cache or the worker pool.
+
+    Gives the same output as process_upload and returns the same dict; for
+    callers that parallelize over files themselves, like the CLI.
+    Per-feature results are still reused unless ``reuse`` is False.
+    ``validation`` (JSON only) validates the fixed document as well.
+    """
+    output_format = output_format or input_format
+    indent = None if compact or output_format != "json" else 2
+    if validation is not None and (input_format in SEQUENCE_FORMATS or output_format in SEQUENCE_FORMATS):
+        raise ValueError("Validation of the fixed output needs JSON input and output")
+    if input_format in SEQUENCE_FORMATS:
+        texts, area_comparison, line_errors = _process_record_batch(
+            split_sequence(content, input_format), 0, min_decimals, engine, indent, area_method
+        )
+        return {"data": _join_records(texts, output_format, indent), "area_comparison": area_comparison,
+                "line_errors": line_errors}
+    if output_format in SEQUENCE_FORMATS:
+        parts = split_feature_collection(content)
+        if parts is not None:
+            texts, area_comparison, details = _process_feature_batch(parts[1], 0, min_decimals, engine, None,
+                                                                     area_method, reuse, precision_mode)
+            return _document_result(_join_records(texts, output_format), area_comparison, details)
+        text, area_comparison, details = process_document(content, min_decimals, engine, area_method, True, reuse,
+                                                          precision_mode)
+        return _document_result(format_sequence_record(text, output_format), area_comparison, details)
+    return _document_result(*process_document(content, min_decimals, engine, area_method, compact, reuse,
+                                              precision_mode, validation))
+
+def check_formats(input_format: str, output_format: Optional[str]):
+    """Reject unknown input and output formats with a 400."""
+    if input_format not in INPUT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown input format: {input_format}")
+    if output_format and output_format not in INPUT_FORMATS[1:]:
+        raise HTTPException(status_code=400, detail=f"Unknown output format: {output_format}")
+
+def check_precision_mode(precision_mode: str):
+    """Reject unknown precision modes with a 400."""
+    if precision_mode not in PRECISION_MODES:
+        raise HTTPException(status_code=400, detail=f"Unknown precision mode: {precision_mode}")
+
+def normalize_prefix(prefix: str) -> str:
+    """Default to "fixed_" and make sure the prefix ends with an underscore."""
+    if not prefix:
+        return "fixed_"
+    return prefix if prefix.endswith('_') else f"{prefix}_"
+
+async def process_upload(content: bytes, min_decimals: int, engine: str, area_method: str, no_cache: bool,
+                         progress: Optional[Callable[[int, int], None]] = None, compact: bool = False,
+                         input_format: str = "json", output_format: Optional[str] = None,
+                         precision_mode: str = "coordinates", validate: bool = False) -> Dict[str, Any]:
+    """Fix one uploaded document, going through the result cache.
+
+    Returns the output text as "data" with its "area_comparison" and, for
+    sequence input, the per-line "line_errors"; JSON input also gets
+    "feature_reuse", the features whose stored results were reused and
+    the features fixed. ``no_cache`` recomputes every feature too.
+
+    The "topology" ``precision_mode`` adds "topology", the features whose
+    geometry was repaired or flagged. ``validate`` adds "validation", the
+    validation of the fixed document (JSON input and output only).
+    """
+    output_format = output_format or input_format
+    if validate and (input_format in SEQUENCE_FORMATS or output_format in SEQUENCE_FORMATS):
+        raise ValueError("Validation of the fixed output needs JSON input and output")
+    # Hashing the upload and reading the disk tier happen in a thread, off the event loop
+    with timed_stage("cache"):
+        cache_key = await asyncio.to_thread(
+            result_cache.make_key, content, endpoint="process", min_decimals=min_decimals, engine=engine,
+            area_method=area_method, compact=compact, json_backend=json_codec.name, input_format=input_format,
+            output_format=output_format, precision_mode=precision_mode, validate=validate
+        )
+        cached = None if no_cache else await asyncio.to_thread(cached_result, cache_key)
+    if cached is not None:
+        if progress:
+            progress(1, 1)
+        return cached
+    if input_format in SEQUENCE_FORMATS:
+        data, area_comparison, line_errors = await run_process_sequence(
+            content, input_format, min_decimals, engine, area_method, output_format, progress, compact
+        )
+        result = {"data": data, "area_comparison": area_comparison, "line_errors": line_errors}
+    else:
+        result = _document_result(*await run_process_document(
+            content, min_decimals, engine, area_method, progress, compact, output_format, not no_cache,
+            precision_mode, {"reuse": not no_cache} if validate else None
+        ))
+    with timed_stage("cache"):
+        await asyncio.to_thread(result_cache.set, cache_key, result)
+    return result
+
 @router.post("/process")
 async def process_files(
     files: List[UploadFile] = File(...),
     min_decimals: int = Form(...),
-    prefix: str = Form(...)
+    prefix: str = Form(...),
+    engine: str = Form("vectorized"),
+    area_method: str = Form("mercator"),
+    no_cache: bool = Form(False),
+    compact: bool = Form(False),
+    input_format: str = Form("auto"),
+    output_format: Optional[str] = Form(None),
+    precision_mode: str = Form("coordinates"),
+    validate: bool = Form(False)
 ):
-    """Process uploaded GeoJSON files."""
+    """Process uploaded GeoJSON files.
+
+    Output is indented unless ``compact`` is set. Successful results are
+    cached by content and parameters; ``no_cache`` skips the lookup and
+    refreshes the cached entries.
+
+    ``input_format`` is "json", "geojsonseq" (RFC 8142), "ndjson" or
+    "auto", which goes by a leading RS byte and the file extension. Output
+    is in the input format unless ``output_format`` is given. Records of a
+    sequence that cannot be fixed are left out and listed in "line_errors".
+
+    ``precision_mode`` "topology" repairs geometries that fixing made
+    invalid; ``validate`` also validates the fixed output of JSON files.
+    """
+    check_formats(input_format, output_format)
+    check_precision_mode(precision_mode)
     results = {}
+    prefix = normalize_prefix(prefix)
     
-    # Ensure prefix ends with underscore
-    if not prefix:
-        prefix = "fixed_"
-    elif not prefix.endswith('_'):
-        prefix = f"{prefix}_"
-    
-    for file in files:
+    async def process_file(file: UploadFile) -> Dict[str, Any]:
         try:
-            content = await file.read()
-            content_str = content.decode()
-            
-            # Parse original JSON
-            original_data = json.loads(content_str)
-            
-            # Calculate original areas
-            original_areas = calculate_area(original_data) if isinstance(original_data, dict) else []
-            
-            # Process GeoJSON
-            processed_data = process_geojson(original_data, min_decimals)
-            
-            # Calculate areas after processing
-            processed_areas = calculate_area(processed_data) if isinstance(processed_data, dict) else []
-            
-            # Create area comparison data
-            area_comparison = []
-            for orig, proc in zip(original_areas, processed_areas):
-                if orig["area"] is not None and proc["area"] is not None:
-                    area_comparison.append({
-                        "index": orig["index"],
-                        "original_area": orig["area"],
-                        "processed_area": proc["area"],
-                        "difference": proc["area"] - orig["area"],
-                        "difference_percentage": ((proc["area"] - orig["area"]) / orig["area"]) * 100 if orig["area"] != 0 else 0
-                    })
-            
-            results[file.filename] = {
+            with timed_stage("read"):
+                content = await file.read()
+            record_size("bytes", len(content))
+            file_format = detect_input_format(input_format, file.filename, content[:64])
+            result = await process_upload(content, min_decimals, engine, area_method, no_cache, compact=compact,
+                                          input_format=file_format, output_format=output_format,
+                                          precision_mode=precision_mode, validate=validate)
+            return {
                 "success": True,
                 "message": "Successfully processed file",
                 "filename": f"{prefix}{file.filename}",
-                "data": json.dumps(processed_data, indent=2),
-                "area_comparison": area_comparison
+                "format": output_format or file_format,
+                **result
             }
-            
         except Exception as e:
-            results[file.filename] = {
+            return {
                 "success": False,
                 "message": f"Error processing file: {str(e)}"
             }
+
+    # Files are processed concurrently and collected in upload order
+    for file, result in zip(files, await asyncio.gather(*[process_file(file) for file in files])):
+        results[file.filename] = result
     
     return results
 
-@router.get("/download/{file_path:path}")
-async def download_file(file_path: str):
-    """Download a processed file."""
+# Background jobs: uploads are stored under JOB_DIR and handled by JOB_WORKERS tasks.
+# At most JOB_QUEUE_SIZE jobs wait to start; finished jobs are removed after JOB_TTL_SECONDS.
+JOB_DIR = Path(os.environ.get("GEOJSON_JOB_DIR") or Path(tempfile.gettempdir()) / "geojson-jobs")
+JOB_WORKERS = int(os.environ.get("GEOJSON_JOB_WORKERS", 2))
+JOB_QUEUE_SIZE = int(os.environ.get("GEOJSON_JOB_QUEUE_SIZE", 16))
+JOB_TTL_SECONDS = float(os.environ.get("GEOJSON_JOB_TTL_SECONDS", 3600))
+
+class JobStore:
+    """Files of background jobs, one directory per job.
+
+    Uploads are kept as input/<n> and fixed files as output/<n> (n is the
+    upload's position), next to result.json with the job's response.
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+
+    def path(self, job_id: str) -> Path:
+        return self.directory / job_id
+
+    def write_input(self, job_id: str, index: int, content: bytes):
+        path = self.path(job_id) / "input" / str(index)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+
+    def input_path(self, job_id: str, index: int) -> Path:
+        return self.path(job_id) / "input" / str(index)
+
+    def read_input(self, job_id: str, index: int) -> bytes:
+        return self.input_path(job_id, index).read_bytes()
+
+    def output_path(self, job_id: str, index: int) -> Path:
+        return self.path(job_id) / "output" / str(index)
+
+    def write_output(self, job_id: str, index: int, text: str):
+        path = self.output_path(job_id, index)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+
+    def write_result(self, job_id: str, result: Any):
+        (self.path(job_id) / "result.json").write_text(json.dumps(result))
+
+    def read_result(self, job_id: str) -> Any:
+        return json.loads((self.path(job_id) / "result.json").read_text())
+
+    def delete(self, job_id: str):
+        shutil.rmtree(self.path(job_id), ignore_errors=True)
+
+class Job:
+    """Status of one submitted job and the progress of each of its files."""
+
+    def __init__(self, kind: str, filenames: List[str], params: Dict[str, Any]):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params
+        self.status = "queued"
+        self.error: Optional[str] = None
+        self.created = time.time()
+        self.finished: Optional[float] = None
+        self.files = [
+            {"filename": name, "status": "queued", "features_done": 0, "features_total": None, "error": None}
+            for name in filenames
+        ]
+
+    def progress(self, index: int) -> Callable[[int, int], None]:
+        """Progress callback for the file at ``index``."""
+        def update(done: int, total: int):
+            self.files[index]["features_done"] = done
+            self.files[index]["features_total"] = total
+        return update
+
+    def expired(self, now: float) -> bool:
+        return self.finished is not None and now - self.finished > JOB_TTL_SECONDS
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "error": self.error,
+            "created": self.created,
+            "finished": self.finished,
+            "expires": self.finished + JOB_TTL_SECONDS if self.finished is not None else None,
+            "files": self.files,
+            "result_url": f"/jobs/{self.id}/result" if self.status == "done" else None
+        }
+
+class JobManager:
+    """Bounded queue of jobs worked off by background tasks on the event loop.
+
+    The heavy lifting still happens in the process pool (or threads), the
+    tasks only schedule it and record progress, so status requests are
+    answered while jobs run.
+    """
+
+    def __init__(self, store: JobStore, workers: int, queue_size: int):
+        self.store = store
+        self.workers = workers
+        self.queue_size = queue_size
+        self.jobs: Dict[str, Job] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def _start(self):
+        """Start the worker and cleanup tasks on the running loop, once."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [loop.create_task(self._work()) for _ in range(max(self.workers, 1))]
+        self._tasks.append(loop.create_task(self._clean_up_periodically()))
+
+    def submit(self, kind: str, uploads: List[Tuple[str, bytes]], params: Dict[str, Any]) -> Job:
+        """Store the uploads and queue the job; raises asyncio.QueueFull when the queue is full."""
+        self._start()
+        if self._queue.full():
+            raise asyncio.QueueFull
+        job = Job(kind, [filename for filename, _ in uploads], params)
+        for index, (_, content) in enumerate(uploads):
+            self.store.write_input(job.id, index, content)
+        self.jobs[job.id] = job
+        self._queue.put_nowait(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        job = self.jobs.get(job_id)
+        if job is None or job.expired(time.time()):
+            return None
+        return job
+
+    async def _work(self):
+        while True:
+            job = await self._queue.get()
+            job.status = "running"
+            timer = start_timer(f"/jobs/{job.kind}")
+            try:
+                if job.kind == "process":
+                    result = await self._run_process(job)
+                else:
+                    result = await self._run_validate(job)
+                self.store.write_result(job.id, result)
+                job.status = "done"
+            except Exception as e:
+                print(f"Job {job.id} failed: {str(e)}")
+                job.status = "failed"
+                job.error = str(e)
+            timer.finish()
+            current_timer.set(None)
+            job.finished = time.time()
+            self._queue.task_done()
+
+    async def _run_process(self, job: Job) -> Dict[str, Any]:
+        params = job.params
+
+        async def process_file(index: int) -> Dict[str, Any]:
+            entry = job.files[index]
+            entry["status"] = "running"
+            try:
+                content = self.store.read_input(job.id, index)
+                record_size("bytes", len(content))
+                input_format = detect_input_format(params["input_format"], entry["filename"], content[:64])
+                entry["format"] = params["output_format"] or input_format
+                result = await process_upload(
+                    content, params["min_decimals"], params["engine"], params["area_method"],
+                    params["no_cache"], job.progress(index), params["compact"], input_format, params["output_format"],
+                    params.get("precision_mode", "coordinates"), params.get("validate", False)
+                )
+                self.store.write_output(job.id, index, result["data"])
+                entry["status"] = "done"
+                outcome = {
+                    "success": True,
+                    "message": "Successfully processed file",
+                    "filename": f"{params['prefix']}{entry['filename']}",
+                    "format": entry["format"],
+                    "download_url": f"/download/{job.id}/{index}",
+                    "area_comparison": result["area_comparison"]
+                }
+                for name in ("line_errors", "topology", "validation"):
+                    if name in result:
+                        outcome[name] = result[name]
+                return outcome
+            except Exception as e:
+                entry["status"] = "failed"
+                entry["error"] = str(e)
+                return {
+                    "success": False,
+                    "message": f"Error processing file: {str(e)}"
+                }
+
+        outcomes = await asyncio.gather(*[process_file(index) for index in range(len(job.files))])
+        return {entry["filename"]: outcome for entry, outcome in zip(job.files, outcomes)}
+
+    async def _run_validate(self, job: Job) -> Dict[str, Any]:
+        params = job.params
+        entry = job.files[0]
+        entry["status"] = "running"
+        path = self.store.input_path(job.id, 0)
+        size = path.stat().st_size
+        record_size("bytes", size)
+        with open(path, "rb") as source:
+            input_format = detect_input_format(params["input_format"], entry["filename"], source.read(64))
+            mapped = size >= MMAP_THRESHOLD_BYTES and input_format == "json"
+            content = map_file(source) if mapped else path.read_bytes()
+        try:
+            mode_options = {key: params[key] for key in ("mode", "sample_size", "seed", "limit", "overlap_min_area")}
+            cache_key = result_cache.make_key(content, endpoint="validate", engine=params["engine"],
+                                              rules=params["rules"], skip_rules=params["skip_rules"],
+                                              json_backend=json_codec.name, input_format=input_format,
+                                              **mode_options)
+            result = None if params["no_cache"] else cached_result(cache_key)
+            if result is not None:
+                job.progress(0)(1, 1)
+            else:
+                # A thread rather than the process pool, so progress callbacks reach the job
+                result = await asyncio.to_thread(
+                    validate_content, content, params["engine"], params["rules"], params["skip_rules"],
+                    job.progress(0), input_format, **mode_options, reuse=not params["no_cache"]
+                )
+                result_cache.set(cache_key, result)
+        finally:
+            if mapped:
+                content.close()
+        entry["status"] = "done"
+        return result
+
+    def clean_up(self):
+        """Forget expired jobs and delete their files."""
+        now = time.time()
+        for job_id in [job_id for job_id, job in self.jobs.items() if job.expired(now)]:
+            del self.jobs[job_id]
+            self.store.delete(job_id)
+
+    async def _clean_up_periodically(self):
+        while True:
+            await asyncio.sleep(min(JOB_TTL_SECONDS, 60))
+            self.clean_up()
+
+    def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        self._loop = None
+
+job_manager = JobManager(JobStore(JOB_DIR), JOB_WORKERS, JOB_QUEUE_SIZE)
+
+@app.on_event("shutdown")
+def stop_job_manager():
+    job_manager.stop()
+
+def _queue_full() -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail="Too many jobs waiting, try again later",
+        headers={"Retry-After": "5"}
+    )
+
+@router.post("/jobs/process", status_code=202)
+async def submit_process_job(
+    files: List[UploadFile] = File(...),
+    min_decimals: int = Form(...),
+    prefix: str = Form(...),
+    engine: str = Form("vectorized"),
+    area_method: str = Form("mercator"),
+    no_cache: bool = Form(False),
+    compact: bool = Form(False),
+    input_format: str = Form("auto"),
+    output_format: Optional[str] = Form(None),
+    precision_mode: str = Form("coordinates"),
+    validate: bool = Form(False)
+):
+    """Queue uploaded GeoJSON files for processing and return the job status.
+
+    Takes the same parameters as /process. Poll /jobs/{job_id} for progress;
+    the result has the /process response shape with a download_url per file
+    instead of the data.
+    """
+    if engine not in COORDINATE_ENGINES:
+        raise HTTPException(status_code=400, detail=f"Unknown coordinate engine: {engine}")
+    if area_method not in AREA_METHODS:
+        raise HTTPException(status_code=400, detail=f"Unknown area method: {area_method}")
+    check_formats(input_format, output_format)
+    check_precision_mode(precision_mode)
+    uploads = [(file.filename, await file.read()) for file in files]
+    params = {
+        "min_decimals": min_decimals,
+        "prefix": normalize_prefix(prefix),
+        "engine": engine,
+        "area_method": area_method,
+        "no_cache": no_cache,
+        "compact": compact,
+        "input_format": input_format,
+        "output_format": output_format,
+        "precision_mode": precision_mode,
+        "validate": validate
+    }
     try:
-        return FileResponse(
-            file_path,
-            media_type='application/json',
-            filename=os.path.basename(file_path)
-        )
-    except Exception as e:
-        raise HTTPException(status_code=404, detail=f"File not found: {str(e)}")
+        job = job_manager.submit("process", uploads, params)
+    except asyncio.QueueFull:
+        raise _queue_full()
+    return job.to_dict()
+
+@router.post("/jobs/validate", status_code=202)
+async def submit_validate_job(
+    file: UploadFile = File(...),
+    no_cache: bool = Form(False),
+    engine: str = Form("vectorized"),
+    rules: Optional[str] = Form(None),
+    skip_rules: Optional[str] = Form(None),
+    input_format: str = Form("auto"),
+    mode: str = Form("full"),
+    sample_size: int = Form(1000),
+    seed: int = Form(0),
+    limit: int = Form(100),
+    overlap_min_area: float = Form(1.0)
+):
+    """Queue a JSON/GeoJSON file for validation and return the job status.
+
+    Takes the same parameters as /validate; the result is the /validate response.
+    """
+    if engine not in VALIDATION_ENGINES:
+        raise HTTPException(status_code=400, detail=f"Unknown validation engine: {engine}")
+    if input_format not in INPUT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown input format: {input_format}")
+    check_validation_mode(mode, sample_size, limit)
+    rules = parse_rule_names(rules)
+    skip_rules = parse_rule_names(skip_rules)
+    try:
+        validator.select_rules(rules, skip_rules)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    params = {"engine": engine, "rules": rules, "skip_rules": skip_rules, "no_cache": no_cache,
+              "input_format": input_format, "mode": mode, "sample_size": sample_size, "seed": seed, "limit": limit,
+              "overlap_min_area": overlap_min_area}
+    try:
+        job = job_manager.submit("validate", [(file.filename, await file.read())], params)
+    except asyncio.QueueFull:
+        raise _queue_full()
+    return job.to_dict()
+
+def _get_job(job_id: str) -> Job:
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Status of a job with per-file and per-feature progress."""
+    return _get_job(job_id).to_dict()
+
+@router.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    """Response of a finished job; 409 while it is still queued or running."""
+    job = _get_job(job_id)
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail=job.error)
+    if job.status != "done":
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    return JSONResponse(job_manager.store.read_result(job.id))
+
+@router.get("/download/{job_id}/{index}")
+async def download_file(job_id: str, index: int):
+    """Download a file fixed by a process job."""
+    job = _get_job(job_id)
+    path = job_manager.store.output_path(job.id, index)
+    if job.kind != "process" or not 0 <= index < len(job.files) or not path.exists():
+        raise HTTPException(status_code=404, detail="File not found")
+    return FileResponse(
+        path,
+        media_type=SEQUENCE_MEDIA_TYPES[job.files[index].get("format", "json")],
+        filename=f"{job.params['prefix']}{job.files[index]['filename']}"
+    )
 
 # Mount static files and router
-app.mount("/static", StaticFiles(directory="static"), name="static")
+STATIC_DIR = Path(__file__).resolve().parent / "static"
+app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 app.include_router(router)
 
+@lru_cache(maxsize=None)
+def load_index_page() -> Tuple[bytes, bytes, str]:
+    """index.html as read once per process: the bytes, gzip-compressed bytes and ETag.
+
+    The ETag is weak as it stands for both encodings.
+    """
+    content = (STATIC_DIR / "index.html").read_bytes()
+    return content, gzip.compress(content, mtime=0), f'W/"{hashlib.sha256(content).hexdigest()[:32]}"'
+
 @app.get("/")
-async def root():
-    """Serve the main HTML page."""
-    with open("static/index.html") as f:
-        content = f.read()
-    return HTMLResponse(content=content)
+async def root(request: Request):
+    """Serve the main HTML page from memory; 304 if the client's copy is current."""
+    content, compressed, etag = load_index_page()
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        content = compressed
+    return HTMLResponse(content=content, headers=headers)
+
+# Set GEOJSON_WARM_UP=0 to load shapely and pyproj only when a request needs them
+WARM_UP = os.environ.get("GEOJSON_WARM_UP", "1").lower() not in ("0", "false", "no")
+
+def warm_up():
+    """Load what the first requests would otherwise wait for: shapely, pyproj, their state and index.html."""
+    try:
+        shapely.area(shapely.geometry.shape({"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 0]]]}))
+        get_web_mercator_transformer().transform(0.0, 0.0)
+        get_geod()
+        load_index_page()
+    except Exception as e:
+        print(f"Error warming up: {str(e)}")
+
+@app.on_event("startup")
+async def start_warm_up():
+    if WARM_UP:
+        # Not awaited: the server accepts requests while this runs in a thread
+        asyncio.get_event_loop().run_in_executor(None, warm_up)
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,67 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+# Run inline and without state shared between test runs
+os.environ["GEOJSON_PROCESS_WORKERS"] = "0"
+os.environ["GEOJSON_WARM_UP"] = "0"
+os.environ.pop("GEOJSON_FEATURE_STORE", None)
+os.environ.pop("GEOJSON_CACHE_DIR", None)
+os.environ["GEOJSON_JOB_DIR"] = tempfile.mkdtemp(prefix="geojson-jobs-test-")
+
+import main  # noqa: E402
+from corpus import make_feature_collection  # noqa: E402
+
+# Features the fast paths handle specially or not at all
+EDGE_FEATURES = [
+    {"type": "Feature", "properties": {"p": [1, 2]},
+     "geometry": {"type": "LineString", "coordinates": [[1.5, 2], [3, 4.25]], "bbox": [1, 2]}},
+    {"type": "Feature", "geometry": {"type": "MultiPoint", "coordinates": [[1, 2], [3, 4]]}},
+    {"type": "Feature", "geometry": {"type": "MultiLineString", "coordinates": [[[1, 2], [3, 4]], [[5, 6, 7], [8, 9, 1]]]}},
+    {"type": "Feature", "geometry": {"type": "MultiPolygon", "coordinates": [
+        [[[0, 0], [1, 0], [1, 1], [0, 0]], [[0.1, 0.1], [0.2, 0.1], [0.2, 0.2], [0.1, 0.1]]],
+        [[[5, 5, 1], [6, 5, 1], [6, 6, 1], [5, 5, 1]]]]}},
+    {"type": "Feature", "geometry": {"type": "Point", "coordinates": [1e-05, 1e16]}},
+    {"type": "Feature", "geometry": {"type": "Point", "coordinates": [1, True]}},
+    {"type": "Feature", "geometry": {"type": "GeometryCollection",
+                                     "geometries": [{"type": "Point", "coordinates": [1.5, 2.5]}]}},
+    {"type": "Feature", "geometry": {"type": "Point", "coordinates": []}},
+    {"type": "Feature", "geometry": None},
+    {"type": "Feature", "properties": {"név": "ü"},
+     "geometry": {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 0]]]}},
+    {"type": "Feature", "geometry": {"type": "Polygon", "coordinates": [[[0, 0], [1, 1], [1, 0], [0, 1], [0, 0]]]}},
+]
+
+
+@pytest.fixture(params=["stdlib", "orjson", "exact"])
+def json_backend(request, monkeypatch):
+    """Run a test with each JSON backend installed as main.json_codec."""
+    if request.param == "orjson" and main.orjson is None:
+        pytest.skip("orjson is not installed")
+    monkeypatch.setattr(main, "json_codec", main.get_json_codec(request.param))
+    return request.param
+
+
+@pytest.fixture
+def collection():
+    """A seeded FeatureCollection with holes, 3D positions and the edge cases above."""
+    data = make_feature_collection(60, 12, holes=1, seed=1)
+    data["features"] += make_feature_collection(20, 8, dims=3, seed=2)["features"]
+    data["features"] += [dict(feature) for feature in EDGE_FEATURES]
+    data["name"] = "test"
+    return data
+
+
+@pytest.fixture
+def feature_store(tmp_path, monkeypatch):
+    """A per-feature result store in a temporary file, installed as main.feature_results."""
+    store = main.FeatureResultStore(str(tmp_path / "features.sqlite3"), max_entries=100_000)
+    monkeypatch.setattr(main, "feature_results", store)
+    return store
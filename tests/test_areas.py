@@ -0,0 +1,26 @@
+import json
+
+import shapely.geometry
+
+import main
+
+
+def test_geodesic_areas_match_the_geometry_by_geometry_areas(collection):
+    geod = main.get_geod()
+    expected = [
+        {"index": index, "area": round(abs(geod.geometry_area_perimeter(shapely.geometry.shape(geometry))[0]), 2)}
+        for index, geometry in enumerate(feature["geometry"] for feature in collection["features"])
+        if (geometry or {}).get("type") in ("Polygon", "MultiPolygon")
+    ]
+    assert main.calculate_area(collection, "geodesic") == expected
+    store = main.load_features(json.dumps(collection).encode())
+    assert main.calculate_area(store, "geodesic") == expected
+
+
+def test_geodesic_area_is_smaller_than_web_mercator_away_from_the_equator():
+    square = {"type": "Feature", "properties": {}, "geometry": {
+        "type": "Polygon", "coordinates": [[[10, 60], [11, 60], [11, 61], [10, 61], [10, 60]]]}}
+    geodesic, = main.calculate_area(square, "geodesic")
+    mercator, = main.calculate_area(square)
+    assert 5e9 < geodesic["area"] < 7e9
+    assert mercator["area"] > 3 * geodesic["area"]
@@ -0,0 +1,98 @@
+import json
+import os
+from pathlib import Path
+
+import cli
+from corpus import make_feature_collection
+
+
+def write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data))
+    return path
+
+
+def run(tmp_path, *args):
+    """Run the CLI inline; returns the exit code and the report's outcomes by input path."""
+    report = tmp_path / "report.json"
+    code = cli.run([*args, "--workers", "0", "--manifest", str(tmp_path / "manifest.json"),
+                    "--report", str(report)])
+    return code, {outcome["path"]: outcome for outcome in json.loads(report.read_text())["files"]}
+
+
+def count_tasks(monkeypatch):
+    """Record the inputs handed to run_task, which the manifest skip bypasses."""
+    seen = []
+
+    def spy(task):
+        seen.append(task["path"])
+        return run_task(task)
+
+    run_task = cli.run_task
+    monkeypatch.setattr(cli, "run_task", spy)
+    return seen
+
+
+def test_unchanged_files_are_skipped(tmp_path, monkeypatch):
+    data = tmp_path / "data"
+    first = write(data / "a.geojson", make_feature_collection(5, 6, seed=1))
+    second = write(data / "b.geojson", make_feature_collection(5, 6, seed=2))
+    code, outcomes = run(tmp_path, "fix", str(data))
+    assert code == 0 and {outcome["status"] for outcome in outcomes.values()} == {"done"}
+
+    seen = count_tasks(monkeypatch)
+    write(second, make_feature_collection(5, 6, seed=3))
+    code, outcomes = run(tmp_path, "fix", str(data))
+    assert seen == [str(second.resolve())]
+    assert outcomes[str(first.resolve())]["status"] == "unchanged"
+    assert outcomes[str(second.resolve())]["status"] == "done"
+
+
+def test_touched_file_with_the_same_content_is_unchanged(tmp_path, monkeypatch):
+    file = write(tmp_path / "data" / "a.geojson", make_feature_collection(5, 6, seed=1))
+    run(tmp_path, "validate", str(file))
+    stat = file.stat()
+    os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+
+    seen = count_tasks(monkeypatch)
+    code, outcomes = run(tmp_path, "validate", str(file))
+    # Hashed again because of the new mtime, then recorded under it
+    assert seen == [str(file.resolve())]
+    assert code == 0 and outcomes[str(file.resolve())]["status"] == "unchanged"
+    manifest = json.loads((tmp_path / "manifest.json").read_text())["files"]
+    assert manifest[str(file.resolve())]["mtime_ns"] == file.stat().st_mtime_ns
+
+    seen.clear()
+    run(tmp_path, "validate", str(file))
+    assert seen == []
+
+
+def test_output_dir_mirrors_the_input_tree(tmp_path):
+    data = tmp_path / "data"
+    for name in ("a.geojson", "x/b.geojson", "x/y/c.geojson"):
+        write(data / name, make_feature_collection(3, 5, seed=len(name)))
+    code, outcomes = run(tmp_path, "fix", str(data), "--output-dir", str(tmp_path / "out"), "--prefix", "clean")
+    assert code == 0
+    written = sorted(path.relative_to(tmp_path / "out").as_posix() for path in (tmp_path / "out").rglob("*.geojson"))
+    assert written == ["clean_a.geojson", "x/clean_b.geojson", "x/y/clean_c.geojson"]
+    assert not list(data.rglob("clean_*"))
+    for outcome in outcomes.values():
+        assert Path(outcome["output"]).is_file()
+
+
+def test_exit_code_is_one_for_failed_or_invalid_files(tmp_path):
+    good = write(tmp_path / "good.geojson", make_feature_collection(3, 5, seed=1))
+    assert run(tmp_path, "validate", str(good))[0] == 0
+
+    broken = tmp_path / "broken.geojson"
+    broken.write_text('{"type": "FeatureCollection", "features": [')
+    code, outcomes = run(tmp_path, "validate", str(good), str(broken))
+    assert code == 1 and not outcomes[str(broken.resolve())]["validation"]["valid"]
+
+    bowtie = {"type": "FeatureCollection", "features": [{"type": "Feature", "properties": {}, "geometry": {
+        "type": "Polygon", "coordinates": [[[0, 0], [1, 1], [1, 0], [0, 1], [0, 0]]]}}]}
+    invalid = write(tmp_path / "bowtie.geojson", bowtie)
+    assert run(tmp_path, "validate", str(invalid))[0] == 1
+
+    code, outcomes = run(tmp_path, "fix", str(broken), "--output-dir", str(tmp_path / "out"))
+    assert code == 1 and outcomes[str(broken.resolve())]["status"] == "failed"
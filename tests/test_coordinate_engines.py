@@ -0,0 +1,30 @@
+import copy
+import json
+
+import pytest
+
+import main
+
+
+@pytest.mark.parametrize("min_decimals", [0, 3, 6, 9])
+def test_engines_fix_coordinates_identically(collection, json_backend, min_decimals):
+    content = json.dumps(collection).encode()
+    vectorized = main.process_geojson(main.json_codec.loads(content), min_decimals, "vectorized")
+    scalar = main.process_geojson(main.json_codec.loads(content), min_decimals, "scalar")
+    assert main.json_codec.dumps(vectorized) == main.json_codec.dumps(scalar)
+
+
+@pytest.mark.parametrize("values", [
+    [0.1, 1.5, -2.25, 10.0, 123456.789],
+    [1e-05, 1.5e-07, 1e16, 0.0, -0.0],
+    [179.99999999, -89.123456789012, 3.14159265358979],
+])
+def test_fix_coordinate_array_matches_fix_coordinates(values):
+    for min_decimals in range(0, 11):
+        expected = main.fix_coordinates(copy.deepcopy(values), min_decimals)
+        assert main.fix_coordinate_array(main.np.array(values), min_decimals).tolist() == expected
+
+
+def test_unknown_engine_is_rejected(collection):
+    with pytest.raises(ValueError):
+        main.process_geojson(collection, 6, "simd")
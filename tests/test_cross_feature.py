@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+import shapely
+
+import main
+
+CROSS_RULES = ["overlapping_features", "duplicate_geometry"]
+
+
+def square(x, y, size=0.01):
+    return {"type": "Polygon", "coordinates": [[[x, y], [x + size, y], [x + size, y + size], [x, y + size], [x, y]]]}
+
+
+def collection(*geometries):
+    return {"type": "FeatureCollection", "features": [
+        {"type": "Feature", "properties": {}, "geometry": geometry} for geometry in geometries
+    ]}
+
+
+def validate(data, engine="vectorized", **options):
+    return main.validator.validate_geometry(data, engine, rules=CROSS_RULES, **options)
+
+
+def test_cross_feature_rules_are_opt_in():
+    data = collection(square(0, 0), square(0.005, 0), square(0, 0))
+    result = main.validator.validate_geometry(data)
+    assert result["cross_feature"] == {}
+    assert set(CROSS_RULES) <= set(result["skipped_validation"])
+    assert "overlapping_features" in validate(data)["cross_feature"]
+
+
+@pytest.mark.parametrize("engine", main.VALIDATION_ENGINES)
+def test_overlapping_pairs_are_reported_with_their_area(engine):
+    data = collection(square(0, 0), square(0.005, 0), square(1, 1),
+                      {"type": "MultiPolygon", "coordinates": [square(1.005, 1.005)["coordinates"]]})
+    findings = validate(data, engine)["cross_feature"]["overlapping_features"]
+    assert [finding["features"] for finding in findings] == [[0, 1], [2, 3]]
+    overlap = shapely.box(0.005, 0, 0.01, 0.01)
+    assert findings[0]["area"] == round(abs(main.get_geod().geometry_area_perimeter(overlap)[0]), 2)
+    assert 6e5 < findings[0]["area"] < 6.3e5
+
+
+def test_touching_features_do_not_overlap():
+    data = collection(square(0, 0), square(0.01, 0), square(0, 0.01), square(0.01, 0.01))
+    result = validate(data)
+    assert "overlapping_features" not in result["cross_feature"]
+    assert "overlapping_features" not in result["problematic"]
+
+
+def test_overlaps_below_the_minimum_area_are_dropped():
+    # About 11 m wide and 1.1 km long: roughly 12,000 m²
+    data = collection(square(0, 0), square(0.0099, 0))
+    assert validate(data, overlap_min_area=1)["cross_feature"]["overlapping_features"][0]["features"] == [0, 1]
+    assert "overlapping_features" not in validate(data, overlap_min_area=1e5)["cross_feature"]
+
+
+def test_duplicates_are_grouped_up_to_rounding_and_ring_order():
+    reversed_start = {"type": "Polygon", "coordinates": [[[0.01, 0.01], [0.01, 0], [0, 0], [0, 0.01], [0.01, 0.01]]]}
+    near = square(0, 0)
+    near["coordinates"][0][1][0] += 1e-9
+    point = {"type": "Point", "coordinates": [5, 5]}
+    data = collection(square(0, 0), reversed_start, square(3, 3), point, dict(point), near)
+    findings = validate(data)["cross_feature"]["duplicate_geometry"]
+    assert findings == [{"features": [0, 1, 5], "exact": False}, {"features": [3, 4], "exact": True}]
+    assert validate(collection(square(0, 0), reversed_start))["cross_feature"]["duplicate_geometry"] == \
+        [{"features": [0, 1], "exact": True}]
+
+
+def test_bulk_areas_match_the_geometry_by_geometry_areas():
+    geoms = np.array([shapely.from_wkt(text) for text in [
+        "POLYGON ((0 0, 1 0, 1 1, 0 0), (0.2 0.1, 0.3 0.1, 0.3 0.2, 0.2 0.1))",
+        "MULTIPOLYGON (((10 10, 11 10, 11 12, 10 10)), ((20 20, 20 21, 21 21, 20 20)))",
+        "GEOMETRYCOLLECTION (POLYGON ((0 0, 1 0, 1 1, 0 0)), POINT (5 5))",
+        "POLYGON EMPTY",
+    ]])
+    geod = main.get_geod()
+    expected = [abs(geod.geometry_area_perimeter(geom)[0]) for geom in geoms]
+    assert main._geodesic_areas(geoms).tolist() == expected
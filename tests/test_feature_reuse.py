@@ -0,0 +1,58 @@
+import copy
+import json
+
+from fastapi.testclient import TestClient
+
+import main
+
+
+def test_feature_store_is_off_without_a_path():
+    # conftest leaves GEOJSON_FEATURE_STORE unset
+    assert not main.feature_results.enabled
+
+
+def test_reused_results_match_a_fresh_run(collection, feature_store, json_backend):
+    content = json.dumps(collection).encode()
+    first = main.process_document(content, 6, "vectorized")
+    second = main.process_document(content, 6, "vectorized")
+    fresh = main.process_document(content, 6, "vectorized", reuse=False)
+    assert first[:2] == second[:2] == fresh[:2]
+    assert first[2]["feature_reuse"]["reused"] == 0
+    assert second[2]["feature_reuse"]["recomputed"] < first[2]["feature_reuse"]["recomputed"]
+
+    changed = copy.deepcopy(collection)
+    changed["features"][3]["geometry"]["coordinates"][0][1][0] += 0.5
+    content = json.dumps(changed).encode()
+    result = main.process_document(content, 6, "vectorized")
+    assert result[:2] == main.process_document(content, 6, "vectorized", reuse=False)[:2]
+    assert result[2]["feature_reuse"]["recomputed"] == second[2]["feature_reuse"]["recomputed"] + 1
+
+
+def test_reused_issues_match_a_fresh_validation(collection, feature_store):
+    content = json.dumps(collection).encode()
+    for mode in ("full", "sample", "fail_fast"):
+        options = {"mode": mode, "sample_size": 30}
+        expected = main.validator.validate_geometry(main.load_features(content), "vectorized", **options)
+        for _ in range(2):
+            result = main.validator.validate_geometry(main.load_features(content), "vectorized", **options,
+                                                      feature_results=feature_store)
+            result.pop("feature_reuse")
+            assert result == expected, mode
+
+
+def test_cache_hits_report_no_reuse(collection, feature_store, monkeypatch):
+    monkeypatch.setattr(main, "result_cache", main.ResultCache(max_bytes=1 << 24))
+    client = TestClient(main.app)
+    content = json.dumps(collection).encode()
+    first = client.post("/validate", files={"file": ("a.geojson", content)}).json()
+    assert first["feature_reuse"]["recomputed"] > 0
+    assert client.post("/validate", files={"file": ("a.geojson", content)}).json()["feature_reuse"] == \
+        {"reused": 0, "recomputed": 0}
+
+
+def test_least_recently_used_entries_are_pruned(tmp_path):
+    store = main.FeatureResultStore(str(tmp_path / "features.sqlite3"), max_entries=10)
+    for start in range(0, 30, 5):
+        store.put_many([(f"key-{i}", {"i": i}, None) for i in range(start, start + 5)])
+    assert store.stats()["entries"] <= 10
+    assert "key-29" in store.get_many([f"key-{i}" for i in range(30)])
@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+import main
+from conftest import EDGE_FEATURES
+from corpus import make_feature_collection
+
+
+def float_collection():
+    """Collection whose batched coordinates are all floats, which is how the store writes them."""
+    data = make_feature_collection(40, 10, holes=1, seed=4)
+    data["features"] += make_feature_collection(10, 6, dims=3, seed=5)["features"]
+    data["features"][0]["properties"]["név"] = "ü"
+    data.update(name="x", crs={"a": 1}, bbox=[-180.0, -90.0, 180.0, 90.0])
+    return data
+
+
+def test_store_serializes_like_parsed_document(json_backend):
+    content = json.dumps(float_collection(), indent=1).encode()
+    store = main.load_features(content)
+    assert isinstance(store, main.FeatureStore)
+    for indent in (2, None):
+        assert store.dumps(indent) == main.json_codec.dumps(main.json_codec.loads(content), indent)
+
+
+@pytest.mark.parametrize("min_decimals", [0, 6, 9])
+@pytest.mark.parametrize("compact", [False, True])
+def test_process_document_matches_fixing_the_parsed_document(collection, json_backend, min_decimals, compact):
+    content = json.dumps(collection).encode()
+    data = main.json_codec.loads(content)
+    original = main.calculate_area(data)
+    main.process_geojson(data, min_decimals)
+    expected = main.json_codec.dumps(data, None if compact else 2), main.compare_areas(original, main.calculate_area(data))
+    assert main.process_document(content, min_decimals, "vectorized", compact=compact)[:2] == expected
+
+
+@pytest.mark.parametrize("feature", EDGE_FEATURES)
+def test_single_feature_documents(feature, json_backend):
+    content = json.dumps(feature).encode()
+    data = main.json_codec.loads(content)
+    main.process_geojson(data, 6)
+    assert main.process_document(content, 6, "vectorized")[0] == main.json_codec.dumps(data)
+
+
+def test_fixed_store_serializes_like_fixed_document(collection, json_backend):
+    content = json.dumps(collection).encode()
+    store = main.process_geojson(main.load_features(content), 6)
+    data = main.process_geojson(main.json_codec.loads(content), 6)
+    for indent in (2, None):
+        assert store.dumps(indent) == main.json_codec.dumps(data, indent)
@@ -0,0 +1,32 @@
+import gzip
+
+from fastapi.testclient import TestClient
+
+import main
+
+
+def test_index_page_is_served_gzipped_to_clients_that_accept_it():
+    client = TestClient(main.app)
+    page = (main.STATIC_DIR / "index.html").read_bytes()
+    compressed = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert compressed.status_code == 200
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["vary"] == "Accept-Encoding"
+    assert compressed.content == page
+    assert int(compressed.headers["content-length"]) == len(gzip.compress(page, mtime=0))
+
+    plain = client.get("/", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.content == page
+    assert plain.headers["etag"] == compressed.headers["etag"]
+
+
+def test_matching_etag_gets_not_modified():
+    client = TestClient(main.app)
+    etag = client.get("/").headers["etag"]
+    assert etag.startswith('W/"')
+    for if_none_match in (etag, f'"other", {etag}'):
+        response = client.get("/", headers={"If-None-Match": if_none_match})
+        assert response.status_code == 304 and response.content == b""
+        assert response.headers["etag"] == etag
+    assert client.get("/", headers={"If-None-Match": 'W/"other"'}).status_code == 200
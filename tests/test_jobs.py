@@ -0,0 +1,46 @@
+import json
+import time
+
+from fastapi.testclient import TestClient
+
+import main
+
+
+def wait(client, job):
+    for _ in range(200):
+        status = client.get(f"/jobs/{job['job_id']}").json()
+        if status["status"] in ("done", "failed"):
+            return status
+        time.sleep(0.05)
+    raise AssertionError("job did not finish")
+
+
+def test_finished_jobs_report_full_progress(collection, monkeypatch):
+    monkeypatch.setattr(main, "result_cache", main.ResultCache(max_bytes=1 << 24))
+    content = json.dumps(collection).encode()
+    features = len(collection["features"])
+    with TestClient(main.app) as client:
+        # The second submission of each is answered from the result cache
+        for _ in range(2):
+            job = client.post("/jobs/validate", files={"file": ("a.geojson", content)}).json()
+            status = wait(client, job)
+            assert status["status"] == "done"
+            assert status["files"][0]["features_done"] == status["files"][0]["features_total"] in (1, features)
+
+            job = client.post("/jobs/process", files={"files": ("a.geojson", content)},
+                              data={"min_decimals": "6", "prefix": "fixed_"}).json()
+            status = wait(client, job)
+            assert status["status"] == "done"
+            assert status["files"][0]["features_done"] == status["files"][0]["features_total"] in (1, features)
+
+
+def test_process_job_result_matches_process(collection):
+    content = json.dumps(collection).encode()
+    with TestClient(main.app) as client:
+        job = client.post("/jobs/process", files={"files": ("a.geojson", content)},
+                          data={"min_decimals": "6", "prefix": "fixed_", "no_cache": "true"}).json()
+        result = client.get(wait(client, job)["result_url"]).json()["a.geojson"]
+        processed = client.post("/process", files={"files": ("a.geojson", content)},
+                                data={"min_decimals": "6", "prefix": "fixed_", "no_cache": "true"}).json()["a.geojson"]
+        assert client.get(result["download_url"]).text == processed["data"]
+        assert result["area_comparison"] == processed["area_comparison"]
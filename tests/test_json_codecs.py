@@ -0,0 +1,79 @@
+import json
+import random
+
+import pytest
+
+import main
+
+FLOATS = [0.0, -0.0, 1.0, 1.5, -2.25, 0.1, 1e-05, 1.5e-07, 0.0001, 0.00012345, 1e16, 1.2345e16, 1e22, 123456789.123,
+          1e-300, 5e-324, 1.7976931348623157e308, 179.99999999999997, -89.123456789012]
+
+
+@pytest.fixture
+def orjson_codec():
+    if main.orjson is None:
+        pytest.skip("orjson is not installed")
+    return main.get_json_codec("orjson")
+
+
+def test_orjson_writes_floats_like_repr(orjson_codec):
+    rng = random.Random(0)
+    values = FLOATS + [rng.uniform(-180, 180) for _ in range(200)] + [10 ** rng.uniform(-12, 20) for _ in range(200)]
+    data = {"floats": values, "nested": [{"x": value, "ints": [1, -2, 10 ** 15]} for value in FLOATS],
+            "text": 'e-5 0.00001 "quoted 1e-06" 0.0000', "empty": {}, "none": None, "flags": [True, False]}
+    stdlib = main.get_json_codec("stdlib")
+    for indent in (2, None):
+        assert orjson_codec.dumps(data, indent) == stdlib.dumps(data, indent)
+
+
+def test_orjson_keeps_strings_that_look_like_floats(orjson_codec):
+    data = {"1e-05": "0.00001", "value": "x 1e16 y"}
+    assert orjson_codec.dumps(data) == json.dumps(data, indent=2)
+
+
+def test_backends_produce_the_same_document(collection, monkeypatch):
+    # orjson writes non-ASCII text as UTF-8, so only ASCII documents are compared byte for byte
+    for feature in collection["features"]:
+        feature.get("properties", {}).pop("név", None)
+    content = json.dumps(collection).encode()
+    backends = ["stdlib"] + (["orjson"] if main.orjson is not None else [])
+    for compact in (False, True):
+        outputs = set()
+        for backend in backends:
+            monkeypatch.setattr(main, "json_codec", main.get_json_codec(backend))
+            outputs.add(main.process_document(content, 6, "vectorized", compact=compact)[0])
+        assert len(outputs) == 1
+
+
+def test_exact_backend_counts_decimals_as_written():
+    codec = main.get_json_codec("exact")
+    # A float keeps neither the digits of the first value nor the trailing zeros of the second
+    data = codec.loads(b'{"type": "Point", "coordinates": [0.10000000000000000001, 2.500]}')
+    assert main.source_decimals(data).tolist() == [20, 1]
+
+
+@pytest.mark.parametrize("text", [
+    '{"big": 123456789012345678901234567890, "neg": [-98765432109876543210], "u64": 18446744073709551615}',
+    '[1.12345678901234567890123, "12345678901234567890123", 5]',
+])
+def test_orjson_reads_integers_beyond_64_bits_exactly(orjson_codec, text, tmp_path):
+    expected = json.loads(text)
+    assert orjson_codec.loads(text.encode()) == expected
+    assert orjson_codec.loads(text) == expected
+    path = tmp_path / "doc.json"
+    path.write_text(text)
+    with open(path, "rb") as source:
+        mapped = main.map_file(source)
+        assert orjson_codec.loads_buffer(mapped) == expected
+        mapped.close()
+    assert orjson_codec.dumps(expected) == main.get_json_codec("stdlib").dumps(expected)
+
+
+def test_nan_and_infinity_are_kept_by_every_backend(json_backend):
+    content = (b'{"type": "FeatureCollection", "features": [{"type": "Feature", '
+               b'"properties": {"v": NaN, "w": -Infinity, "big": 123456789012345678901234567890}, '
+               b'"geometry": {"type": "Point", "coordinates": [1.123456789, 2.5]}}]}')
+    text, _, _ = main.process_document(content, 3, "vectorized")
+    assert '"v": NaN' in text and '"w": -Infinity' in text and "123456789012345678901234567890" in text
+    assert text == main.get_json_codec("stdlib").dumps(main.process_geojson(json.loads(content), 3))
+    assert main.validate_content(content)["structure_valid"]
@@ -0,0 +1,87 @@
+import pytest
+
+import main
+
+
+def errors(text):
+    """(code, line, column, context) of each structure error, checking that bytes give the same."""
+    found = []
+    for document, index in ((text, main.LineIndex(text)), (text.encode(), main.ByteLineIndex(text.encode()))):
+        found.append([(error["code"], *index.line_col(error["position"]), error["context"])
+                      for error in main.validator.validate_json_structure(document)])
+    assert found[0] == found[1]
+    return found[0]
+
+
+def codes(text):
+    return [error[0] for error in errors(text)]
+
+
+def test_valid_documents_have_no_errors():
+    assert errors('{"a": "}{][", "b": [1, 2.5e-3, true, null], "c": {"d": "\\"\\\\"}}') == []
+    assert errors('  [1]\n') == []
+
+
+def test_brackets_inside_strings_are_ignored():
+    assert errors('{"a": "}{][",\n "b": [1, 2,]\n}') == [
+        (1, 2, 13, "Expecting value"),
+        (5, 2, 12, "Comma followed by ']'"),
+    ]
+
+
+def test_escaped_quotes_do_not_end_strings():
+    assert errors('{"a": "x\\"}, [", "b": 1,}') == [
+        (1, 1, 25, "Expecting property name enclosed in double quotes"),
+        (5, 1, 24, "Comma followed by '}'"),
+    ]
+    assert errors('{"a": "x\\\\", "b": 1,}')[1] == (5, 1, 20, "Comma followed by '}'")
+
+
+def test_trailing_commas():
+    assert errors('[1, 2,\n]') == [(1, 2, 1, "Expecting value"), (5, 1, 6, "Comma followed by ']'")]
+    assert errors('{"a": [1,],\n "b": {"c": 1,}}')[1:] == [
+        (5, 1, 9, "Comma followed by ']'"),
+        (5, 2, 14, "Comma followed by '}'"),
+    ]
+
+
+def test_unquoted_keys():
+    assert errors('{\n  name: "x",\n  \'single\': 1,\n  näme: 2\n}') == [
+        (1, 2, 3, "Expecting property name enclosed in double quotes"),
+        (4, 2, 3, "name is not enclosed in double quotes"),
+        (4, 3, 3, "'single' is not enclosed in double quotes"),
+        (4, 4, 3, "näme is not enclosed in double quotes"),
+    ]
+
+
+def test_duplicate_keys_are_reported_per_object():
+    assert errors('{"a": 1,\n "b": {"a": 2},\n "a": 3}') == [(23, 3, 2, 'Duplicate key "a"')]
+    assert codes('[{"a": 1}, {"a": 2}]') == []
+
+
+def test_multiple_top_level_values():
+    assert errors('{"a": 1}\n{"b": 2}\n[3]') == [
+        (1, 2, 1, "Extra data"),
+        (22, 2, 1, "Found another root element starting with '{'"),
+        (22, 3, 1, "Found another root element starting with '['"),
+    ]
+
+
+def test_unclosed_and_unmatched_brackets():
+    assert codes('{"a": [1, 2}') == [1, 6]
+    assert codes('[1]]') == [1, 7]
+    assert errors('{"a": [1')[-2:] == [(1, 1, 1, "'{' is never closed"), (1, 1, 7, "'[' is never closed")]
+
+
+def test_columns_count_characters_after_non_ascii_text():
+    assert errors('{"név": "ü", "b": 1,}') == [
+        (1, 1, 21, "Expecting property name enclosed in double quotes"),
+        (5, 1, 20, "Comma followed by '}'"),
+    ]
+
+
+@pytest.mark.parametrize("limit", [1, 2])
+def test_error_limit(limit):
+    text = '[' + ', '.join(['1,'] * 5) + ']'
+    assert len(main.validator.validate_json_structure(text, limit)) == limit
+    assert len(main.validator.validate_json_structure(text.encode(), limit)) == limit
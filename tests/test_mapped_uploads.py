@@ -0,0 +1,73 @@
+import json
+import tempfile
+
+import pytest
+
+import main
+from corpus import MALFORMED_KINDS, make_feature_collection, make_malformed
+
+DOCUMENTS = {kind: make_malformed(kind, 20, 5) for kind in MALFORMED_KINDS}
+DOCUMENTS.update({
+    "valid": json.dumps(make_feature_collection(20, 5), indent=2),
+    "duplicate_key_non_ascii": '{"type": "FeatureCollection", "name": "näme", "features": '
+                               '[{"type": "Feature", "properties": {"ä": 1, "ä": 2}, "geometry": null}]}',
+    "missing_comma_non_ascii": '{"type": "FeatureCollection", "name": "näme ü" "features": []}',
+    "invalid_escape": '{"type": "FeatureCollection", "name": "a\\q", "features": []}',
+    "two_roots": '{"a": 1} {"b": 2}',
+    "byte_order_mark": '﻿{"type": "FeatureCollection", "features": []}',
+    "quotes_and_colons_in_strings": '{"type": "FeatureCollection", "a:b": "q\\":x\\\\", "features": []}',
+    "unquoted_non_ascii_key": '{"type": "FeatureCollection", näme: 1, über: 2, "features": []}',
+    "late_duplicate_key": json.dumps(make_feature_collection(200, 5), indent=2)[:-2] + ', "type": 1}',
+})
+
+
+def mapped(text):
+    source = tempfile.TemporaryFile()
+    source.write(text.encode())
+    source.flush()
+    return main.map_file(source)
+
+
+@pytest.mark.parametrize("name", sorted(DOCUMENTS))
+@pytest.mark.parametrize("mode", ["full", "fail_fast", "limit"])
+def test_mapped_upload_gets_the_same_report(name, mode, json_backend):
+    text = DOCUMENTS[name]
+    expected = main.validate_content(text.encode(), mode=mode, limit=3)
+    content = mapped(text)
+    try:
+        result = main.validate_content(content, mode=mode, limit=3)
+    finally:
+        content.close()
+    assert result == expected
+
+
+def test_first_error_beyond_the_parse_window(json_backend, monkeypatch):
+    monkeypatch.setattr(main, "PARSE_WINDOW_BYTES", 64)
+    text = json.dumps(make_feature_collection(50, 5), indent=2)
+    text = text[:len(text) // 2] + "]" + text[len(text) // 2:]
+    expected = main.validate_content(text.encode(), mode="limit", limit=3)
+    assert main.validate_content(mapped(text), mode="limit", limit=3) == expected
+
+
+@pytest.mark.parametrize("broken", [False, True])
+def test_mapped_upload_is_never_decoded_whole(broken, json_backend, monkeypatch):
+    text = json.dumps(make_feature_collection(200, 20), indent=2)
+    if broken:
+        text = text[:2000] + "," + text[2000:]
+    decoded = []
+    loads = json.loads
+
+    def spy(document, *args, **kwargs):
+        if isinstance(document, str):
+            decoded.append(len(document))
+        return loads(document, *args, **kwargs)
+
+    def no_line_index(text):
+        raise AssertionError("the whole text was indexed")
+
+    monkeypatch.setattr(main.json, "loads", spy)
+    monkeypatch.setattr(main, "LineIndex", no_line_index)
+    monkeypatch.setattr(main, "PARSE_WINDOW_BYTES", 4096)
+    result = main.validate_content(mapped(text))
+    assert result["structure_valid"] is not broken
+    assert max(decoded, default=0) < len(text) // 4
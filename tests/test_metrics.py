@@ -0,0 +1,91 @@
+import json
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from corpus import make_feature_collection
+
+SAMPLE = re.compile(r'^(\w+)(?:\{([^}]*)\})? (\S+)$')
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    """Start from an empty result cache so every request runs all its stages."""
+    monkeypatch.setattr(main, "result_cache", main.ResultCache(max_bytes=1 << 24))
+
+
+def upload():
+    return json.dumps(make_feature_collection(5, 6, seed=1)).encode()
+
+
+def parse_metrics(text):
+    """Map each sample line of a Prometheus text exposition to its value, checking the format on the way."""
+    samples = {}
+    declared = set()
+    for line in text.splitlines():
+        if line.startswith("# HELP "):
+            declared.add(line.split()[2])
+        elif line.startswith("# TYPE "):
+            assert line.split()[3] == "histogram"
+        else:
+            name, labels, value = SAMPLE.match(line).groups()
+            assert re.sub("_(bucket|sum|count)$", "", name) in declared
+            samples[(name, labels or "")] = float(value)
+    return samples
+
+
+def test_metrics_are_in_the_prometheus_text_format():
+    client = TestClient(main.app)
+    client.post("/validate", files={"file": ("a.geojson", upload())})
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert response.text.endswith("\n")
+    samples = parse_metrics(response.text)
+
+    name = "geojson_request_duration_seconds"
+    buckets = [value for (metric, labels), value in samples.items()
+               if metric == f"{name}_bucket" and labels.startswith('endpoint="/validate",')]
+    assert len(buckets) == len(main._SECONDS_BUCKETS) + 1
+    assert buckets == sorted(buckets)
+    assert buckets[-1] == samples[(f"{name}_count", 'endpoint="/validate"')] >= 1
+    assert samples[(f"{name}_sum", 'endpoint="/validate"')] > 0
+    assert (f"{name}_bucket", 'endpoint="/validate",le="+Inf"') in samples
+    for stage in ("read", "parse", "structure", "geometry"):
+        assert ("geojson_stage_duration_seconds_count", f'endpoint="/validate",stage="{stage}"') in samples
+    assert samples[("geojson_request_features_count", 'endpoint="/validate"')] >= 1
+
+
+def test_uninstrumented_paths_are_not_timed():
+    client = TestClient(main.app)
+    client.get("/cache/stats")
+    assert 'endpoint="/cache/stats"' not in client.get("/metrics").text
+
+
+def stage_names(header):
+    entries = [entry.split(";") for entry in header.split(", ")]
+    for entry in entries:
+        assert len(entry) == 2 and re.fullmatch(r"dur=\d+\.\d", entry[1])
+    return [name for name, _ in entries]
+
+
+def test_server_timing_header_names_the_stages(monkeypatch):
+    monkeypatch.setattr(main, "SERVER_TIMING", True)
+    client = TestClient(main.app)
+    validated = client.post("/validate", files={"file": ("a.geojson", upload())})
+    names = stage_names(validated.headers["server-timing"])
+    assert {"read", "parse", "structure", "geometry"} <= set(names)
+    assert names[-1] == "total"
+
+    processed = client.post("/process", files={"files": ("a.geojson", upload())},
+                            data={"min_decimals": "6", "prefix": "fixed_", "no_cache": "true"})
+    names = stage_names(processed.headers["server-timing"])
+    assert {"read", "parse", "area_original", "fix", "area_processed", "serialize"} <= set(names)
+    assert names[-1] == "total"
+
+
+def test_server_timing_header_is_off_by_default(monkeypatch):
+    monkeypatch.setattr(main, "SERVER_TIMING", False)
+    response = TestClient(main.app).post("/validate", files={"file": ("a.geojson", upload())})
+    assert "server-timing" not in response.headers
@@ -0,0 +1,66 @@
+import asyncio
+import json
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def chunked(monkeypatch):
+    """Split every collection into chunks of a few features."""
+    monkeypatch.setattr(main, "CHUNK_FEATURES", 7)
+    monkeypatch.setattr(main, "CHUNK_THRESHOLD_BYTES", 0)
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(main, "PROCESS_WORKERS", 2)
+    yield
+    main.shutdown_process_executor()
+
+
+def run(content, **options):
+    return asyncio.run(main.run_process_document(content, 6, "vectorized", **options))
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_chunks_merge_into_the_whole_document(collection, chunked, json_backend, compact):
+    content = json.dumps(collection).encode()
+    expected = main.process_document(content, 6, "vectorized", compact=compact)
+    progress = []
+    assert run(content, compact=compact, progress=lambda done, total: progress.append((done, total))) == expected
+    assert progress[-1] == (len(collection["features"]), len(collection["features"]))
+
+
+def test_chunks_on_the_process_pool(collection, chunked, pool):
+    content = json.dumps(collection).encode()
+    assert run(content) == main.process_document(content, 6, "vectorized")
+
+
+def test_sequence_output_has_one_record_per_feature(collection, chunked):
+    content = json.dumps(collection).encode()
+    text, area_comparison, _ = run(content, output_format="ndjson")
+    records = [json.loads(line) for line in text.splitlines()]
+    fixed = json.loads(main.process_document(content, 6, "vectorized")[0])
+    assert records == fixed["features"]
+    assert area_comparison == main.process_document(content, 6, "vectorized")[1]
+
+
+@pytest.mark.parametrize("threshold", [0, 1 << 30])
+def test_pool_reads_the_document_from_a_temporary_file(collection, pool, monkeypatch, tmp_path, threshold):
+    monkeypatch.setattr(main, "CHUNK_FEATURES", 7)
+    monkeypatch.setattr(main, "CHUNK_THRESHOLD_BYTES", threshold)
+    monkeypatch.setattr(main.tempfile, "tempdir", str(tmp_path))
+    sent = []
+    run_timed = main.run_timed
+
+    async def spy(executor, func, *args):
+        sent.append(args)
+        return await run_timed(executor, func, *args)
+
+    monkeypatch.setattr(main, "run_timed", spy)
+    content = json.dumps(collection).encode()
+    assert run(content) == main.process_document(content, 6, "vectorized")
+    assert sent and not any(isinstance(arg, bytes) and len(arg) >= len(content) for args in sent for arg in args)
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,96 @@
+import json
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """A fresh in-memory result cache installed as main.result_cache."""
+    cache = main.ResultCache(max_bytes=1 << 24)
+    monkeypatch.setattr(main, "result_cache", cache)
+    return cache
+
+
+def counts(cache):
+    stats = cache.stats()
+    return stats["hits"], stats["disk_hits"], stats["misses"]
+
+
+def test_hits_and_misses():
+    cache = main.ResultCache(max_bytes=1 << 20)
+    assert cache.get("a") is None
+    cache.set("a", {"x": [1, 2]})
+    assert cache.get("a") == {"x": [1, 2]}
+    assert counts(cache) == (1, 0, 1)
+
+
+def test_least_recently_used_entries_leave_memory_first():
+    blob_size = len(json.dumps({"v": "x" * 100}))
+    cache = main.ResultCache(max_bytes=blob_size * 2)
+    cache.set("a", {"v": "x" * 100})
+    cache.set("b", {"v": "x" * 100})
+    cache.get("a")
+    cache.set("c", {"v": "x" * 100})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["bytes"] <= cache.max_bytes
+    cache.set("big", {"v": "x" * 1000})
+    assert cache.get("big") is None and cache.stats()["entries"] == 2
+
+
+def test_disk_entries_are_promoted_to_memory(tmp_path):
+    main.ResultCache(max_bytes=1 << 20, directory=str(tmp_path)).set("k" * 64, {"v": 1})
+    cache = main.ResultCache(max_bytes=1 << 20, directory=str(tmp_path))
+    assert cache.get("k" * 64) == {"v": 1}
+    assert cache.get("k" * 64) == {"v": 1}
+    assert counts(cache) == (2, 1, 0)
+    assert cache.stats()["entries"] == 1
+
+
+def test_disk_tier_keeps_the_recently_used_files_within_its_budget(tmp_path):
+    blob_size = len(json.dumps({"v": "x" * 100}))
+    cache = main.ResultCache(max_bytes=1 << 20, directory=str(tmp_path), max_disk_bytes=blob_size * 5)
+    keys = [f"{i:02d}" * 32 for i in range(5)]
+    for age, key in enumerate(keys):
+        cache.set(key, {"v": "x" * 100})
+        os.utime(cache._path(key), (1000 + age, 1000 + age))
+    cache._entries.clear()
+    assert cache.get(keys[0]) is not None  # Read, so now the most recent
+    cache.set("ff" * 32, {"v": "x" * 100})
+    on_disk = {path.stem for path in tmp_path.glob("*/*.json")}
+    assert sum(path.stat().st_size for path in tmp_path.glob("*/*.json")) <= blob_size * 4.5
+    assert on_disk == {keys[0], keys[3], keys[4], "ff" * 32}
+    assert cache.stats()["disk_bytes"] == blob_size * 4
+
+
+def test_keys_depend_on_content_and_options():
+    key = main.ResultCache.make_key(b"{}", endpoint="validate", engine="vectorized", rules=None)
+    assert key == main.ResultCache.make_key(b"{}", rules=None, engine="vectorized", endpoint="validate")
+    assert key != main.ResultCache.make_key(b"{}", endpoint="validate", engine="scalar", rules=None)
+    assert key != main.ResultCache.make_key(b"{}", endpoint="validate", engine="vectorized", rules=["holes"])
+    assert key != main.ResultCache.make_key(b"[]", endpoint="validate", engine="vectorized", rules=None)
+
+
+def test_endpoints_use_the_cache_unless_asked_not_to(cache, collection):
+    client = TestClient(main.app)
+    content = json.dumps(collection).encode()
+
+    def validate(**options):
+        response = client.post("/validate", files={"file": ("a.geojson", content)}, data=options)
+        assert response.status_code == 200
+        result = response.json()
+        result.pop("feature_reuse")  # Zero on a cache hit
+        return result
+
+    first = validate()
+    assert counts(cache) == (0, 0, 1)
+    assert validate() == first and counts(cache) == (1, 0, 1)
+    assert validate(no_cache="true") == first and counts(cache) == (1, 0, 1)
+    validate(engine="scalar")
+    validate(mode="sample", sample_size="5")
+    assert counts(cache) == (1, 0, 3)
+    assert cache.stats()["entries"] == 3
@@ -0,0 +1,100 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+SQUARE = [[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]
+FAR = [[10, 10], [11, 10], [11, 11], [10, 11], [10, 10]]
+
+
+def polygon(*rings):
+    return {"type": "Polygon", "coordinates": list(rings)}
+
+
+# At least one geometry per rule that has the issue
+GEOMETRIES = [
+    polygon([[0, 0], [1, 0], [1, 1], [0, 1]]),
+    polygon([[0, 0], [1, 0], [0, 0], [0, 0]]),
+    polygon(SQUARE[::-1]),
+    polygon(SQUARE, [[0.2, 0.2], [0.4, 0.2], [0.4, 0.4], [0.2, 0.2]]),
+    polygon(SQUARE, [[0, 0], [0.5, 0.2], [0.5, 0.5], [0, 0]]),
+    polygon(SQUARE, [[0.2, 0.2], [0.4, 0.4], [0.4, 0.2], [0.2, 0.2]]),
+    {"type": "LineString", "coordinates": [[0, 0], [1, 1], [1, 0], [0, 1]]},
+    {"type": "LineString", "coordinates": [[0, 0], [0, 0], [1, 1]]},
+    {"type": "Point", "coordinates": [1.123456789, 2]},
+    {"type": "LineString", "coordinates": [[i * 1e-3, 0] for i in range(30)]},
+    {"type": "Point", "coordinates": [1, 2, 3]},
+    {"type": "Point", "coordinates": [200, 2]},
+    {"type": "LineString", "coordinates": [[179, 0], [-179, 0]]},
+    polygon([[5, 5], [6, 5], [6, 6], [5, 6], [5, 5]]),
+    polygon([[5.5, 5], [6.5, 5], [6.5, 6], [5.5, 6], [5.5, 5]]),
+    polygon([[5, 5], [6, 5], [6, 6], [5, 6], [5, 5]]),
+]
+
+
+def collection(geometries):
+    return {"type": "FeatureCollection", "features": [
+        {"type": "Feature", "properties": {}, "geometry": geometry} for geometry in geometries
+    ]}
+
+
+def validate(data, engine="vectorized", **options):
+    result = main.validator.validate_geometry(json.loads(json.dumps(data)), engine, **options)
+    result.pop("feature_reuse", None)
+    return result
+
+
+def flagged(result, rule):
+    return result["invalid"].get(rule) or result["problematic"].get(rule) or []
+
+
+@pytest.mark.parametrize("rule", list(main.UnifiedValidator.RULES))
+def test_each_rule_gives_the_same_result_with_both_engines(rule, monkeypatch):
+    monkeypatch.setattr(main.UnifiedValidator, "MAX_VERTICES", 20)
+    members = [{"type": "GeometryCollection", "geometries": [{"type": "Point", "coordinates": [0, 0]}, geometry]}
+               for geometry in GEOMETRIES]
+    data = collection(GEOMETRIES + members)
+    vectorized = validate(data, "vectorized", rules=[rule])
+    assert vectorized == validate(data, "scalar", rules=[rule])
+    assert flagged(vectorized, rule)
+    assert vectorized["skipped_validation"] == [name for name in main.UnifiedValidator.RULES if name != rule]
+
+
+@pytest.mark.parametrize("engine", main.VALIDATION_ENGINES)
+def test_rules_check_every_member(engine):
+    data = collection([
+        {"type": "MultiPolygon", "coordinates": [[FAR], [SQUARE[::-1]]]},
+        {"type": "MultiPolygon", "coordinates": [[FAR], [SQUARE]]},
+        {"type": "GeometryCollection", "geometries": [
+            {"type": "Point", "coordinates": [0, 0]},
+            {"type": "LineString", "coordinates": [[0, 0], [1, 1], [1, 0], [0, 1]]},
+        ]},
+        {"type": "GeometryCollection", "geometries": [{"type": "MultiPolygon", "coordinates": [[FAR], [SQUARE[::-1]]]}]},
+    ])
+    result = validate(data, engine)
+    assert result["invalid"]["exterior_not_ccw"] == [0, 3]
+    assert result["problematic"]["self_intersection"] == [2]
+
+
+def test_rules_and_skip_rules_together():
+    data = collection(GEOMETRIES)
+    result = validate(data, rules=["unclosed", "holes", "3d_coordinates"], skip_rules=["holes"])
+    assert set(result["invalid"]) | set(result["problematic"]) == {"unclosed", "3d_coordinates"}
+    assert "holes" in result["skipped_validation"]
+    only_skipped = validate(data, skip_rules=["holes", "invalid_geometry"])
+    assert "holes" not in only_skipped["problematic"] and "invalid_geometry" not in only_skipped["invalid"]
+    assert "unclosed" in only_skipped["invalid"]
+
+
+@pytest.mark.parametrize("option", ["rules", "skip_rules"])
+def test_unknown_rule_is_rejected(option):
+    with pytest.raises(ValueError, match="Unknown validation rule: nope"):
+        main.validator.select_rules(**{option: ["unclosed", "nope"]})
+    client = TestClient(main.app)
+    content = json.dumps(collection(GEOMETRIES[:1])).encode()
+    for path in ("/validate", "/jobs/validate"):
+        response = client.post(path, files={"file": ("a.geojson", content)}, data={option: "unclosed, nope"})
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Unknown validation rule: nope"
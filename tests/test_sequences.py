@@ -0,0 +1,66 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+GOOD = {"type": "Feature", "properties": {"a": 1},
+        "geometry": {"type": "Polygon", "coordinates": [[[0.5, 0.5], [1.5, 0.5], [1.5, 1.5], [0.5, 0.5]]]}}
+UNCLOSED = '{"type": "Feature", "geometry": {"type": "Point", "coordinates": [1, 2]}'
+BAD_MEMBER = '{\n "type": "Feature",\n "geometry": {,}\n}'
+
+
+def ndjson():
+    """Records on lines 1 and 5, a truncated record on line 3 and a bare array on line 4."""
+    lines = [json.dumps(GOOD), "", UNCLOSED, "[1, 2]", json.dumps(GOOD)]
+    return ("\n".join(lines) + "\n").encode(), {3, 4}, [1, 5]
+
+
+def geojsonseq():
+    """Multi-line records, with a record whose error is on its third line."""
+    records = [json.dumps(GOOD), json.dumps(GOOD, indent=1), BAD_MEMBER, json.dumps(GOOD)]
+    starts = []
+    text = ""
+    for record in records:
+        starts.append(text.count("\n") + 1)
+        text += "\x1e" + record + "\n"
+    return text.encode(), {starts[2]}, [starts[0], starts[1], starts[3]]
+
+
+@pytest.mark.parametrize("filename, make", [("a.ndjson", ndjson), ("a.geojsons", geojsonseq)])
+def test_validate_reports_lines_in_the_whole_document(filename, make):
+    content, bad_lines, good_lines = make()
+    result = TestClient(main.app).post("/validate", files={"file": (filename, content)},
+                                       data={"no_cache": "true"}).json()
+    assert not result["structure_valid"] and result["feature_count"] == len(good_lines)
+    errors = {(error["line"], error["column"]) for error in result["line_errors"]}
+    if filename == "a.ndjson":
+        assert (3, len(UNCLOSED) + 1) in errors and (4, 1) in errors
+        assert {line for line, _ in errors} == bad_lines
+    else:
+        # The stray comma is on the third line of the record
+        assert errors == {(min(bad_lines) + 2, BAD_MEMBER.splitlines()[2].index(",") + 1)}
+
+
+@pytest.mark.parametrize("filename, make", [("a.ndjson", ndjson), ("a.geojsons", geojsonseq)])
+def test_process_reports_the_lines_left_out(filename, make):
+    content, bad_lines, good_lines = make()
+    result = TestClient(main.app).post("/process", files={"files": (filename, content)},
+                                       data={"min_decimals": "3", "prefix": "fixed_", "no_cache": "true"}
+                                       ).json()[filename]
+    assert {error["line"] for error in result["line_errors"]} == bad_lines
+    assert [row["line"] for row in result["area_comparison"]] == good_lines
+    assert len(result["data"].strip().split("\n")) == len(good_lines)
+
+
+@pytest.mark.parametrize("filename, make", [("a.ndjson", ndjson), ("a.geojsons", geojsonseq)])
+def test_stream_logs_the_lines_left_out(filename, make, capsys):
+    content, bad_lines, good_lines = make()
+    response = TestClient(main.app).post("/process/stream", files={"file": (filename, content)},
+                                         data={"min_decimals": "3"})
+    assert response.status_code == 200
+    assert len(response.text.strip().split("\n")) == len(good_lines)
+    logged = {int(line.split()[2].rstrip(":")) for line in capsys.readouterr().out.splitlines()
+              if line.startswith("Skipping line ")}
+    assert logged == bad_lines
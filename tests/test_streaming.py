@@ -0,0 +1,82 @@
+import json
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+
+def feed_in_pieces(content, rng):
+    splitter = main.FeatureStreamSplitter()
+    features = []
+    start = 0
+    while start < len(content):
+        size = rng.choice([1, 2, 3, 7, 64, 1000])
+        features += splitter.feed(content[start:start + size])
+        start += size
+    splitter.close()
+    return splitter, features
+
+
+@pytest.mark.parametrize("indent", [None, 1])
+def test_splitter_finds_the_same_features_at_any_chunk_boundary(collection, indent):
+    collection["features"][0]["properties"]["tricky"] = 'braces } { ] [ and "quotes" \\ in strings'
+    collection["features"][1]["properties"]["features"] = [{"nested": True}]
+    content = json.dumps(collection, indent=indent, ensure_ascii=False).encode()
+    for seed in range(5):
+        splitter, features = feed_in_pieces(content, random.Random(seed))
+        assert [json.loads(raw) for raw in features] == collection["features"]
+        envelope = json.loads(splitter.header + splitter.trailer)
+        assert envelope == {**collection, "features": []}
+
+
+def test_splitter_spans_locate_the_features(collection):
+    content = json.dumps(collection, indent=1).encode()
+    splitter = main.FeatureStreamSplitter(spans=True)
+    features = []
+    for start in range(0, len(content), 1000):
+        features += splitter.feed(content[start:start + 1000])
+    splitter.close()
+    assert [content[start:end] for start, end in splitter.spans] == features
+    assert len(features) == len(collection["features"])
+
+
+def test_splitter_leaves_documents_without_features_whole():
+    content = json.dumps({"type": "Feature", "geometry": None, "properties": {"features": [1]}}).encode()
+    splitter, features = feed_in_pieces(content, random.Random(0))
+    assert features == [] and splitter.mode == "header"
+
+
+def test_stream_gives_the_same_document_as_process(collection):
+    content = json.dumps(collection).encode()
+    client = TestClient(main.app)
+    streamed = client.post("/process/stream", files={"file": ("a.geojson", content)},
+                           data={"min_decimals": "6"})
+    processed = client.post("/process", files={"files": ("a.geojson", content)},
+                            data={"min_decimals": "6", "prefix": "fixed_", "no_cache": "true"}).json()["a.geojson"]
+    assert streamed.status_code == 200
+    document = json.loads(streamed.content)
+    area_comparison = document.pop("area_comparison")
+    assert document == json.loads(processed["data"])
+    assert area_comparison == processed["area_comparison"]
+
+
+def stream(content):
+    response = TestClient(main.app).post("/process/stream", files={"file": ("a.geojson", content)},
+                                         data={"min_decimals": "6"})
+    assert response.status_code == 200
+    return response.text
+
+
+@pytest.mark.parametrize("where", ["header", "trailer"])
+def test_stream_replaces_an_existing_area_comparison(collection, json_backend, where):
+    expected = json.loads(stream(json.dumps(collection).encode()))
+    stale = {"area_comparison": [{"index": 0, "stale": True}]}
+    if where == "header":
+        collection = {**stale, **collection}
+    else:
+        collection.update(stale)
+    text = stream(json.dumps(collection).encode())
+    assert text.count('"area_comparison"') == 1
+    assert json.loads(text) == expected
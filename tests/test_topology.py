@@ -0,0 +1,83 @@
+import json
+
+import pytest
+import shapely.geometry
+
+import main
+
+
+def square_with_hole(hole):
+    return {"type": "Polygon", "coordinates": [[[0, 0], [4, 0], [4, 4], [0, 4], [0, 0]], hole]}
+
+
+def fix(geometries, min_decimals, **options):
+    content = json.dumps({"type": "FeatureCollection", "features": [
+        {"type": "Feature", "properties": {}, "geometry": geometry} for geometry in geometries
+    ]}).encode()
+    text, _, details = main.process_document(content, min_decimals, "vectorized", precision_mode="topology",
+                                             **options)
+    return [feature["geometry"] for feature in json.loads(text)["features"]], details
+
+
+def positions(coordinates):
+    if isinstance(coordinates[0], (int, float)):
+        yield coordinates
+    else:
+        for item in coordinates:
+            yield from positions(item)
+
+
+def test_broken_geometry_is_repaired_with_exact_decimals():
+    hole = [[0.0004, 1], [1, 1], [1, 2], [0.0004, 1]]
+    geometries, details = fix([square_with_hole(hole)], 3)
+    assert details["topology"] == {"repaired": [0], "flagged": []}
+    assert shapely.geometry.shape(geometries[0]).is_valid
+    assert len(geometries[0]["coordinates"]) == 2
+    for position in positions(geometries[0]["coordinates"]):
+        assert all(main.decimal_places(repr(value)) == 3 for value in position)
+
+
+def test_hole_merging_into_the_shell_is_flagged():
+    hole = [[0.003, 1], [1, 1], [1, 2], [0.003, 2], [0.003, 1]]
+    geometries, details = fix([square_with_hole(hole)], 2)
+    assert details["topology"] == {"repaired": [], "flagged": [0]}
+    assert len(geometries[0]["coordinates"]) == 2
+
+
+def test_coordinates_mode_is_unchanged_by_topology_mode():
+    geometries = [square_with_hole([[0.0004, 1], [1, 1], [1, 2], [0.0004, 1]]),
+                  {"type": "Polygon", "coordinates": [[[10, 10], [11, 10], [11, 11], [10, 10]]]}]
+    content = json.dumps({"type": "FeatureCollection", "features": [
+        {"type": "Feature", "properties": {}, "geometry": geometry} for geometry in geometries
+    ]}).encode()
+    coordinates = json.loads(main.process_document(content, 3, "vectorized")[0])["features"]
+    topology, _ = fix(geometries, 3)
+    assert "topology" not in main.process_document(content, 3, "vectorized")[2]
+    assert topology[1] == coordinates[1]["geometry"]
+    assert topology[0] != coordinates[0]["geometry"]
+
+
+def test_reused_results_keep_the_topology_report(collection, feature_store):
+    geometries = [feature["geometry"] for feature in collection["features"][:20]] + [
+        square_with_hole([[0.0004, 1], [1, 1], [1, 2], [0.0004, 1]]),
+        square_with_hole([[0.003, 1], [1, 1], [1, 2], [0.003, 2], [0.003, 1]]),
+    ]
+    runs = [fix(geometries, 2) for _ in range(3)]
+    assert runs[0][0] == runs[1][0] == runs[2][0]
+    assert runs[0][1]["topology"] == runs[1][1]["topology"] == runs[2][1]["topology"]
+    assert 20 in runs[0][1]["topology"]["repaired"] and 21 in runs[0][1]["topology"]["flagged"]
+    assert runs[2][1]["feature_reuse"]["reused"] > 0
+
+
+def test_combined_validation_matches_validating_the_output(collection):
+    content = json.dumps(collection).encode()
+    text, _, details = main.process_document(content, 3, "vectorized", precision_mode="topology", validation={})
+    expected = main.validate_content(text.encode())
+    for result in (details["validation"], expected):
+        result.pop("feature_reuse")
+    assert details["validation"] == expected
+
+
+def test_unknown_precision_mode_is_rejected(collection):
+    with pytest.raises(ValueError):
+        main.process_document(json.dumps(collection).encode(), 3, "vectorized", precision_mode="snap")
@@ -0,0 +1,97 @@
+import json
+
+import main
+
+
+def validate(data, engine, **options):
+    result = main.validator.validate_geometry(data, engine, **options)
+    result.pop("feature_reuse", None)
+    return result
+
+
+def test_engines_report_the_same_issues(collection):
+    vectorized = validate(collection, "vectorized")
+    scalar = validate(collection, "scalar")
+    assert vectorized == scalar
+    assert "self_intersection" in vectorized["invalid"] or "invalid_geometry" in vectorized["invalid"]
+
+
+def test_feature_store_validates_like_parsed_document(collection, json_backend):
+    content = json.dumps(collection).encode()
+    for engine in main.VALIDATION_ENGINES:
+        assert validate(main.load_features(content), engine) == validate(main.json_codec.loads(content), engine)
+
+
+def test_rule_selection_is_the_same_for_both_engines(collection):
+    options = {"rules": ["unclosed", "exterior_not_ccw", "invalid_geometry"]}
+    assert validate(collection, "vectorized", **options) == validate(collection, "scalar", **options)
+
+
+def test_modes_give_the_same_result_for_both_engines(collection):
+    for mode in main.VALIDATION_MODES:
+        options = {"mode": mode, "sample_size": 30, "seed": 3, "limit": 2}
+        assert validate(collection, "vectorized", **options) == validate(collection, "scalar", **options), mode
+
+
+def polygons(count):
+    return {"type": "FeatureCollection", "features": [
+        {"type": "Feature", "properties": {},
+         "geometry": {"type": "Polygon", "coordinates": [[[i, 0], [i + 1, 0], [i + 1, 1], [i, 1], [i, 0]]]}}
+        for i in range(count)
+    ]}
+
+
+def test_fail_fast_reports_invalid_feature_before_missing_geometry():
+    data = polygons(300)
+    data["features"][100]["geometry"]["coordinates"] = [[[0, 0], [1, 1], [1, 0], [0, 1], [0, 0]]]
+    del data["features"][250]["geometry"]
+    for engine in main.VALIDATION_ENGINES:
+        for source in (data, main.load_features(json.dumps(data).encode())):
+            result = validate(source, engine, mode="fail_fast")
+            assert list(result["invalid"]) == ["invalid_geometry"]
+            assert result["invalid"]["invalid_geometry"] == [100]
+            assert result["mode"]["features_checked"] == 101
+
+
+def test_fail_fast_stops_at_missing_geometry():
+    data = polygons(300)
+    del data["features"][250]["geometry"]
+    for engine in main.VALIDATION_ENGINES:
+        result = validate(data, engine, mode="fail_fast")
+        assert result["invalid"] == {"missing_geometry": [250]}
+        assert result["mode"]["features_checked"] == 251
+        assert result["mode"]["stopped_early"]
+
+
+def test_full_mode_reports_missing_geometry_first():
+    data = polygons(10)
+    data["features"][2]["geometry"]["coordinates"] = [[[0, 0], [1, 1], [1, 0], [0, 1], [0, 0]]]
+    del data["features"][5]["geometry"]
+    result = validate(data, "vectorized")
+    assert list(result["invalid"])[0] == "missing_geometry"
+    assert result["invalid"]["missing_geometry"] == [5]
+
+
+def test_valid_document_is_parsed_once(collection, json_backend, monkeypatch):
+    parses = []
+    load_features = main.load_features
+
+    def counted(content):
+        parses.append(len(content))
+        return load_features(content)
+
+    def scanned(*args, **kwargs):
+        raise AssertionError("a valid document was tokenized")
+
+    monkeypatch.setattr(main, "load_features", counted)
+    monkeypatch.setattr(main.validator, "validate_json_structure", scanned)
+    result = main.validate_content(json.dumps(collection).encode())
+    assert result["structure_valid"] and result["feature_count"] == len(collection["features"])
+    assert len(parses) == 1
+
+
+def test_duplicate_keys_found_without_the_text_parser(json_backend):
+    content = b'{"type": "FeatureCollection", "features": [{"type": "Feature", "geometry": null, ' \
+              b'"properties": {"a": 1, "b": {"a": 2}, "a": 3}}]}'
+    result = main.validate_content(content)
+    assert not result["structure_valid"] and "Duplicate key" in result["structure_errors"]